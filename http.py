@@ -1,57 +1,381 @@
 # http.py (Versi Final yang Sudah Dikoreksi)
+import hmac
 import json
+import math
 import os
+import random
+import select
+import socket
+import string
+import threading
+import time
 import urllib.parse
+from contextlib import nullcontext
 from datetime import datetime
 import logging
 
 try:
-    from models import Game
-    from utils import validate_word_formation, calculate_score_for_word
+    from models import Game, FRAGMENTS
+    from utils import validate_word_formation, calculate_score_for_word, FragmentIndex
+    from request_reader import HttpRequest, RequestError
+    from static_cache import StaticCache, accepts_gzip, etag_matches
+    from server_log import log_event
+    from metrics import Metrics, route_of, PROMETHEUS_CONTENT_TYPE
+    import profiler
+    import server_log
+    import websocket_frames as ws
+    from rate_limit import RateLimiter
+    import wire_binary
 except ImportError:
     print("ERROR di http.py: Pastikan file 'models.py' dan 'utils.py' dapat diimpor.")
     exit()
 
+MAX_LONG_POLL_WAIT = 30 # Detik maksimal satu request /game_status?since=..&wait=.. ditahan
+MAX_BLOCKING_WAITERS = 64 # Batas long-poll /game_status yang boleh memblok thread secara bersamaan
+MAX_STREAMS = 64 # Batas stream SSE/WebSocket yang memblok thread; terpisah agar stream tidak menghabiskan slot long-poll
+SSE_HEARTBEAT_INTERVAL = 15 # Detik antar komentar heartbeat pada stream /events
+WS_PING_INTERVAL = 30 # Detik idle sebelum server mengirim ping pada koneksi /ws
+WS_RECV_SIZE = 4096
+MAX_BATCH_REQUESTS = 32 # Batas sub-request dalam satu POST /batch
+AUTO_CHECK_DEAD_HANDS = False # Lewati otomatis giliran pemain yang tidak punya langkah legal (--auto-check)
+BATCH_GET_PREFIXES = ('/game_status/', '/hint/')
+ADMIN_TOKEN = os.environ.get('SEKATA_ADMIN_TOKEN') # Jika kosong, endpoint /admin/ hanya bisa diakses langsung dari localhost (bukan lewat proxy)
+BATCH_POST_PREFIXES = ('/create_game', '/join_game/', '/start_game/', '/submit_turn/', '/check_turn/')
+# Endpoint yang menjawab dengan encoding biner (wire_binary) jika client mengirim Accept: application/x-sekata
+BINARY_PATH_PREFIXES = ('/game_status/',) + BATCH_POST_PREFIXES
+
+class FileResponse:
+    """Respons yang body-nya dikirim langsung dari file (sendfile) oleh layer socket, tanpa disalin ke memori Python."""
+    def __init__(self, header_bytes, file_path, offset, count):
+        self.header_bytes = header_bytes
+        self.file_path = file_path
+        self.offset = offset
+        self.count = count
+
+    def send(self, sock):
+        sock.sendall(self.header_bytes)
+        with open(self.file_path, 'rb') as f:
+            sock.sendfile(f, self.offset, self.count)
+
+    def to_bytes(self):
+        """Fallback untuk pemanggil yang membutuhkan respons utuh dalam bentuk bytes."""
+        with open(self.file_path, 'rb') as f:
+            f.seek(self.offset)
+            return self.header_bytes + f.read(self.count)
+
+class StreamResponse:
+    """Respons yang mengambil alih koneksi: layer socket menyerahkan socket ke run_blocking(sock) milik subclass
+    (EventStream, GameSocket, server_prefork.RelayStream), yang mengirim header_bytes lalu isi stream.
+    Koneksi selalu ditutup setelah stream selesai."""
+    def __init__(self, header_bytes, release=None):
+        self.header_bytes = header_bytes
+        self.release = release # Dipanggil sekali saat stream selesai (mengembalikan slot thread)
+        self.buffered = b'' # Byte dari client yang sudah terbaca setelah request (diisi layer socket)
+
+    def close(self):
+        if self.release:
+            self.release()
+            self.release = None
+
+class EventStream(StreamResponse):
+    """Respons Server-Sent Events untuk satu viewer: header dikirim sekali, lalu satu event 'state'
+    (snapshot sesuai get_game_state_for_player) setiap version game berubah, diselingi heartbeat."""
+    HEARTBEAT = b': ping\n\n'
+
+    def __init__(self, header_bytes, game, player_id, last_version=-1, release=None):
+        super().__init__(header_bytes, release)
+        self.game = game
+        self.player_id = player_id
+        self.last_version = last_version
+
+    def next_event(self):
+        """Snapshot terbaru sebagai event SSE, atau None jika version belum berubah sejak event terakhir."""
+        with self.game.lock:
+            if self.game.version <= self.last_version: return None
+            self.last_version = self.game.version
+            data = self.game.serialized_state_for_player(self.player_id)
+        return f"id: {self.last_version}\nevent: state\ndata: ".encode('utf-8') + data + b"\n\n"
+
+    @property
+    def finished(self):
+        return self.game.winner is not None or self.game.evicted
+
+    def run_blocking(self, sock):
+        """Dipakai server berbasis thread: thread ini ditahan sampai game selesai atau client putus."""
+        try:
+            sock.sendall(self.header_bytes)
+            while True:
+                event = self.next_event()
+                if event: sock.sendall(event)
+                if self.finished: return
+                if not self.game.wait_for_change(self.last_version, SSE_HEARTBEAT_INTERVAL):
+                    sock.sendall(self.HEARTBEAT)
+        except OSError:
+            pass # Client menutup stream
+        finally:
+            self.close()
+
+class GameSocket(StreamResponse):
+    """Koneksi WebSocket satu pemain: aksi (submit_turn, check_turn, start_game) masuk sebagai pesan JSON,
+    perubahan state game dikirim balik sebagai diff per key terhadap state terakhir yang dikirim.
+
+    Logika protokol tidak menyentuh socket (receive/state_frame mengembalikan bytes) sehingga bisa dipakai
+    thread (run_blocking) maupun event loop (server async)."""
+    ACTIONS = ('submit_turn', 'check_turn', 'start_game')
+    PING = ws.encode_frame(ws.OP_PING)
+
+    def __init__(self, header_bytes, http_handler, game, player_id, release=None):
+        super().__init__(header_bytes, release)
+        self.http_handler = http_handler
+        self.game = game
+        self.player_id = player_id
+        self.reader = ws.FrameReader()
+        self.last_version = -1
+        self.last_state = None
+
+    @property
+    def finished(self):
+        return self.game.winner is not None or self.game.evicted
+
+    def state_frame(self):
+        """Frame 'state' berisi key yang berubah sejak kiriman terakhir (full=True untuk kiriman pertama)."""
+        with self.game.lock:
+            if self.game.version <= self.last_version: return None
+            self.last_version = self.game.version
+            # Snapshot diambil dari cache serialisasi; di-decode ulang agar list milik game tidak ikut tersimpan.
+            encoded = self.game.serialized_state_for_player(self.player_id)
+        state = json.loads(encoded)
+        if self.last_state is None:
+            message = {"type": "state", "version": self.last_version, "full": True, "data": state}
+        else:
+            changes = {key: value for key, value in state.items() if self.last_state.get(key) != value}
+            message = {"type": "state", "version": self.last_version, "full": False, "data": changes}
+        self.last_state = state
+        return ws.encode_frame(ws.OP_TEXT, json.dumps(message))
+
+    def receive(self, data):
+        """Memproses byte dari client. Mengembalikan (frame_balasan, koneksi_harus_ditutup)."""
+        self.reader.feed(data)
+        replies = []
+        try:
+            while True:
+                message = self.reader.next_message()
+                if message is None: return replies, False
+                opcode, payload = message
+                if opcode == ws.OP_CLOSE:
+                    replies.append(ws.encode_frame(ws.OP_CLOSE, payload[:2]))
+                    return replies, True
+                if opcode == ws.OP_PING: replies.append(ws.encode_frame(ws.OP_PONG, payload))
+                elif opcode == ws.OP_TEXT: replies.append(ws.encode_frame(ws.OP_TEXT, json.dumps(self.handle_message(payload))))
+                elif opcode == ws.OP_BINARY: raise ws.WebSocketError(ws.CLOSE_UNSUPPORTED, "Pesan biner tidak didukung.")
+        except ws.WebSocketError as e:
+            log_event('stream', 'websocket_protocol_error', logging.WARNING, game_id=self.game.game_id, player_id=self.player_id, error=e)
+            replies.append(ws.close_frame(e.close_code, str(e)))
+            return replies, True
+
+    def handle_message(self, payload):
+        """Pesan {"action": .., "id": .., ...} dijalankan lewat handler REST yang sama; hasilnya bertipe 'result'."""
+        try: request_data = json.loads(payload.decode('utf-8'))
+        except (UnicodeDecodeError, json.JSONDecodeError): request_data = None
+        if not isinstance(request_data, dict):
+            return {"type": "result", "success": False, "status": 400, "message": "Invalid JSON."}
+        action, request_id = request_data.pop('action', None), request_data.pop('id', None)
+        if action not in self.ACTIONS:
+            return {"type": "result", "id": request_id, "action": action, "success": False, "status": 400, "message": f"Aksi '{action}' tidak dikenal."}
+        limiter = self.http_handler.rate_limiter
+        retry_after = limiter.check_player(self.player_id) if limiter else 0
+        if retry_after:
+            return {"type": "result", "id": request_id, "action": action, "success": False, "status": 429, "retry_after": math.ceil(retry_after), "message": "Terlalu banyak aksi, coba lagi nanti."}
+        request_data['player_id'] = self.player_id # Identitas pemain ditentukan saat handshake
+        handler = getattr(self.http_handler, f'handle_{action}')
+        try:
+            response = handler(f'/{action}/{self.game.game_id}', json.dumps(request_data))
+        except Exception as e:
+            logging.error(f"Error aksi WebSocket {action}: {e}", exc_info=True)
+            return {"type": "result", "id": request_id, "action": action, "success": False, "status": 500, "message": f"Server error: {e}"}
+        status_code, body = self.http_handler.split_response(response)
+        result = {"type": "result", "id": request_id, "action": action, "status": status_code}
+        result.update(body)
+        return result
+
+    def run_blocking(self, sock):
+        """Server berbasis thread: satu thread per koneksi, dibangunkan oleh data client atau listener game."""
+        wake_recv, wake_send = socket.socketpair()
+        wake_send.setblocking(False)
+        def on_change(_game):
+            try: wake_send.send(b'\0')
+            except OSError: pass # Buffer penuh: thread sudah pasti akan bangun
+        self.game.add_listener(on_change)
+        try:
+            sock.sendall(self.header_bytes)
+            data = self.buffered
+            while True:
+                if data:
+                    replies, closed = self.receive(data)
+                    if replies: sock.sendall(b''.join(replies))
+                    if closed: return
+                frame = self.state_frame()
+                if frame: sock.sendall(frame)
+                if self.finished:
+                    sock.sendall(ws.close_frame(ws.CLOSE_NORMAL, "Game selesai"))
+                    return
+                readable, _, _ = select.select([sock, wake_recv], [], [], WS_PING_INTERVAL)
+                data = b''
+                if not readable: sock.sendall(self.PING)
+                if wake_recv in readable: wake_recv.recv(WS_RECV_SIZE)
+                if sock in readable:
+                    data = sock.recv(WS_RECV_SIZE)
+                    if not data: return
+        except OSError:
+            pass # Client menutup koneksi
+        finally:
+            self.game.remove_listener(on_change)
+            wake_recv.close()
+            wake_send.close()
+            self.close()
+
 class HttpServer:
-    def __init__(self, games_dict, games_lock, dictionary_set):
+    MIME_TYPES = { ".html": "text/html", ".css": "text/css", ".js": "application/javascript", ".json": "application/json", ".txt": "text/plain" }
+
+    def __init__(self, games_dict, games_lock, dictionary_set, static_cache=None, fragment_index=None):
         self.GAMES = games_dict
         self.GAMES_LOCK = games_lock
         self.DICTIONARY = dictionary_set
-        self.mime_types = { ".html": "text/html", ".css": "text/css", ".js": "application/javascript", ".json": "application/json", ".txt": "text/plain" }
+        self.fragment_index = fragment_index or FragmentIndex(dictionary_set, FRAGMENTS) # Untuk /hint dan auto-check
+        self.auto_check = AUTO_CHECK_DEAD_HANDS
+        self.stats_provider = None # Callable dari layer socket untuk statistik antrian/worker
+        self.shard_router = None # ShardRouter pada mode pre-fork; request game milik worker lain diteruskan
+        self.reaper = None # GameReaper yang membersihkan registry ini (untuk statistik)
+        self.rate_limiter = RateLimiter() # None = tanpa rate limiting
+        self.wire = threading.local() # wire.binary: request yang sedang diproses thread ini meminta encoding biner
+        self.static_cache = static_cache or StaticCache()
+        self.blocking_waits = True # False jika layer socket menunggu sendiri tanpa memblok thread (server async)
+        self.blocking_slots = threading.BoundedSemaphore(MAX_BLOCKING_WAITERS) # Long-poll
+        self.stream_slots = threading.BoundedSemaphore(MAX_STREAMS) # SSE/WebSocket (dan relay-nya di mode pre-fork)
+        self.mime_types = self.MIME_TYPES
+        self.metrics = Metrics()
+        self.metrics.gauges.update({
+            "sekata_active_games": ("Jumlah game di registry.", lambda: len(self.GAMES)),
+            "sekata_players": ("Jumlah pemain di semua game.", lambda: sum(len(game.players) for game in self.GAMES.snapshot())),
+        })
+        if hasattr(self.GAMES, 'lock_wait_seconds'):
+            self.metrics.counters.update({
+                "sekata_registry_lock_wait_seconds_total": ("Total waktu menunggu lock registry game.", lambda: self.GAMES.lock_wait_seconds),
+                "sekata_registry_lock_contended_total": ("Jumlah akuisisi lock registry yang harus menunggu.", lambda: self.GAMES.lock_contended),
+                "sekata_games_evicted_total": ("Game yang dikeluarkan dari registry per alasan.", lambda: {f'reason="{reason}"': count for reason, count in self.GAMES.evictions.items()}),
+            })
+        self.metrics.counters["sekata_rate_limited_total"] = ("Request yang ditolak 429 per cakupan dan jenis.",
+            lambda: {f'scope="{scope}",kind="{kind}"': count for (scope, kind), count in self.rate_limiter.limited.items()} if self.rate_limiter else {})
 
-    def build_response(self, status_code, status_text, headers, body):
+    def build_headers(self, status_code, status_text, headers, content_length):
+        """content_length=None untuk body streaming yang diakhiri dengan menutup koneksi."""
         response_line = f"HTTP/1.1 {status_code} {status_text}\r\n"
         headers.update({'Server': 'Sekata-Modular-Server/1.0', 'Date': datetime.now().strftime('%a, %d %b %Y %H:%M:%S GMT'), 'Connection': 'close', 'Access-Control-Allow-Origin': '*'})
+        if content_length is not None: headers['Content-Length'] = content_length
+        headers_str = "".join([f"{k}: {v}\r\n" for k, v in headers.items()])
+        return response_line.encode('utf-8') + headers_str.encode('utf-8') + b"\r\n"
+
+    def build_response(self, status_code, status_text, headers, body):
         if body:
             if not isinstance(body, bytes): body = body.encode('utf-8')
-            headers['Content-Length'] = len(body)
         else:
-            headers['Content-Length'] = 0
             body = b''
-        headers_str = "".join([f"{k}: {v}\r\n" for k, v in headers.items()])
-        return response_line.encode('utf-8') + headers_str.encode('utf-8') + b"\r\n" + body
+        return self.build_headers(status_code, status_text, headers, len(body)) + body
 
     def json_response(self, status_code, status_text, data_dict):
+        if getattr(self.wire, 'binary', False):
+            try:
+                return self.build_response(status_code, status_text, {"Content-Type": wire_binary.CONTENT_TYPE, "Vary": "Accept"}, wire_binary.encode_result(data_dict))
+            except ValueError:
+                pass # Melebihi batas format biner: jawab dengan JSON
         return self.build_response(status_code, status_text, {"Content-Type": "application/json"}, json.dumps(data_dict))
 
-    def proses(self, request_text):
-        logging.info(f"Memproses request:\n{request_text.strip()}")
+    def split_response(self, response_bytes):
+        """(status_code, body_json) dari respons bytes milik handler, untuk dipakai ulang di luar HTTP (WebSocket, /batch)."""
+        head, _, body = response_bytes.partition(b'\r\n\r\n')
+        return int(head.split(b' ', 2)[1]), json.loads(body) if body else None
+
+    def set_keep_alive(self, response_bytes, keep_alive):
+        """Mengganti header 'Connection: close' dengan keep-alive. keep_alive = (timeout, sisa_request) atau None."""
+        if not keep_alive or isinstance(response_bytes, StreamResponse): return response_bytes # Stream selalu diakhiri dengan menutup koneksi
+        if isinstance(response_bytes, FileResponse):
+            response_bytes.header_bytes = self.set_keep_alive(response_bytes.header_bytes, keep_alive)
+            return response_bytes
+        timeout, remaining = keep_alive
+        return response_bytes.replace(b'\r\nConnection: close\r\n', f'\r\nConnection: keep-alive\r\nKeep-Alive: timeout={timeout}, max={remaining}\r\n'.encode('utf-8'), 1)
+
+    def proses(self, request, keep_alive=None):
+        """request: HttpRequest dari RequestReader, atau teks request utuh (str)."""
+        started = time.perf_counter()
+        if isinstance(request, str):
+            try: request = HttpRequest.from_text(request)
+            except RequestError as e: return self.json_response(e.status_code, e.status_text, {"success": False, "message": str(e)})
+        self.wire.binary = request.path.startswith(BINARY_PATH_PREFIXES) and wire_binary.accepts_binary(request.headers)
+        try:
+            response = self._dispatch(request)
+        finally:
+            self.wire.binary = False
+        path, _, query = request.target.partition('?')
         try:
-            request_line, rest = request_text.split('\r\n', 1)
-            headers_raw, body = (rest.split('\r\n\r\n', 1) + [''])[:2]
-            method, full_path, _ = request_line.split(' ')
-            if method == 'GET': return self.handle_get_request(full_path)
-            if method == 'POST': return self.handle_post_request(full_path, body)
+            self.metrics.observe_request(route_of(path, query), self.status_of(response), time.perf_counter() - started)
+        except Exception as e: # Metrik tidak boleh menggagalkan respons yang sudah jadi
+            logging.error(f"Error mencatat metrik untuk {request.target!r}: {e}", exc_info=True)
+        return self.set_keep_alive(response, keep_alive)
+
+    def status_of(self, response):
+        """Status code respons (0 untuk relay stream yang header-nya datang dari worker lain)."""
+        head = response.header_bytes if isinstance(response, (FileResponse, StreamResponse)) else response
+        return int(head[9:12]) if head.startswith(b'HTTP/') else 0
+
+    def _dispatch(self, request):
+        try:
+            log_event('request', 'request', method=request.method, target=request.target, body_bytes=len(request.body))
+            if self.shard_router:
+                forwarded = self.shard_router.route(request)
+                if forwarded is not None: return forwarded
+            limited = self.admit(request)
+            if limited: return limited
+            if request.path.startswith('/admin/'): return self.handle_admin(request)
+            if request.method == 'GET': return self.handle_get_request(request.target, request.headers)
+            if request.method == 'POST' and request.path == '/batch': return self.handle_batch(request.body_text(), request)
+            if request.method == 'POST': return self.handle_post_request(request.target, request.body_text())
             return self.json_response(405, "Method Not Allowed", {"success": False, "message": "Method not allowed"})
+        except RequestError as e:
+            return self.json_response(e.status_code, e.status_text, {"success": False, "message": str(e)})
         except Exception as e:
             logging.error(f"Error parsing request: {e}", exc_info=True)
             return self.json_response(500, "Internal Server Error", {"success": False, "message": f"Server error: {e}"})
             
-    def handle_get_request(self, full_path):
+    def admit(self, request):
+        """Rate limiting sebelum routing dan parsing JSON. None jika request boleh diproses, selain itu respons 429.
+        Hasil disimpan di request agar pemeriksaan ulang (server async sebelum long-poll) tidak memotong token lagi."""
+        if self.rate_limiter is None: return None
+        # Kelompok /batch terusan dari worker lain sudah dipotong tokennya di worker penerima
+        if self.shard_router and self.shard_router.is_precharged(request): return None
+        if request.retry_after is None: request.retry_after = self.rate_limiter.check(request)
+        return self.rate_limited(request, request.retry_after) if request.retry_after else None
+
+    def admit_batch(self, request, count):
+        """Memotong token untuk sisa sub-request /batch (admit() sudah memotong satu). None jika boleh dijalankan."""
+        if self.rate_limiter is None or request is None: return None
+        if self.shard_router and self.shard_router.is_precharged(request): return None
+        retry_after = self.rate_limiter.check_batch(request, count)
+        return self.rate_limited(request, retry_after) if retry_after else None
+
+    def rate_limited(self, request, retry_after):
+        log_event('limit', 'rate_limited', method=request.method, path=request.path, retry_after=round(retry_after, 2))
+        return self.build_response(429, "Too Many Requests", {"Content-Type": "application/json", "Retry-After": math.ceil(retry_after)}, json.dumps({"success": False, "message": "Terlalu banyak request, coba lagi nanti."}))
+
+    def handle_get_request(self, full_path, request_headers=None):
         parsed_url = urllib.parse.urlparse(full_path)
-        if parsed_url.path.startswith('/game_status/'): return self.handle_game_status(parsed_url.path, parsed_url.query)
-        if parsed_url.path == '/': return self.serve_static_file('index.html')
-        if parsed_url.path.startswith('/static/'): return self.serve_static_file(parsed_url.path[len('/static/'):], is_static=True)
+        if parsed_url.path.startswith('/game_status/'): return self.handle_game_status(parsed_url.path, parsed_url.query, request_headers or {})
+        if parsed_url.path.startswith('/hint/'): return self.handle_hint(parsed_url.path, parsed_url.query)
+        if parsed_url.path.startswith('/events/'): return self.handle_events(parsed_url.path, parsed_url.query, request_headers or {})
+        if parsed_url.path.startswith('/ws/'): return self.handle_websocket(parsed_url.path, parsed_url.query, request_headers or {})
+        if parsed_url.path == '/server_stats': return self.handle_server_stats()
+        if parsed_url.path == '/metrics': return self.build_response(200, "OK", {"Content-Type": PROMETHEUS_CONTENT_TYPE}, self.metrics.render())
+        if parsed_url.path == '/': return self.serve_static_file('index.html', request_headers=request_headers)
+        if parsed_url.path.startswith('/static/'): return self.serve_static_file(parsed_url.path[len('/static/'):], is_static=True, request_headers=request_headers)
         return self.json_response(404, "Not Found", {"success": False, "message": "Endpoint GET tidak ditemukan."})
 
     def handle_post_request(self, path, body):
@@ -60,89 +384,311 @@ class HttpServer:
         if path.startswith('/start_game/'): return self.handle_start_game(path, body)
         if path.startswith('/submit_turn/'): return self.handle_submit_turn(path, body)
         if path.startswith('/check_turn/'): return self.handle_check_turn(path, body)
+        if path == '/batch': return self.handle_batch(body)
         return self.json_response(404, "Not Found", {"success": False, "message": "ENDPOINT POST tidak ditemukan."})
         
-    def serve_static_file(self, requested_path, is_static=False):
+    def serve_static_file(self, requested_path, is_static=False, request_headers=None):
         base_dir = os.path.dirname(__file__); rel_path = os.path.join('static', requested_path) if is_static else requested_path
         file_path = os.path.join(base_dir, rel_path)
         if not os.path.normpath(file_path).startswith(os.path.normpath(base_dir)):
             return self.json_response(403, "Forbidden", {"success": False, "message": "Akses dilarang."})
-        if os.path.exists(file_path) and os.path.isfile(file_path):
-            _, ext = os.path.splitext(file_path); content_type = self.mime_types.get(ext.lower(), "application/octet-stream")
-            with open(file_path, 'rb') as f: body_bytes = f.read()
-            return self.build_response(200, "OK", {"Content-Type": content_type}, body_bytes)
-        return self.json_response(404, "Not Found", {"success": False, "message": f"File '{requested_path}' tidak ditemukan."})
+        _, ext = os.path.splitext(file_path); content_type = self.mime_types.get(ext.lower(), "application/octet-stream")
+        asset = self.static_cache.get(os.path.normpath(file_path), content_type)
+        if asset is None:
+            return self.json_response(404, "Not Found", {"success": False, "message": f"File '{requested_path}' tidak ditemukan."})
+        request_headers = request_headers or {}
+        byte_range = asset.byte_range(request_headers)
+        # Range selalu dilayani dari representasi asli (tanpa gzip).
+        use_gzip = byte_range is None and asset.gzip_body is not None and accepts_gzip(request_headers)
+        etag = asset.gzip_etag if use_gzip else asset.etag
+        headers = {"Content-Type": content_type, "ETag": etag, "Last-Modified": asset.last_modified, "Cache-Control": "no-cache", "Vary": "Accept-Encoding", "Accept-Ranges": "bytes"}
+        if asset.is_not_modified(request_headers, etag):
+            return self.build_response(304, "Not Modified", headers, b'')
+        if use_gzip:
+            headers["Content-Encoding"] = "gzip"
+            return self.build_response(200, "OK", headers, asset.gzip_body)
+        if byte_range == 'unsatisfiable':
+            headers["Content-Range"] = f"bytes */{asset.size}"
+            return self.build_response(416, "Range Not Satisfiable", headers, b'')
+        status_code, status_text, start, end = 200, "OK", 0, asset.size - 1
+        if byte_range is not None:
+            start, end = byte_range
+            status_code, status_text = 206, "Partial Content"
+            headers["Content-Range"] = f"bytes {start}-{end}/{asset.size}"
+        if asset.body is not None:
+            return self.build_response(status_code, status_text, headers, asset.body[start:end + 1])
+        return FileResponse(self.build_headers(status_code, status_text, headers, end - start + 1), asset.file_path, start, end - start + 1)
             
     def _get_json_body(self, body):
         if not body: return {}
         try: return json.loads(body)
         except json.JSONDecodeError: return None
 
-    # (Handler untuk create, join, start, status, check tidak berubah)
+    def handle_server_stats(self):
+        stats = self.stats_provider() if self.stats_provider else {}
+        stats["active_games"] = len(self.GAMES)
+        if self.reaper: stats.update(self.reaper.stats())
+        if self.rate_limiter: stats.update(self.rate_limiter.stats())
+        stats.update(server_log.stats())
+        return self.json_response(200, "OK", {"success": True, "data": stats})
+
+    def is_admin(self, request):
+        if ADMIN_TOKEN: return hmac.compare_digest(request.headers.get('x-admin-token', ''), ADMIN_TOKEN)
+        # Tanpa token: hanya koneksi langsung dari localhost. Request lewat proxy di host yang sama (load balancer,
+        # worker pre-fork) membawa X-Forwarded-For dan berasal dari client lain, jadi ditolak.
+        if 'x-forwarded-for' in request.headers: return False
+        return bool(request.remote_addr) and request.remote_addr[0] in ('127.0.0.1', '::1')
+
+    def handle_admin(self, request):
+        if not self.is_admin(request): return self.json_response(403, "Forbidden", {"success": False, "message": "Khusus admin."})
+        parsed_url = urllib.parse.urlparse(request.target); query_params = urllib.parse.parse_qs(parsed_url.query)
+        if parsed_url.path != '/admin/profile': return self.json_response(404, "Not Found", {"success": False, "message": "Endpoint admin tidak ditemukan."})
+        try:
+            seconds = float(query_params.get('seconds', ['10'])[0]); interval = float(query_params.get('interval', [profiler.SAMPLE_INTERVAL])[0])
+        except ValueError:
+            return self.json_response(400, "Bad Request", {"success": False, "message": "seconds/interval tidak valid."})
+        # Sesi memblok thread ini selama 'seconds'; thread lain tetap melayani request (dan ikut diukur).
+        result = profiler.profile(self, seconds, max(0.001, interval))
+        if result is None: return self.json_response(409, "Conflict", {"success": False, "message": "Sesi profiling lain sedang berjalan."})
+        output = query_params.get('format', ['json'])[0]
+        if output == 'collapsed': return self.build_response(200, "OK", {"Content-Type": "text/plain; charset=utf-8"}, result["collapsed"])
+        if output == 'cprofile': return self.build_response(200, "OK", {"Content-Type": "text/plain; charset=utf-8"}, result["cprofile"])
+        return self.json_response(200, "OK", {"success": True, "data": result})
+
+    def new_game_id(self):
+        """ID game acak 6 karakter. Pada mode shard hanya ID milik worker ini yang dipilih."""
+        while True:
+            game_id = ''.join(random.choices(string.ascii_uppercase + string.digits, k=6))
+            if self.shard_router and not self.shard_router.owns(game_id): continue
+            if game_id not in self.GAMES: return game_id
+
+    # Lookup game hanya memegang lock registry sebentar; semua mutasi di bawah game.lock.
     def handle_create_game(self, body):
         request_data = self._get_json_body(body)
         if request_data is None: return self.json_response(400, "Bad Request", {"success": False, "message": "Invalid JSON."})
         player_id = request_data.get('player_id')
         if not player_id: return self.json_response(400, "Bad Request", {"success": False, "message": "Player ID required."})
-        game_id = ''.join(__import__('random').choices(__import__('string').ascii_uppercase + __import__('string').digits, k=6))
-        new_game = Game(game_id, player_id)
-        with self.GAMES_LOCK: self.GAMES[game_id] = new_game
-        logging.info(f"Game baru dibuat: {game_id} oleh {player_id}")
+        while True:
+            new_game = Game(self.new_game_id(), player_id)
+            if self.GAMES.add(new_game): break
+        game_id = new_game.game_id
+        log_event('game', 'game_created', game_id=game_id, host_id=player_id)
         return self.json_response(200, "OK", {"success": True, "game_id": game_id})
 
     def handle_join_game(self, path, body):
         game_id = path.split('/')[2]; request_data = self._get_json_body(body)
         if request_data is None: return self.json_response(400, "Bad Request", {"success": False, "message": "Invalid JSON."})
         player_id = request_data.get('player_id')
-        with self.GAMES_LOCK: game = self.GAMES.get(game_id)
+        game = self.GAMES.get(game_id)
         if not game: return self.json_response(404, "Not Found", {"success": False, "message": "Game not found."})
-        if game.add_player(player_id): return self.json_response(200, "OK", {"success": True, "message": "Joined game successfully."})
+        with game.lock: joined = game.add_player(player_id)
+        if joined: return self.json_response(200, "OK", {"success": True, "message": "Joined game successfully."})
         return self.json_response(400, "Bad Request", {"success": False, "message": "Player sudah ada atau game sudah mulai."})
 
     def handle_start_game(self, path, body):
-        game_id = path.split('/')[2]; request_data = self._get_json_body(body); player_id = request_data.get('player_id')
-        with self.GAMES_LOCK:
-            game = self.GAMES.get(game_id)
-            if not game: return self.json_response(404, "Not Found", {"success": False, "message": "Game tidak ditemukan."})
+        game_id = path.split('/')[2]; request_data = self._get_json_body(body)
+        if request_data is None: return self.json_response(400, "Bad Request", {"success": False, "message": "Invalid JSON."})
+        player_id = request_data.get('player_id')
+        game = self.GAMES.get(game_id)
+        if not game: return self.json_response(404, "Not Found", {"success": False, "message": "Game tidak ditemukan."})
+        with game.lock:
             if game.host_id != player_id: return self.json_response(403, "Forbidden", {"success": False, "message": "Hanya host yang bisa memulai."})
             success, msg = game.start_game()
-            if success: return self.json_response(200, "OK", {"success": True, "message": msg})
-            return self.json_response(400, "Bad Request", {"success": False, "message": msg})
+            if success: self.turn_started(game)
+        if success: return self.json_response(200, "OK", {"success": True, "message": msg})
+        return self.json_response(400, "Bad Request", {"success": False, "message": msg})
     
-    def handle_game_status(self, path, query_string):
+    def parse_long_poll(self, query_params):
+        """Mengembalikan (since_version, wait_detik) untuk ?since=..&wait=.., atau None jika bukan long-poll."""
+        since, wait = query_params.get('since', [None])[0], query_params.get('wait', [None])[0]
+        if since is None or wait is None: return None
+        try: return int(since), max(0.0, min(float(wait), MAX_LONG_POLL_WAIT))
+        except ValueError: return None
+
+    def long_poll_target(self, request):
+        """Untuk server async: (game, since, wait) jika request adalah long-poll yang masih harus menunggu."""
+        parsed_url = urllib.parse.urlparse(request.target)
+        if request.method != 'GET' or not parsed_url.path.startswith('/game_status/'): return None
+        if self.admit(request): return None # Ditolak: langsung dijawab 429 tanpa menunggu
+        long_poll = self.parse_long_poll(urllib.parse.parse_qs(parsed_url.query))
+        if not long_poll: return None
+        game = self.GAMES.get(parsed_url.path.split('/')[2])
+        if not game or game.version > long_poll[0]: return None
+        return game, long_poll[0], long_poll[1]
+
+    def handle_game_status(self, path, query_string, request_headers=None):
         game_id = path.split('/')[2]; query_params = urllib.parse.parse_qs(query_string); player_id = query_params.get('player_id', [None])[0]
-        with self.GAMES_LOCK: game = self.GAMES.get(game_id)
+        game = self.GAMES.get(game_id)
         if not game: return self.json_response(404, "Not Found", {"success": False, "message": "Game not found."})
-        status = game.get_game_state_for_player(player_id)
-        return self.json_response(200, "OK", {"success": True, "data": status})
+        long_poll = self.parse_long_poll(query_params)
+        try: since = int(query_params['since'][0]) if 'since' in query_params else None
+        except ValueError: since = None
+        # Long-poll: tahan request sampai version game melewati 'since'. Jika slot penuh, langsung jawab (client poll ulang).
+        if long_poll and self.blocking_waits and game.version <= long_poll[0] and self.blocking_slots.acquire(blocking=False):
+            try: game.wait_for_change(*long_poll)
+            finally: self.blocking_slots.release()
+        # Snapshot diambil dari cache per version (lihat Game.serialized_state_for_player) di bawah lock.
+        binary = getattr(self.wire, 'binary', False)
+        with game.lock:
+            if binary:
+                # Encoding biner selalu berisi state lengkap (sudah ringkas), parameter since diabaikan.
+                # State yang melebihi batas format biner (lihat wire_binary) dijawab dengan JSON.
+                try: encoded = game.encoded_state_for_player(player_id, wire_binary.encode_state)
+                except ValueError: binary = False
+            etag = f'"{game.game_id}-{game.version}{"-b" if binary else ""}"'
+            headers = {"Content-Type": wire_binary.CONTENT_TYPE if binary else "application/json", "ETag": etag, "Cache-Control": "no-cache", "Vary": "Accept"}
+            if etag_matches(request_headers or {}, etag): return self.build_response(304, "Not Modified", headers, b'')
+            if binary: return self.build_response(200, "OK", headers, encoded)
+            # Client yang mengirim since menerima delta (hanya field yang berubah); snapshot penuh jika sudah tertinggal jauh.
+            delta = game.serialized_delta_for_player(player_id, since) if since is not None else None
+            if delta is not None: return self.build_response(200, "OK", headers, b'{"success": true, "delta": true, "data": ' + delta + b'}')
+            status = game.serialized_state_for_player(player_id)
+        return self.build_response(200, "OK", headers, b'{"success": true, "data": ' + status + b'}')
+
+    def handle_hint(self, path, query_string):
+        """GET /hint/<game_id>?player_id=..&limit=N: langkah legal untuk tangan pemain, skor tertinggi dulu."""
+        game_id = path.split('/')[2]; query_params = urllib.parse.parse_qs(query_string); player_id = query_params.get('player_id', [None])[0]
+        try: limit = max(0, int(query_params['limit'][0])) if 'limit' in query_params else None
+        except ValueError: return self.json_response(400, "Bad Request", {"success": False, "message": "limit harus berupa angka."})
+        game = self.GAMES.get(game_id)
+        if not game: return self.json_response(404, "Not Found", {"success": False, "message": "Game tidak ditemukan."})
+        with game.lock:
+            if player_id not in game.players: return self.json_response(403, "Forbidden", {"success": False, "message": "Bergabung ke game terlebih dahulu."})
+            if not game.game_started: return self.json_response(400, "Bad Request", {"success": False, "message": "Game belum dimulai."})
+            moves = game.legal_moves_for(player_id, self.fragment_index) or []
+            data = {"card_on_table": game.card_on_table, "your_turn": game.get_current_player_id() == player_id, "count": len(moves), "moves": moves[:limit]}
+        return self.json_response(200, "OK", {"success": True, "data": data})
+
+    def handle_events(self, path, query_string, request_headers):
+        game_id = path.split('/')[2]; query_params = urllib.parse.parse_qs(query_string); player_id = query_params.get('player_id', [None])[0]
+        game = self.GAMES.get(game_id)
+        if not game: return self.json_response(404, "Not Found", {"success": False, "message": "Game not found."})
+        release = None
+        if self.blocking_waits:
+            # Stream menahan satu thread selama game berjalan; jika slot habis client memakai long-poll.
+            if not self.stream_slots.acquire(blocking=False):
+                return self.build_response(503, "Service Unavailable", {"Content-Type": "application/json", "Retry-After": SSE_HEARTBEAT_INTERVAL}, json.dumps({"success": False, "message": "Stream penuh, gunakan long-poll /game_status."}))
+            release = self.stream_slots.release
+        try: last_version = int(request_headers.get('last-event-id', -1))
+        except ValueError: last_version = -1
+        headers = {"Content-Type": "text/event-stream", "Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+        return EventStream(self.build_headers(200, "OK", headers, None), game, player_id, last_version, release)
+
+    def handle_websocket(self, path, query_string, request_headers):
+        game_id = path.split('/')[2]; query_params = urllib.parse.parse_qs(query_string); player_id = query_params.get('player_id', [None])[0]
+        key = request_headers.get('sec-websocket-key')
+        if not ws.is_upgrade_request(request_headers) or not key or request_headers.get('sec-websocket-version') != '13':
+            return self.build_response(426, "Upgrade Required", {"Content-Type": "application/json", "Upgrade": "websocket", "Sec-WebSocket-Version": "13"}, json.dumps({"success": False, "message": "Endpoint ini membutuhkan WebSocket (versi 13)."}))
+        game = self.GAMES.get(game_id)
+        if not game: return self.json_response(404, "Not Found", {"success": False, "message": "Game not found."})
+        with game.lock: joined = player_id in game.players
+        if not joined: return self.json_response(403, "Forbidden", {"success": False, "message": "Bergabung ke game terlebih dahulu."})
+        release = None
+        if self.blocking_waits:
+            # Sama seperti SSE: satu thread ditahan selama koneksi hidup; jika slot habis client memakai REST.
+            if not self.stream_slots.acquire(blocking=False):
+                return self.build_response(503, "Service Unavailable", {"Content-Type": "application/json", "Retry-After": SSE_HEARTBEAT_INTERVAL}, json.dumps({"success": False, "message": "Koneksi WebSocket penuh, gunakan REST."}))
+            release = self.stream_slots.release
+        log_event('stream', 'websocket_opened', game_id=game_id, player_id=player_id)
+        return GameSocket(ws.handshake_response(key), self, game, player_id, release)
+
+    def handle_batch(self, body, request=None):
+        """POST /batch {"requests": [{"method": "GET"|"POST", "path": .., "body": {..}}, ...]}.
+        Sub-request berurutan untuk game yang sama dijalankan sekaligus di bawah game.lock (atomik).
+        request: HttpRequest asli, agar alamat client ikut terbawa saat kelompok diteruskan ke worker lain."""
+        request_data = self._get_json_body(body)
+        sub_requests = request_data.get('requests') if isinstance(request_data, dict) else None
+        if not isinstance(sub_requests, list): return self.json_response(400, "Bad Request", {"success": False, "message": "Body harus berisi 'requests' (list)."})
+        if len(sub_requests) > MAX_BATCH_REQUESTS: return self.json_response(413, "Payload Too Large", {"success": False, "message": f"Maksimal {MAX_BATCH_REQUESTS} sub-request per batch."})
+        limited = self.admit_batch(request, len(sub_requests)) # Satu token per sub-request
+        if limited: return limited
+        results = []
+        for game_id, group in self._batch_groups(sub_requests):
+            results.extend(self._run_batch_group(game_id, group, request))
+        return self.json_response(200, "OK", {"success": True, "results": results})
+
+    def _batch_groups(self, sub_requests):
+        """Mengelompokkan sub-request berurutan yang menyentuh game yang sama: [(game_id atau None, [sub, ...])]."""
+        groups = []
+        for sub in sub_requests:
+            path = sub.get('path') if isinstance(sub, dict) else None
+            parts = path.split('?', 1)[0].split('/') if isinstance(path, str) else []
+            game_id = parts[2] if len(parts) > 2 and parts[2] else None
+            if game_id and groups and groups[-1][0] == game_id: groups[-1][1].append(sub)
+            else: groups.append((game_id, [sub]))
+        return groups
+
+    def _run_batch_group(self, game_id, group, request=None):
+        if game_id and self.shard_router and not self.shard_router.owns(game_id):
+            # Game milik worker lain: seluruh kelompok diteruskan sebagai satu /batch agar tetap atomik di sana.
+            headers = {'content-type': 'application/json'}
+            if request and 'x-forwarded-for' in request.headers: headers['x-forwarded-for'] = request.headers['x-forwarded-for']
+            forwarded = HttpRequest('POST', '/batch', 'HTTP/1.1', headers, json.dumps({"requests": group}).encode('utf-8'))
+            forwarded.remote_addr = request.remote_addr if request else None # client_address() sama dengan request asli
+            status_code, body = self.split_response(self.shard_router.forward(forwarded, self.shard_router.shard_for(game_id), precharged=True))
+            if status_code == 200: return body["results"]
+            return [{"status": status_code, "body": body}] * len(group)
+        game = self.GAMES.get(game_id) if game_id else None
+        with game.lock if game else nullcontext():
+            return [self._run_batch_item(sub) for sub in group]
+
+    def _run_batch_item(self, sub):
+        if not isinstance(sub, dict) or not isinstance(sub.get('path'), str):
+            return {"status": 400, "body": {"success": False, "message": "Sub-request membutuhkan 'path'."}}
+        method, path = str(sub.get('method', 'GET')).upper(), sub['path']
+        try:
+            if method == 'GET' and path.startswith(BATCH_GET_PREFIXES):
+                # Long-poll akan menahan game.lock milik seluruh kelompok, jadi tidak diizinkan di dalam batch.
+                if 'wait' in urllib.parse.parse_qs(urllib.parse.urlparse(path).query):
+                    return {"status": 400, "body": {"success": False, "message": "Long-poll (wait) tidak didukung di /batch."}}
+                response = self.handle_get_request(path)
+            elif method == 'POST' and path.startswith(BATCH_POST_PREFIXES):
+                response = self.handle_post_request(path, json.dumps(sub.get('body') or {}))
+            else:
+                return {"status": 400, "body": {"success": False, "message": f"Sub-request {method} {path} tidak didukung di /batch."}}
+        except Exception as e:
+            logging.error(f"Error sub-request batch {method} {path}: {e}", exc_info=True)
+            return {"status": 500, "body": {"success": False, "message": f"Server error: {e}"}}
+        status_code, body = self.split_response(response)
+        return {"status": status_code, "body": body}
+
+    def turn_started(self, game):
+        """Dipanggil di bawah game.lock setiap kali giliran berganti."""
+        if self.auto_check: game.auto_check_dead_hands(self.fragment_index)
 
     def handle_check_turn(self, path, body):
-        game_id = path.split('/')[2]; request_data = self._get_json_body(body); player_id = request_data.get('player_id')
-        with self.GAMES_LOCK:
-            game = self.GAMES.get(game_id)
-            if not game: return self.json_response(404, "Not Found", {"success": False, "message": "Game tidak ditemukan."})
+        game_id = path.split('/')[2]; request_data = self._get_json_body(body)
+        if request_data is None: return self.json_response(400, "Bad Request", {"success": False, "message": "Invalid JSON."})
+        player_id = request_data.get('player_id')
+        game = self.GAMES.get(game_id)
+        if not game: return self.json_response(404, "Not Found", {"success": False, "message": "Game tidak ditemukan."})
+        with game.lock:
             if game.get_current_player_id() != player_id: return self.json_response(403, "Forbidden", {"success": False, "message": "Bukan giliran Anda."})
             game.next_turn(action_was_check=True)
-            if game.winner: return self.json_response(200, "OK", {"success": True, "message": f"Giliran dilewati. Pemenang: {game.winner}"})
-            return self.json_response(200, "OK", {"success": True, "message": "Giliran dilewati."})
+            self.turn_started(game)
+            winner = game.winner
+        if winner: return self.json_response(200, "OK", {"success": True, "message": f"Giliran dilewati. Pemenang: {winner}"})
+        return self.json_response(200, "OK", {"success": True, "message": "Giliran dilewati."})
             
     def handle_submit_turn(self, path, body):
-        with self.GAMES_LOCK:
-            game_id = path.split('/')[2]
-            request_data = self._get_json_body(body)
-            if request_data is None: return self.json_response(400, "Bad Request", {"success": False, "message": "Invalid JSON."})
+        # Parsing dan validasi bentuk request tidak butuh lock apa pun.
+        game_id = path.split('/')[2]
+        request_data = self._get_json_body(body)
+        if request_data is None: return self.json_response(400, "Bad Request", {"success": False, "message": "Invalid JSON."})
 
-            player_id = request_data.get('player_id')
-            moves = request_data.get('moves')
+        player_id = request_data.get('player_id')
+        moves = request_data.get('moves')
 
-            if not all([game_id, player_id, isinstance(moves, list)]):
-                return self.json_response(400, "Bad Request", {"success": False, "message": "Data tidak lengkap (membutuhkan game_id, player_id, moves)."})
-            
-            if not moves:
-                return self.json_response(400, "Bad Request", {"success": False, "message": "Tidak ada langkah yang dikirim."})
+        if not all([game_id, player_id, isinstance(moves, list)]):
+            return self.json_response(400, "Bad Request", {"success": False, "message": "Data tidak lengkap (membutuhkan game_id, player_id, moves)."})
+        
+        if not moves:
+            return self.json_response(400, "Bad Request", {"success": False, "message": "Tidak ada langkah yang dikirim."})
+
+        game = self.GAMES.get(game_id)
+        if not game: return self.json_response(404, "Not Found", {"success": False, "message": "Game tidak ditemukan."})
 
-            game = self.GAMES.get(game_id)
-            if not game: return self.json_response(404, "Not Found", {"success": False, "message": "Game tidak ditemukan."})
+        with game.lock:
             if game.get_current_player_id() != player_id: return self.json_response(403, "Forbidden", {"success": False, "message": "Bukan giliran Anda."})
             
             player = game.players[player_id]
@@ -154,11 +700,11 @@ class HttpServer:
                 card_value = move.get('card', '').upper()
                 if card_type == 'hand':
                     if hand_card_in_move: return self.json_response(400, "Bad Request", {"success": False, "message": "Hanya boleh menggunakan 1 kartu tangan per giliran."})
-                    if card_value not in player.hand: return self.json_response(400, "Bad Request", {"success": False, "message": f"Kartu '{card_value}' tidak ada di tangan Anda."})
+                    if not player.has_card(card_value): return self.json_response(400, "Bad Request", {"success": False, "message": f"Kartu '{card_value}' tidak ada di tangan Anda."})
                     hand_card_in_move = card_value
                 elif card_type == 'helper':
                     if helper_card_in_move: return self.json_response(400, "Bad Request", {"success": False, "message": "Hanya boleh menggunakan 1 kartu helper per giliran."})
-                    if card_value not in game.helper_cards: return self.json_response(400, "Bad Request", {"success": False, "message": f"Kartu helper '{card_value}' tidak valid."})
+                    if not game.has_helper_card(card_value): return self.json_response(400, "Bad Request", {"success": False, "message": f"Kartu helper '{card_value}' tidak valid."})
                     helper_card_in_move = card_value
 
             if not hand_card_in_move:
@@ -182,7 +728,7 @@ class HttpServer:
             if helper_card_in_move:
                 game.use_helper_card(helper_card_in_move)
 
-            game.discard_pile.append(game.card_on_table)
+            game.discard(game.card_on_table)
             
 
             game.card_on_table = hand_card_in_move
@@ -194,7 +740,8 @@ class HttpServer:
                 return self.json_response(200, "OK", {"success": True, "message": f"Anda menang! Kata terakhir: {final_word}.", "winner": player_id})
 
             game.next_turn(action_was_check=False)
+            self.turn_started(game)
             
-            success_msg = f"Berhasil membentuk kata '{final_word}'! (+{score_earned} poin)"
-            logging.info(f"[{player_id}] {success_msg}")
-            return self.json_response(200, "OK", {"success": True, "message": success_msg, "score_earned": score_earned})
\ No newline at end of file
+        success_msg = f"Berhasil membentuk kata '{final_word}'! (+{score_earned} poin)"
+        log_event('game', 'turn_submitted', game_id=game_id, player_id=player_id, word=final_word, score=score_earned)
+        return self.json_response(200, "OK", {"success": True, "message": success_msg, "score_earned": score_earned})
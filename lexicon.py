@@ -0,0 +1,224 @@
+# lexicon.py (Kamus terkompilasi: array kata terurut dalam satu file biner yang dibaca lewat mmap)
+#
+# Dikompilasi sekali secara offline:  python lexicon.py static/dictionary.txt static/dictionary.lex
+#
+# Format (little-endian):
+#   header  : magic b'SKLX', versi u8, 3 byte padding, jumlah kata N u32, ukuran blob u32
+#   offsets : (N+1) x u32, awal kata ke-i di blob; kata diurutkan per byte UTF-8
+#   suffixes: N x u32, indeks kata diurutkan menurut byte kata yang dibalik (untuk query akhiran)
+#   blob    : kata UTF-8 uppercase, disambung tanpa pemisah
+# Loader hanya memetakan file (mmap read-only). Tidak ada yang dibaca atau dialokasikan per kata, sehingga waktu
+# startup tidak bergantung pada ukuran kamus, dan halaman file dibagi semua proses worker lewat page cache.
+import argparse
+import heapq
+import mmap
+import os
+import struct
+import sys
+import time
+from array import array
+from bisect import bisect_left
+
+MAGIC = b'SKLX'
+LEXICON_VERSION = 1
+_HEADER = struct.Struct('<4sBxxxII') # magic, versi, jumlah kata, ukuran blob
+
+def compile_words(words):
+    """Iterable kata -> bytes file kamus terkompilasi (kata di-uppercase, duplikat dan baris kosong dibuang)."""
+    encoded = sorted({word.strip().upper().encode('utf-8') for word in words} - {b''})
+    offsets = array('I', [0])
+    for word in encoded: offsets.append(offsets[-1] + len(word))
+    suffixes = array('I', sorted(range(len(encoded)), key=lambda index: encoded[index][::-1]))
+    if sys.byteorder != 'little':
+        offsets.byteswap()
+        suffixes.byteswap()
+    blob = b''.join(encoded)
+    return _HEADER.pack(MAGIC, LEXICON_VERSION, len(encoded), len(blob)) + offsets.tobytes() + suffixes.tobytes() + blob
+
+def compile_file(source_path, output_path):
+    """Mengompilasi daftar kata (satu per baris) ke file .lex. Ditulis ke file sementara lalu di-rename,
+    agar server yang sedang memetakan file lama tidak membaca file setengah jadi."""
+    with open(source_path, 'r', encoding='utf-8') as f: data = compile_words(f)
+    temp_path = output_path + '.tmp'
+    with open(temp_path, 'wb') as f: f.write(data)
+    os.replace(temp_path, output_path)
+    return _HEADER.unpack_from(data)[2], len(data)
+
+def _u32_view(data, start, count):
+    view = memoryview(data)[start:start + 4 * count]
+    if sys.byteorder == 'little': return view.cast('I')
+    values = array('I', view) # Mesin big-endian: disalin dan dibalik, tidak lagi berbagi halaman
+    values.byteswap()
+    return values
+
+class _Words:
+    """Kata terurut sebagai sequence bytes, agar bisa dicari dengan bisect langsung di atas buffer."""
+    __slots__ = ('data', 'offsets', 'base', 'count')
+
+    def __init__(self, data, offsets, base, count):
+        self.data = data
+        self.offsets = offsets
+        self.base = base
+        self.count = count
+
+    def __len__(self):
+        return self.count
+
+    def __getitem__(self, index):
+        return self.data[self.base + self.offsets[index]:self.base + self.offsets[index + 1]]
+
+class _ReversedWords:
+    """Kata dibalik, diurutkan menurut tabel suffixes (untuk bisect query akhiran)."""
+    __slots__ = ('words', 'suffixes')
+
+    def __init__(self, words, suffixes):
+        self.words = words
+        self.suffixes = suffixes
+
+    def __len__(self):
+        return len(self.words)
+
+    def __getitem__(self, index):
+        return self.words[self.suffixes[index]][::-1]
+
+class Lexicon:
+    """
+    Kamus di atas buffer read-only terkompilasi (mmap dari file .lex, atau bytes dari compile_words).
+    Mendukung `kata in lexicon`, len, iterasi berurutan, with_prefix, dan with_suffix. Objek yang sama bisa
+    dimuat ulang di tempat (load/load_words), agar referensi global seperti server_thread_http.DICTIONARY tetap berlaku.
+    Perubahan saat server berjalan (add_words/remove_words) disimpan sebagai overlay kecil di memori sampai
+    file dikompilasi ulang; overlay ikut diperhitungkan di semua query.
+    """
+    def __init__(self, data=None):
+        self.path = None
+        self._overlay = (frozenset(), frozenset()) # (kata ditambahkan, kata dihapus) relatif terhadap buffer
+        self._set_buffer(compile_words(()) if data is None else data)
+
+    @classmethod
+    def from_words(cls, words):
+        return cls(compile_words(words))
+
+    def load(self, path):
+        """Memetakan file .lex read-only. Pemanggil yang sedang membaca buffer lama tetap aman (buffer lama dilepas GC)."""
+        with open(path, 'rb') as f:
+            self._set_buffer(mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ))
+        self.path = path
+
+    def load_words(self, words):
+        """Mengompilasi kata di memori (tanpa file .lex); waktunya sebanding dengan ukuran kamus."""
+        self._set_buffer(compile_words(words))
+        self.path = None
+
+    def _set_buffer(self, data):
+        if len(data) < _HEADER.size: raise ValueError("File kamus terkompilasi terlalu pendek.")
+        magic, version, count, blob_size = _HEADER.unpack_from(data)
+        if magic != MAGIC or version != LEXICON_VERSION: raise ValueError("Bukan file kamus terkompilasi yang dikenal.")
+        offsets_start = _HEADER.size
+        suffixes_start = offsets_start + 4 * (count + 1)
+        blob_start = suffixes_start + 4 * count
+        if len(data) < blob_start + blob_size: raise ValueError("File kamus terkompilasi terpotong.")
+        words = _Words(data, _u32_view(data, offsets_start, count + 1), blob_start, count)
+        # Satu assignment: thread lain melihat buffer lama atau baru secara utuh, tidak pernah campuran
+        self._views = (words, _ReversedWords(words, _u32_view(data, suffixes_start, count)))
+        self._overlay = (frozenset(), frozenset()) # Buffer baru sudah memuat semua perubahan yang dikompilasi
+
+    def _in_buffer(self, word):
+        key = word.encode('utf-8')
+        words = self._views[0]
+        index = bisect_left(words, key)
+        return index < len(words) and words[index] == key
+
+    def add_words(self, words):
+        """Menambahkan kata (uppercase) tanpa kompilasi ulang. Mengembalikan kata yang benar-benar baru."""
+        added, removed = self._overlay
+        words = {word.strip().upper() for word in words} - {''}
+        new = {word for word in words if word not in self}
+        self._overlay = (added | {word for word in new if not self._in_buffer(word)}, removed - words)
+        return new
+
+    def remove_words(self, words):
+        """Menghapus kata tanpa kompilasi ulang. Mengembalikan kata yang sebelumnya ada."""
+        added, removed = self._overlay
+        gone = {word for word in (word.strip().upper() for word in words) if word and word in self}
+        self._overlay = (added - gone, removed | {word for word in gone if self._in_buffer(word)})
+        return gone
+
+    def __len__(self):
+        added, removed = self._overlay
+        return len(self._views[0]) + len(added) - len(removed)
+
+    def __iter__(self):
+        words, (added, removed) = self._views[0], self._overlay
+        stored = (words[index].decode('utf-8') for index in range(len(words)))
+        for word in heapq.merge(stored, sorted(added), key=lambda word: word.encode('utf-8')):
+            if word not in removed: yield word
+
+    def __contains__(self, word):
+        added, removed = self._overlay
+        if word in added: return True
+        if word in removed: return False
+        return self._in_buffer(word)
+
+    def with_prefix(self, prefix):
+        """Kata yang diawali prefix, berurutan."""
+        added, removed = self._overlay
+        for word in heapq.merge(self._buffer_prefix(prefix), sorted(word for word in added if word.startswith(prefix)), key=lambda word: word.encode('utf-8')):
+            if word not in removed: yield word
+
+    def with_suffix(self, suffix):
+        """Kata yang diakhiri suffix, diurutkan menurut akhirannya."""
+        added, removed = self._overlay
+        reversed_key = lambda word: word.encode('utf-8')[::-1]
+        for word in heapq.merge(self._buffer_suffix(suffix), sorted((word for word in added if word.endswith(suffix)), key=reversed_key), key=reversed_key):
+            if word not in removed: yield word
+
+    def _buffer_prefix(self, prefix):
+        key = prefix.encode('utf-8')
+        words = self._views[0]
+        for index in range(bisect_left(words, key), len(words)):
+            word = words[index]
+            if not word.startswith(key): return
+            yield word.decode('utf-8')
+
+    def _buffer_suffix(self, suffix):
+        key = suffix.encode('utf-8')[::-1]
+        words, reversed_words = self._views
+        for index in range(bisect_left(reversed_words, key), len(words)):
+            word = reversed_words[index]
+            if not word.startswith(key): return
+            yield word[::-1].decode('utf-8')
+
+def benchmark(source_path, compiled_path, lookups=20000):
+    """Membandingkan waktu muat dan lookup: set dari file teks vs Lexicon mmap."""
+    import timeit
+    started = time.perf_counter()
+    with open(source_path, 'r', encoding='utf-8') as f: words = set(line.strip().upper() for line in f)
+    set_load = time.perf_counter() - started
+    lexicon = Lexicon()
+    started = time.perf_counter()
+    lexicon.load(compiled_path)
+    mmap_load = time.perf_counter() - started
+    sample = sorted(words)[::max(1, len(words) // 100)] + ['TIDAKADA', 'ZZZZ']
+    assert all((word in lexicon) == (word in words) for word in sample)
+    set_lookup = timeit.timeit(lambda: [word in words for word in sample], number=lookups // len(sample)) / (lookups // len(sample) * len(sample))
+    mmap_lookup = timeit.timeit(lambda: [word in lexicon for word in sample], number=lookups // len(sample)) / (lookups // len(sample) * len(sample))
+    prefix = timeit.timeit(lambda: list(lexicon.with_prefix('KA')), number=1000) / 1000
+    suffix = timeit.timeit(lambda: list(lexicon.with_suffix('AN')), number=1000) / 1000
+    print(f"{len(words)} kata, file {os.path.getsize(compiled_path)} B")
+    print(f"muat  : set {set_load * 1000:.2f} ms, mmap {mmap_load * 1000:.3f} ms")
+    print(f"lookup: set {set_lookup * 1e6:.2f} us, mmap {mmap_lookup * 1e6:.2f} us")
+    print(f"query : with_prefix('KA') {prefix * 1e6:.1f} us, with_suffix('AN') {suffix * 1e6:.1f} us")
+
+def main():
+    parser = argparse.ArgumentParser(description="Mengompilasi daftar kata (satu per baris) menjadi kamus biner untuk dimuat lewat mmap.")
+    parser.add_argument('source', nargs='?', default=os.path.join(os.path.dirname(__file__), 'static', 'dictionary.txt'))
+    parser.add_argument('output', nargs='?', default=None, help="Default: file sumber dengan ekstensi .lex")
+    parser.add_argument('--benchmark', action='store_true', help="Setelah kompilasi, bandingkan waktu muat dan lookup dengan set.")
+    args = parser.parse_args()
+    output = args.output or os.path.splitext(args.source)[0] + '.lex'
+    count, size = compile_file(args.source, output)
+    print(f"{count} kata dikompilasi ke {output} ({size} B).")
+    if args.benchmark: benchmark(args.source, output)
+
+if __name__ == "__main__":
+    main()
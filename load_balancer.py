@@ -5,6 +5,9 @@ import requests
 import itertools
 import json
 import re
+import select
+import socket
+import urllib.parse
 from threading import Lock
 
 # --- KONFIGURASI ---
@@ -13,6 +16,12 @@ BACKEND_SERVERS = [
     #"http://127.0.0.1:8001",
 ]
 LOAD_BALANCER_PORT = 6969
+BACKEND_LONG_POLL_WAIT = 30 # Sama dengan MAX_LONG_POLL_WAIT di http.py backend
+BACKEND_TIMEOUT = BACKEND_LONG_POLL_WAIT + 5 # Detik menunggu backend menjawab (termasuk long-poll /game_status)
+# Path yang membawa game_id; dipakai untuk URL request dan isi body /batch
+GAME_PATH_PATTERN = r'/(?:join_game|start_game|game_status|hint|submit_turn|check_turn|events|ws)/([A-Z0-9]{6})'
+GAME_PATH_RE = re.compile(GAME_PATH_PATTERN)
+GAME_PATH_BYTES_RE = re.compile(GAME_PATH_PATTERN.encode('ascii'))
 
 # --- Logika Inti ---
 game_to_server_map = {}
@@ -20,7 +29,7 @@ map_lock = Lock()
 server_cycler = itertools.cycle(BACKEND_SERVERS)
 
 def get_target_server(path):
-    match = re.search(r'/(?:join_game|start_game|game_status|submit_turn|check_turn)/([A-Z0-9]{6})', path)
+    match = GAME_PATH_RE.search(path)
     if match:
         game_id = match.group(1)
         with map_lock:
@@ -52,13 +61,26 @@ class LoadBalancerHandler(BaseHTTPRequestHandler):
         try:
             content_length = int(self.headers.get('Content-Length', 0))
             request_body = self.rfile.read(content_length) if content_length > 0 else None
+            if self.path == '/batch' and request_body:
+                # Batch diarahkan ke server milik game pertama yang disebut; satu batch sebaiknya hanya berisi game di server yang sama.
+                match = GAME_PATH_BYTES_RE.search(request_body)
+                if match: target_server = get_target_server(match.group(0).decode('ascii'))
             backend_url = f"{target_server}{self.path}"
-            headers = {key: value for key, value in self.headers.items()}
+            headers = {key: value for key, value in self.headers.items() if key.lower() != 'x-forwarded-for'}
+            headers['X-Forwarded-For'] = self.client_address[0] # Dipakai rate limiter backend (jalankan dengan --trusted-proxy)
+
+            if self.path.startswith('/ws/'):
+                self._tunnel(target_server, headers)
+                return
+
+            if self.path.startswith('/events/'):
+                self._forward_stream(method, backend_url, headers)
+                return
             
             # --- PERUBAHAN UTAMA: Hapus `stream=True` ---
             # Biarkan `requests` mengunduh seluruh respons terlebih dahulu.
             resp = requests.request(
-                method, backend_url, headers=headers, data=request_body, timeout=15
+                method, backend_url, headers=headers, data=request_body, timeout=BACKEND_TIMEOUT
             )
 
             # --- LOGIKA YANG DISATUKAN ---
@@ -96,6 +118,49 @@ class LoadBalancerHandler(BaseHTTPRequestHandler):
             print(f"ERROR: Tidak dapat terhubung ke server backend {target_server}. Error: {e}")
             self.send_error(503, "Service Unavailable")
 
+    def _forward_stream(self, method, backend_url, headers):
+        """Stream SSE diteruskan potongan demi potongan; tidak bisa menunggu seluruh respons."""
+        resp = requests.request(method, backend_url, headers=headers, stream=True, timeout=(5, None))
+        self.send_response(resp.status_code)
+        for key, value in resp.headers.items():
+            if key.lower() not in ['content-encoding', 'transfer-encoding', 'connection', 'content-length']:
+                self.send_header(key, value)
+        self.send_header('Connection', 'close')
+        self.end_headers()
+        self.close_connection = True
+        try:
+            for chunk in resp.iter_content(chunk_size=None):
+                self.wfile.write(chunk)
+                self.wfile.flush()
+        except (BrokenPipeError, ConnectionResetError):
+            pass # Client menutup stream
+        finally:
+            resp.close()
+
+    def _tunnel(self, target_server, headers):
+        """WebSocket: request upgrade diteruskan mentah, lalu byte disalurkan dua arah sampai salah satu sisi menutup."""
+        backend = urllib.parse.urlparse(target_server)
+        self.close_connection = True
+        try:
+            upstream = socket.create_connection((backend.hostname, backend.port or 80), timeout=5)
+        except OSError as e:
+            print(f"ERROR: Tidak dapat membuka WebSocket ke {target_server}. Error: {e}")
+            self.send_error(503, "Service Unavailable")
+            return
+        with upstream:
+            head = f"{self.command} {self.path} HTTP/1.1\r\n" + "".join(f"{k}: {v}\r\n" for k, v in headers.items()) + "\r\n"
+            upstream.sendall(head.encode('latin-1'))
+            upstream.settimeout(None)
+            try:
+                while True:
+                    readable, _, _ = select.select([upstream, self.connection], [], [])
+                    for source in readable:
+                        chunk = source.recv(65536)
+                        if not chunk: return
+                        (self.connection if source is upstream else upstream).sendall(chunk)
+            except OSError:
+                pass # Salah satu sisi menutup koneksi
+
     def do_GET(self):
         self._forward_request('GET')
 
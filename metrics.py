@@ -0,0 +1,87 @@
+# metrics.py (Histogram latensi, counter status, dan gauge server dalam format teks Prometheus)
+import bisect
+import threading
+
+LATENCY_BUCKETS = (0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0)
+# Route dikenali dari segmen pertama path; sisanya dicatat sebagai 'other' agar jumlah label tetap terbatas.
+ROUTES = ('create_game', 'join_game', 'start_game', 'game_status', 'hint', 'submit_turn', 'check_turn', 'events', 'ws', 'batch', 'server_stats', 'metrics', 'admin')
+PROMETHEUS_CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+def route_of(path, query=''):
+    """Nama route untuk label metrik. Long-poll /game_status dipisah agar waktu tunggunya tidak mengaburkan latensi biasa."""
+    if path == '/' or path.startswith('/static/'): return 'static'
+    if not path.startswith('/'): return 'other' # Misal 'OPTIONS *' atau target tanpa '/'
+    route = path.split('/', 2)[1]
+    if route not in ROUTES: return 'other'
+    if route == 'game_status' and 'wait=' in query: return 'game_status_wait'
+    return route
+
+class Histogram:
+    """Histogram dengan bucket tetap. observe() hanya bisect + increment di bawah lock kecil."""
+    def __init__(self, buckets=LATENCY_BUCKETS):
+        self.buckets = buckets
+        self.counts = [0] * (len(buckets) + 1) # Slot terakhir: +Inf
+        self.sum = 0.0
+        self.lock = threading.Lock()
+
+    def observe(self, value):
+        index = bisect.bisect_left(self.buckets, value)
+        with self.lock:
+            self.counts[index] += 1
+            self.sum += value
+
+    def render(self, name, labels):
+        with self.lock: counts, total = list(self.counts), self.sum
+        lines, cumulative = [], 0
+        for bound, count in zip(self.buckets + (float('inf'),), counts):
+            cumulative += count
+            le = '+Inf' if bound == float('inf') else repr(bound)
+            lines.append(f'{name}_bucket{{{labels},le="{le}"}} {cumulative}')
+        lines.append(f'{name}_sum{{{labels}}} {total}')
+        lines.append(f'{name}_count{{{labels}}} {cumulative}')
+        return lines
+
+class Metrics:
+    """Metrik satu proses server. Gauge dihitung saat scrape lewat callable di gauges."""
+    def __init__(self):
+        self.latency = {} # route -> Histogram
+        self.responses = {} # (route, status) -> jumlah
+        self.lock = threading.Lock()
+        self.open_connections = 0
+        self.gauges = {} # nama -> (help, callable)
+        self.counters = {} # nama -> (help, callable) untuk counter milik komponen lain
+        # callable boleh mengembalikan dict {'label="nilai"': angka} untuk metrik berlabel
+
+    def observe_request(self, route, status_code, duration):
+        histogram = self.latency.get(route)
+        if histogram is None:
+            with self.lock: histogram = self.latency.setdefault(route, Histogram())
+        histogram.observe(duration)
+        key = (route, status_code)
+        with self.lock: self.responses[key] = self.responses.get(key, 0) + 1
+
+    def connection_opened(self):
+        with self.lock: self.open_connections += 1
+
+    def connection_closed(self):
+        with self.lock: self.open_connections -= 1
+
+    def render(self):
+        lines = ["# HELP sekata_http_request_duration_seconds Latensi pemrosesan request per route.",
+                 "# TYPE sekata_http_request_duration_seconds histogram"]
+        for route, histogram in sorted(self.latency.items()):
+            lines.extend(histogram.render("sekata_http_request_duration_seconds", f'route="{route}"'))
+        lines += ["# HELP sekata_http_responses_total Jumlah respons per route dan status code.",
+                  "# TYPE sekata_http_responses_total counter"]
+        with self.lock: responses = sorted(self.responses.items())
+        lines.extend(f'sekata_http_responses_total{{route="{route}",status="{status}"}} {count}' for (route, status), count in responses)
+        lines += ["# HELP sekata_open_connections Koneksi client yang sedang terbuka.",
+                  "# TYPE sekata_open_connections gauge",
+                  f"sekata_open_connections {self.open_connections}"]
+        for kind, metrics in (("gauge", self.gauges), ("counter", self.counters)):
+            for name, (help_text, read) in metrics.items():
+                lines += [f"# HELP {name} {help_text}", f"# TYPE {name} {kind}"]
+                value = read()
+                if isinstance(value, dict): lines.extend(f"{name}{{{labels}}} {count}" for labels, count in sorted(value.items()))
+                else: lines.append(f"{name} {value}")
+        return "\n".join(lines) + "\n"
@@ -1,6 +1,16 @@
 # sekata_game/models.py
+import json
+import os
 import random
 import string
+import sys
+import threading
+import time
+from array import array
+from collections import Counter, OrderedDict, deque
+from contextlib import contextmanager
+
+from server_log import log_event
 
 # --- Konfigurasi Game ---
 # Contoh potongan kata (ini bisa sangat banyak dan bervariasi)
@@ -38,35 +48,53 @@ POTONGAN_KATA = [
 
 HAND_SIZE = 7 # Jumlah kartu di tangan pemain
 MIN_PLAYERS_TO_START = 2 # Minimal pemain untuk memulai game
+STATE_HISTORY_SIZE = 32 # Jumlah perubahan terakhir yang diingat untuk respons delta /game_status
+MAX_GAMES = None # Batas game di registry (None = tanpa batas); sekitar 2,3-2,7 KB per game, lihat memory_benchmark
+
+# Setiap potongan unik mendapat ID kecil (urutan pertama kemunculan di POTONGAN_KATA). Deck, tangan, dan tumpukan
+# disimpan sebagai array('B') berisi ID: 1 byte per kartu, bukan 8 byte pointer per elemen list.
+FRAGMENTS = tuple(dict.fromkeys(POTONGAN_KATA))
+FRAGMENT_IDS = {fragment: index for index, fragment in enumerate(FRAGMENTS)}
+_FULL_DECK = array('B', (FRAGMENT_IDS[fragment] for fragment in POTONGAN_KATA))
+
+def card_ids(cards):
+    return array('B', (FRAGMENT_IDS[card] for card in cards))
+
+def card_names(ids):
+    return [FRAGMENTS[card_id] for card_id in ids]
 
 # --- Kelas CardDeck ---
 class CardDeck:
-    def __init__(self, card_list):
-        self.cards = list(card_list)
+    __slots__ = ('cards',)
+
+    def __init__(self, card_list=None):
+        self.cards = array('B', _FULL_DECK) if card_list is None else card_ids(card_list) # ID kartu; kartu teratas di akhir
         random.shuffle(self.cards)
 
+    def __len__(self):
+        return len(self.cards)
+
     def draw_card(self):
         """Mengambil satu kartu dari deck."""
         if not self.cards:
             return None
-        return self.cards.pop()
+        return FRAGMENTS[self.cards.pop()]
 
     def add_card(self, card):
         """Menambahkan kartu kembali ke deck (misal: kartu yang tidak terpakai/dibuang)."""
-        self.cards.append(card)
+        self.cards.append(FRAGMENT_IDS[card])
         # Tidak perlu kocok ulang setiap kali add, cukup saat inisialisasi atau reshuffle besar
         # random.shuffle(self.cards) 
 
     def get_cards(self, num):
         """Mengambil beberapa kartu dari deck."""
-        drawn_cards = []
-        for _ in range(num):
-            card = self.draw_card()
-            if card:
-                drawn_cards.append(card)
-            else:
-                break
-        return drawn_cards
+        return card_names(self.deal(num))
+
+    def deal(self, num):
+        """Seperti get_cards, tapi mengembalikan array ID (urutan sama dengan draw_card berturut-turut)."""
+        drawn = self.cards[:-num - 1:-1] if num else array('B')
+        del self.cards[len(self.cards) - len(drawn):]
+        return drawn
     
     def shuffle_remaining(self):
         """Mengocok ulang kartu yang tersisa di deck."""
@@ -74,41 +102,163 @@ class CardDeck:
 
 # --- Kelas Player ---
 class Player:
+    __slots__ = ('player_id', 'cards', 'score', 'last_action_check', 'helper_card')
+
     def __init__(self, player_id):
         self.player_id = player_id
-        self.hand = [] # Kartu potongan kata di tangan pemain
+        self.cards = array('B') # ID kartu potongan kata di tangan pemain
         self.score = 0
         self.last_action_check = False
         self.helper_card = None  # Kartu helper, default None
 
+    @property
+    def hand(self):
+        """Kartu di tangan sebagai list potongan kata (salinan baru setiap dipanggil)."""
+        return card_names(self.cards)
+
+    def has_card(self, card):
+        # Tangan dibatasi sekitar HAND_SIZE byte, jadi pencarian di array praktis konstan
+        card_id = FRAGMENT_IDS.get(card)
+        return card_id is not None and card_id in self.cards
+
     def add_cards(self, cards):
-        self.hand.extend(cards)
+        self.cards.extend(card_ids(cards))
 
     def remove_card(self, card_to_remove):
-        try:
-            self.hand.remove(card_to_remove)
-            return True
-        except ValueError:
+        card_id = FRAGMENT_IDS.get(card_to_remove)
+        if card_id is None or card_id not in self.cards:
             return False
+        self.cards.remove(card_id)
+        return True
+
+# Key state publik yang dilacak untuk delta (selain "version" dan "players"), urutan sama dengan Game._change_snapshot
+SNAPSHOT_KEYS = ("game_id", "host_id", "card_on_table", "helper_cards", "used_helper_cards", "current_turn",
+                 "main_deck_count", "game_started", "check_count", "winner", "min_players_to_start", "current_players_count")
+ALL_SNAPSHOT_KEYS = SNAPSHOT_KEYS + ("players",)
 
 # --- Kelas Game ---
+def _player_entry_json(player_id, entry):
+    return json.dumps(player_id) + ': ' + json.dumps(entry)
+
+def _split_state_json(state):
+    """JSON state (sama dengan json.dumps(state)) sebagai (awalan sampai '{' players, [entri per pemain], sisa)."""
+    items = [json.dumps(key) + ': ' + json.dumps(value) if key != "players" else None for key, value in state.items()]
+    split = items.index(None)
+    prefix = '{' + ''.join(item + ', ' for item in items[:split]) + '"players": {'
+    suffix = '}' + ''.join(', ' + item for item in items[split + 1:]) + '}'
+    return prefix, [_player_entry_json(pid, entry) for pid, entry in state["players"].items()], suffix
+
 class Game:
+    # __slots__ + pembuatan objek sinkronisasi secara malas: satu node bisa menampung ratusan ribu lobby.
+    __slots__ = ('game_id', 'host_id', 'players', 'player_order', 'main_deck', 'discard_pile', 'card_on_table',
+                 'helper_card_ids', 'used_helper_card_ids', 'current_turn_index', 'game_started', 'check_count', 'winner',
+                 'lock', 'version', '_changed', 'listeners', '_state_cache', 'history', '_last_snapshot', 'last_activity', 'evicted')
+
     def __init__(self, game_id, host_id):
         self.game_id = game_id
         self.host_id = host_id
         self.players = {host_id: Player(host_id)} # {player_id: Player_object}
         self.player_order = [host_id] # Urutan giliran pemain
-        self.main_deck = CardDeck(POTONGAN_KATA) # Deck utama potongan kata
-        self.discard_pile = [] # Tumpukan buangan
+        self.main_deck = CardDeck() # Deck utama potongan kata
+        self.discard_pile = array('B') # Tumpukan buangan (ID kartu)
 
         self.card_on_table = None # Hanya satu kartu terbuka di meja
-        self.helper_cards = []   # Available helper cards
-        self.used_helper_cards = []  # Helper cards that have been used
+        self.helper_card_ids = array('B')   # Available helper cards
+        self.used_helper_card_ids = array('B')  # Helper cards that have been used
         self.current_turn_index = 0 # Indeks pemain yang gilirannya saat ini
 
         self.game_started = False
         self.check_count = 0 # Menghitung berapa kali 'Check' berturut-turut
         self.winner = None
+        self.lock = threading.RLock() # Semua baca/tulis state game dilakukan di bawah lock ini
+        self.version = 0 # Naik setiap kali state game berubah
+        self._changed = None # Condition untuk long-poll, dibuat saat pertama kali ada yang menunggu
+        self.listeners = None # Callback(game) yang dipanggil setiap perubahan; harus cepat dan tidak memblok
+        self._state_cache = None # (version, (awalan, [entri players], sisa), players_publik, {viewer: bytes}, {(since, viewer): bytes}, {kunci: encoding_lain})
+        self.history = [] # (version, key_berubah, player_id_berubah) per perubahan, maksimal STATE_HISTORY_SIZE terakhir
+        self._last_snapshot = None
+        self.last_activity = time.monotonic() # Diperbarui setiap game diakses atau berubah (dipakai reaper)
+        self.evicted = False # True setelah game dikeluarkan dari registry; stream yang masih terbuka ditutup
+
+    @property
+    def helper_cards(self):
+        return card_names(self.helper_card_ids)
+
+    @property
+    def used_helper_cards(self):
+        return card_names(self.used_helper_card_ids)
+
+    def has_helper_card(self, card):
+        card_id = FRAGMENT_IDS.get(card)
+        return card_id is not None and card_id in self.helper_card_ids
+
+    def discard(self, card):
+        """Memindahkan kartu (misal kartu meja yang tertutup kata baru) ke tumpukan buangan."""
+        if card: self.discard_pile.append(FRAGMENT_IDS[card])
+
+    @property
+    def changed(self):
+        """Condition yang dinotifikasi setiap version naik (long-poll)."""
+        with self.lock:
+            if self._changed is None: self._changed = threading.Condition(self.lock)
+            return self._changed
+
+    def add_listener(self, callback):
+        with self.lock:
+            if self.listeners is None: self.listeners = []
+            self.listeners.append(callback)
+
+    def remove_listener(self, callback):
+        with self.lock:
+            if self.listeners and callback in self.listeners: self.listeners.remove(callback)
+
+    def mark_changed(self):
+        """Menaikkan version dan membangunkan semua yang menunggu perubahan game ini."""
+        with self.lock:
+            self.version += 1
+            self.last_activity = time.monotonic()
+            self._record_changes()
+            if self._changed is not None: self._changed.notify_all()
+            for callback in self.listeners or (): callback(self)
+
+    def _change_snapshot(self):
+        """Ringkasan state lengkap (termasuk semua tangan) untuk dibandingkan pada perubahan berikutnya:
+        (nilai per SNAPSHOT_KEYS, ((player_id, skor, tangan), ...)). Kartu disimpan sebagai bytes ID agar ringkas."""
+        values = (self.game_id, self.host_id, self.card_on_table, self.helper_card_ids.tobytes(), self.used_helper_card_ids.tobytes(),
+                  self.get_current_player_id(), len(self.main_deck), self.game_started, self.check_count, self.winner,
+                  MIN_PLAYERS_TO_START, len(self.players))
+        return values, tuple((pid, player.score, player.cards.tobytes()) for pid, player in self.players.items())
+
+    def _record_changes(self):
+        snapshot, previous = self._change_snapshot(), self._last_snapshot
+        values, players = snapshot
+        if previous is None:
+            changed_keys, changed_players = ALL_SNAPSHOT_KEYS, tuple(entry[0] for entry in players)
+        else:
+            changed_keys = [key for key, new, old in zip(SNAPSHOT_KEYS, values, previous[0]) if new != old]
+            previous_players = {entry[0]: entry for entry in previous[1]}
+            changed_players = tuple(entry[0] for entry in players if previous_players.get(entry[0]) != entry)
+            if changed_players: changed_keys.append("players")
+            changed_keys = tuple(changed_keys)
+        self.history.append((self.version, changed_keys, changed_players))
+        if len(self.history) > STATE_HISTORY_SIZE: del self.history[0]
+        self._last_snapshot = snapshot
+
+    def changes_since(self, since_version):
+        """(key, player_id) yang berubah setelah since_version, atau None jika riwayat tidak mencakupnya."""
+        if since_version == self.version: return set(), set()
+        if since_version > self.version or not self.history or since_version < self.history[0][0] - 1: return None
+        changed_keys, changed_players = set(), set()
+        for version, keys, players in self.history:
+            if version > since_version:
+                changed_keys.update(keys)
+                changed_players.update(players)
+        return changed_keys, changed_players
+
+    def wait_for_change(self, since_version, timeout):
+        """Blok sampai version > since_version atau timeout habis. Mengembalikan True jika ada perubahan."""
+        with self.lock:
+            return self.changed.wait_for(lambda: self.version > since_version, timeout)
 
     def add_player(self, player_id):
         """Menambahkan pemain baru ke game."""
@@ -116,6 +266,7 @@ class Game:
             new_player = Player(player_id)
             self.players[player_id] = new_player
             self.player_order.append(player_id)
+            self.mark_changed()
             return True
         return False
 
@@ -134,17 +285,17 @@ class Game:
 
         # Bagikan kartu awal ke semua pemain
         for player_obj in self.players.values():
-            cards = self.main_deck.get_cards(HAND_SIZE)
-            player_obj.add_cards(cards)
+            player_obj.cards.extend(self.main_deck.deal(HAND_SIZE))
 
         # Letakkan kartu pertama di meja
         self.card_on_table = self.main_deck.draw_card()
         # Draw 3 helper cards dari deck (jika ada)
-        self.helper_cards = self.main_deck.get_cards(3)
+        self.helper_card_ids = self.main_deck.deal(3)
         if not self.card_on_table: # Jika deck kosong di awal (sangat jarang)
             return False, "Deck kata kosong, tidak bisa memulai game."
         
-        print(f"Game {self.game_id} dimulai! Giliran {self.get_current_player_id()}")
+        log_event('game', 'game_started', game_id=self.game_id, players=len(self.players), first_turn=self.get_current_player_id())
+        self.mark_changed()
         return True, "Game dimulai!"
 
     def get_current_player_id(self):
@@ -164,68 +315,94 @@ class Game:
         if action_was_check:
             self.check_count += 1
             if self.check_count >= len(self.player_order): # Semua pemain 'Check'
-                print(f"Semua pemain 'Check'. Melakukan reshuffle meja.")
+                log_event('game', 'all_checked', game_id=self.game_id, check_count=self.check_count)
                 self.reshuffle_table_card()
                 self.check_count = 0 # Reset hitungan 'Check'
         else:
             self.check_count = 0 # Reset jika ada pemain yang bergerak
 
         self.current_turn_index = (self.current_turn_index + 1) % len(self.player_order)
-        print(f"Giliran berikutnya: {self.get_current_player_id()}")
+        self.mark_changed()
+        log_event('game', 'turn_changed', game_id=self.game_id, version=self.version, turn=self.get_current_player_id(), check=action_was_check)
 
     def reshuffle_table_card(self):
         """Mengganti kartu di meja dengan yang baru dari deck."""
-        if self.card_on_table:
-            self.discard_pile.append(self.card_on_table) # Buang kartu lama ke discard
+        self.discard(self.card_on_table) # Buang kartu lama ke discard
         
         new_card = self.main_deck.draw_card()
         if not new_card and self.discard_pile: # Jika deck utama kosong, kocok ulang discard pile
-            print("Deck utama kosong. Mengocok ulang discard pile.")
+            log_event('game', 'discard_reshuffled', game_id=self.game_id, cards=len(self.discard_pile))
             self.main_deck.cards.extend(self.discard_pile)
             self.main_deck.shuffle_remaining()
-            self.discard_pile = []
+            self.discard_pile = array('B')
             new_card = self.main_deck.draw_card() # Coba ambil lagi
 
-        self.card_on_table = new_card
-        print(f"Kartu di meja di-reshuffle menjadi: {self.card_on_table}")
+        self.card_on_table = new_card # Version dinaikkan sekali oleh next_turn setelah giliran selesai diterapkan
+        log_event('game', 'table_reshuffled', game_id=self.game_id, card_on_table=self.card_on_table)
         if not self.card_on_table:
             self.winner = self.get_current_player_id() # Atau kondisi game over lain
-            print(f"Game {self.game_id} berakhir karena deck kosong total.")
+            log_event('game', 'deck_exhausted', game_id=self.game_id, winner=self.winner)
 
 
     def check_for_winner(self):
         """Mengecek apakah ada pemain yang kehabisan kartu."""
         for player_id, player_obj in self.players.items():
-            if not player_obj.hand:
+            if not player_obj.cards:
                 self.winner = player_id
                 self.game_started = False # Hentikan game
-                print(f"Pemenang: {player_id}! Game berakhir.")
+                self.mark_changed()
+                log_event('game', 'game_won', game_id=self.game_id, winner=player_id, version=self.version)
                 return True
         return False
     
-    def give_helper_card(self, player_id, position, dictionary_set):
+    def give_helper_card(self, player_id, position, fragment_index):
         """
         Memberikan kartu helper ke pemain jika memungkinkan.
         position: 'before' atau 'after'
+        fragment_index: utils.FragmentIndex; kandidat untuk kartu meja diambil dengan satu lookup
         """
         if player_id not in self.players or not self.card_on_table:
             return None
 
-        for frag in POTONGAN_KATA:
-            if position == 'before':
-                candidate = frag.upper() + self.card_on_table.upper()
-            else:
-                candidate = self.card_on_table.upper() + frag.upper()
-            if is_word_in_dictionary(candidate, dictionary_set):
-                self.players[player_id].helper_card = frag.upper()
-                return frag.upper()
-        return None
+        candidates = fragment_index.helpers_for(self.card_on_table, position)
+        if not candidates:
+            return None
+        self.players[player_id].helper_card = candidates[0] # Potongan pertama menurut urutan tabel, seperti sebelumnya
+        return candidates[0]
+
+    def legal_moves_for(self, player_id, fragment_index):
+        """
+        Langkah legal pemain untuk kartu meja saat ini (lihat utils.FragmentIndex.legal_moves).
+        Returns None jika pemain tidak ada di game atau belum ada kartu meja.
+        """
+        player = self.players.get(player_id)
+        if player is None or not self.card_on_table:
+            return None
+        return fragment_index.legal_moves(self.card_on_table, player.hand, self.helper_cards)
+
+    def auto_check_dead_hands(self, fragment_index):
+        """
+        Melewati giliran (seperti /check_turn) selama pemain yang sedang mendapat giliran tidak punya langkah legal.
+        Dipanggil di bawah game.lock setiap giliran dimulai. Maksimal satu putaran pemain per panggilan, sehingga
+        kartu meja paling banyak dikocok ulang sekali; setelah itu pemain berikutnya tetap bermain/check sendiri.
+        Returns list player_id yang dilewati.
+        """
+        skipped = []
+        while self.game_started and self.winner is None and len(skipped) < len(self.player_order):
+            player_id = self.get_current_player_id()
+            if fragment_index.has_legal_move(self.card_on_table, self.players[player_id].hand, self.helper_cards):
+                break
+            log_event('game', 'auto_checked', game_id=self.game_id, player_id=player_id, card_on_table=self.card_on_table)
+            self.next_turn(action_was_check=True)
+            skipped.append(player_id)
+        return skipped
 
     def use_helper_card(self, card_fragment):
-        """Mark a helper card as used."""
-        if card_fragment.upper() in self.helper_cards:
-            self.helper_cards.remove(card_fragment.upper())
-            self.used_helper_cards.append(card_fragment.upper())
+        """Mark a helper card as used. Bagian dari satu giliran: pemanggil memanggil mark_changed() setelah giliran lengkap."""
+        card_id = FRAGMENT_IDS.get(card_fragment.upper())
+        if card_id is not None and card_id in self.helper_card_ids:
+            self.helper_card_ids.remove(card_id)
+            self.used_helper_card_ids.append(card_id)
             return True
         return False
 
@@ -235,23 +412,234 @@ class Game:
         for pid, player_obj in self.players.items():
             players_data[pid] = {
                 "score": player_obj.score,
-                "hand_size": len(player_obj.hand),
+                "hand_size": len(player_obj.cards),
                 "hand": player_obj.hand if pid == viewer_player_id else []
                 # "helper_card": player_obj.helper_card if pid == viewer_player_id else None # Hapus jika tidak pakai per-player
             }
         
         return {
             "game_id": self.game_id,
+            "version": self.version,
             "host_id": self.host_id,
             "card_on_table": self.card_on_table,
             "helper_cards": self.helper_cards,
             "used_helper_cards": self.used_helper_cards,
             "current_turn": self.get_current_player_id(),
             "players": players_data,
-            "main_deck_count": len(self.main_deck.cards),
+            "main_deck_count": len(self.main_deck),
             "game_started": self.game_started,
             "check_count": self.check_count,
             "winner": self.winner,
             "min_players_to_start": MIN_PLAYERS_TO_START,
             "current_players_count": len(self.players)
-        }
\ No newline at end of file
+        }
+
+    def serialized_state_for_player(self, viewer_player_id):
+        """get_game_state_for_player dalam bentuk JSON (bytes), di-cache per version.
+        Bagian publik diserialisasi sekali per version sebagai potongan (awalan, entri per pemain, sisa);
+        tangan viewer disisipkan dengan mengganti entri di posisi miliknya, bukan dengan mencari teksnya."""
+        with self.lock:
+            cache = self._state_cache
+            if cache is None or cache[0] != self.version:
+                public_state = self.get_game_state_for_player(None)
+                cache = self._state_cache = (self.version, _split_state_json(public_state), public_state["players"], {}, {}, {})
+            _, (prefix, entries, suffix), public_players, viewers, _, _ = cache
+            viewer = viewer_player_id if viewer_player_id in self.players else None # Non-pemain melihat versi publik
+            encoded = viewers.get(viewer)
+            if encoded is None:
+                if viewer is not None and self.players[viewer].cards:
+                    entries = list(entries)
+                    entries[list(public_players).index(viewer)] = _player_entry_json(viewer, dict(public_players[viewer], hand=self.players[viewer].hand))
+                encoded = viewers[viewer] = (prefix + ', '.join(entries) + suffix).encode('utf-8')
+            return encoded
+
+    def encoded_state_for_player(self, viewer_player_id, encoder):
+        """State untuk viewer dalam encoding lain (misal biner, encoder(state) -> bytes), di-cache per version seperti JSON."""
+        with self.lock:
+            self.serialized_state_for_player(None) # Memastikan cache untuk version ini sudah ada
+            encodings = self._state_cache[5]
+            viewer = viewer_player_id if viewer_player_id in self.players else None
+            encoded = encodings.get((encoder, viewer))
+            if encoded is None: encoded = encodings[(encoder, viewer)] = encoder(self.get_game_state_for_player(viewer))
+            return encoded
+
+    def serialized_delta_for_player(self, viewer_player_id, since_version):
+        """JSON (bytes) berisi hanya field yang berubah sejak since_version (players: hanya entri yang berubah),
+        selalu dengan "version". None jika since_version di luar riwayat; pemanggil mengirim snapshot penuh."""
+        with self.lock:
+            changes = self.changes_since(since_version)
+            if changes is None: return None
+            self.serialized_state_for_player(None) # Memastikan cache untuk version ini sudah ada
+            deltas = self._state_cache[4]
+            viewer = viewer_player_id if viewer_player_id in self.players else None
+            encoded = deltas.get((since_version, viewer))
+            if encoded is None:
+                changed_keys, changed_players = changes
+                state = self.get_game_state_for_player(viewer)
+                delta = {key: state[key] for key in changed_keys if key != "players"}
+                if changed_players: delta["players"] = {pid: state["players"][pid] for pid in changed_players if pid in state["players"]}
+                delta["version"] = self.version
+                encoded = deltas[(since_version, viewer)] = json.dumps(delta).encode('utf-8')
+            return encoded
+
+# --- Kelas GameRegistry ---
+def game_state(game):
+    """'finished' jika sudah ada pemenang, 'active' jika sudah dimulai, selain itu 'lobby'."""
+    if game.winner is not None: return 'finished'
+    return 'active' if game.game_started else 'lobby'
+
+class GameRegistry:
+    """Kumpulan game aktif. Lock registry hanya dipegang sebentar untuk lookup/insert/hapus;
+    mutasi state game memakai game.lock masing-masing agar game lain tidak ikut menunggu.
+    Urutan games adalah urutan LRU (paling lama tidak diakses di depan) untuk batas max_games;
+    idle memuat lobby/game selesai dengan urutan yang sama agar korban eviction didapat tanpa memindai semua game."""
+    def __init__(self, max_games=MAX_GAMES):
+        self.games = OrderedDict()
+        self.idle = OrderedDict() # game_id -> game yang tidak sedang berjalan, diperbarui lewat listener game
+        self.lock = threading.Lock()
+        self.lock_wait_seconds = 0.0 # Total waktu menunggu lock registry (hanya saat lock sedang dipegang thread lain)
+        self.lock_contended = 0
+        self.max_games = max_games # None = tanpa batas
+        self.evictions = Counter() # alasan -> jumlah game yang dikeluarkan
+        self.evicted = deque() # (game, alasan) yang menunggu diproses reaper (tandai evicted, arsip)
+
+    @contextmanager
+    def _locked(self):
+        if not self.lock.acquire(blocking=False):
+            started = time.perf_counter()
+            self.lock.acquire()
+            self.lock_wait_seconds += time.perf_counter() - started
+            self.lock_contended += 1
+        try:
+            yield
+        finally:
+            self.lock.release()
+
+    def get(self, game_id):
+        with self._locked():
+            game = self.games.get(game_id)
+            if game is not None:
+                self.games.move_to_end(game_id)
+                if game_id in self.idle: self.idle.move_to_end(game_id)
+                game.last_activity = time.monotonic()
+            return game
+
+    def add(self, game):
+        """Mendaftarkan game baru. Mengembalikan False jika ID sudah dipakai.
+        Jika registry penuh, lobby/game selesai yang paling lama tidak diakses dikeluarkan lebih dulu;
+        game yang sedang berjalan hanya dikeluarkan jika tidak ada yang lain."""
+        with self._locked():
+            if game.game_id in self.games:
+                return False
+            while self.max_games and len(self.games) >= self.max_games:
+                victim = self._pop_idle()
+                if victim is None:
+                    victim = self.games.popitem(last=False)[1]
+                    self.idle.pop(victim.game_id, None)
+                    self._evict(victim, 'lru_active')
+                else:
+                    del self.games[victim.game_id]
+                    self._evict(victim, 'lru')
+            self.games[game.game_id] = game
+            if game_state(game) != 'active': self.idle[game.game_id] = game
+        game.add_listener(self._state_changed)
+        return True
+
+    def _pop_idle(self):
+        # Entri idle bisa basi jika game dimulai tanpa mark_changed (misal deck kosong saat start): dibuang di sini.
+        while self.idle:
+            game = self.idle.popitem(last=False)[1]
+            if game_state(game) != 'active': return game
+        return None
+
+    def _state_changed(self, game):
+        # Listener game (dipanggil di bawah game.lock; urutan game.lock -> lock registry sama seperti batch).
+        # Kebanyakan perubahan tidak mengubah state game, jadi lock registry hanya diambil saat transisi.
+        if (game_state(game) == 'active') == (game.game_id not in self.idle): return
+        with self._locked():
+            if self.games.get(game.game_id) is not game: return
+            if game_state(game) == 'active': self.idle.pop(game.game_id, None)
+            elif game.game_id not in self.idle: self.idle[game.game_id] = game
+
+    def remove(self, game_id):
+        with self._locked():
+            self.idle.pop(game_id, None)
+            return self.games.pop(game_id, None)
+
+    def _evict(self, game, reason):
+        # Dipanggil dengan lock registry dipegang. game.lock tidak boleh diambil di sini
+        # (batch memegang game.lock lalu mengambil lock registry), jadi sisanya dikerjakan reaper.
+        self.evictions[reason] += 1
+        self.evicted.append((game, reason))
+
+    def evict_idle(self, ttls, now=None):
+        """Mengeluarkan game yang tidak aktif lebih lama dari TTL untuk state-nya
+        (ttls: {'lobby'|'active'|'finished': detik}). Mengembalikan jumlah game yang dikeluarkan."""
+        now = time.monotonic() if now is None else now
+        expired = []
+        for game in self.snapshot():
+            state = game_state(game)
+            if now - game.last_activity > ttls[state]: expired.append((game, state))
+        count = 0
+        with self._locked():
+            for game, state in expired:
+                # Dicek ulang di bawah lock: game bisa saja baru diakses lewat get()
+                if self.games.get(game.game_id) is not game or now - game.last_activity <= ttls[state]: continue
+                del self.games[game.game_id]
+                self.idle.pop(game.game_id, None)
+                self._evict(game, f"{state}_idle")
+                count += 1
+        return count
+
+    def drain_evicted(self):
+        """Mengambil semua (game, alasan) yang sudah dikeluarkan tapi belum diproses."""
+        drained = []
+        while self.evicted: drained.append(self.evicted.popleft())
+        return drained
+
+    def snapshot(self):
+        """Salinan daftar game untuk diiterasi tanpa memegang lock registry."""
+        with self._locked():
+            return list(self.games.values())
+
+    def __contains__(self, game_id):
+        with self._locked():
+            return game_id in self.games
+
+    def __len__(self):
+        return len(self.games)
+
+def _build_games(count, players, started):
+    games = []
+    for index in range(count):
+        game = Game(f"G{index:07d}", "pemain-1")
+        for number in range(2, players + 1): game.add_player(f"pemain-{number}")
+        if started: game.start_game()
+        games.append(game)
+    return games
+
+def _measure_games(count, players, started):
+    """Dijalankan di proses anak yang baru: kenaikan RSS puncak dibagi jumlah game (termasuk slot list penampung)."""
+    import resource
+    from server_log import SAMPLE_RATES
+    SAMPLE_RATES['game'] = 0.0 # Record log yang mengantri tidak ikut terhitung
+    unit = 1 if sys.platform == 'darwin' else 1024 # ru_maxrss: byte di macOS, KiB di Linux
+    before = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    games = _build_games(count, players, started)
+    return (resource.getrusage(resource.RUSAGE_SELF).ru_maxrss - before) * unit / len(games)
+
+def memory_benchmark(counts=(10_000, 100_000, 1_000_000), players=2):
+    """Byte per game untuk sejumlah lobby berisi `players` pemain, sebelum dan sesudah dimulai.
+    Setiap pengukuran memakai proses baru agar memori yang sudah dialokasikan pengukuran sebelumnya tidak terpakai ulang."""
+    import subprocess
+    print(f"{'games':>10} {'lobby B/game':>13} {'started B/game':>15}")
+    for count in counts:
+        results = [float(subprocess.run([sys.executable, os.path.abspath(__file__), '--measure', str(count), str(players), str(int(started))],
+                                        check=True, capture_output=True, text=True).stdout) for started in (False, True)]
+        print(f"{count:>10} {results[0]:>13.0f} {results[1]:>15.0f}")
+
+if __name__ == "__main__":
+    if sys.argv[1:2] == ['--measure']:
+        print(_measure_games(*(int(arg) for arg in sys.argv[2:5])))
+    else:
+        memory_benchmark(tuple(int(arg) for arg in sys.argv[1:]) or (10_000, 100_000, 1_000_000))
@@ -0,0 +1,116 @@
+# profiler.py (Profiling on-demand pada server yang sedang berjalan: sampling stack + cProfile)
+import collections
+import cProfile
+import io
+import logging
+import os
+import pstats
+import re
+import signal
+import sys
+import tempfile
+import threading
+import time
+
+PROFILE_MAX_SECONDS = 60     # Batas durasi satu sesi profiling
+PROFILE_SIGNAL_SECONDS = 10  # Durasi sesi yang dipicu SIGUSR1
+SAMPLE_INTERVAL = 0.01       # Detik antar sampel stack semua thread (100 Hz)
+PROFILE_OUTPUT_DIR = tempfile.gettempdir() # Lokasi hasil sesi yang dipicu sinyal
+CPROFILE_FILTER = r'proses|handle_' # Fungsi yang ditampilkan di ringkasan cProfile
+CPROFILE_LIMIT = 40
+
+_session_lock = threading.Lock() # Hanya satu sesi profiling dalam satu waktu
+
+def _thread_label(name):
+    """'Worker-12' -> 'Worker' agar stack dari thread sejenis menyatu di flamegraph."""
+    return re.sub(r'-\d+$', '', name or 'thread')
+
+def _collapse(frame):
+    names = []
+    while frame is not None:
+        code = frame.f_code
+        names.append(f"{code.co_name} ({os.path.basename(code.co_filename)}:{code.co_firstlineno})")
+        frame = frame.f_back
+    names.reverse()
+    return ";".join(names)
+
+def sample_stacks(seconds, interval=SAMPLE_INTERVAL):
+    """Mengambil stack semua thread (kecuali pemanggil) secara berkala. Mengembalikan (Counter stack, jumlah sampel)."""
+    own = threading.get_ident()
+    counts = collections.Counter()
+    labels, labels_at = {}, 0.0
+    samples = 0
+    deadline = time.monotonic() + seconds
+    while time.monotonic() < deadline:
+        now = time.monotonic()
+        if now - labels_at > 1.0: # threading.enumerate cukup disegarkan sesekali
+            labels, labels_at = {thread.ident: _thread_label(thread.name) for thread in threading.enumerate()}, now
+        for ident, frame in sys._current_frames().items():
+            if ident == own: continue
+            counts[f"{labels.get(ident, 'thread')};{_collapse(frame)}"] += 1
+        samples += 1
+        time.sleep(interval)
+    return counts, samples
+
+def format_collapsed(counts):
+    """Format 'frame;frame;frame jumlah' per baris (input flamegraph.pl / speedscope)."""
+    return "".join(f"{stack} {count}\n" for stack, count in counts.most_common())
+
+def profile(http_handler, seconds, interval=SAMPLE_INTERVAL):
+    """Menjalankan satu sesi: sampling stack seluruh thread, dan cProfile pada setiap panggilan http_handler.proses
+    (beserta handle_* di dalamnya) selama sesi. Mengembalikan dict hasil, atau None jika sesi lain sedang berjalan."""
+    if not _session_lock.acquire(blocking=False): return None
+    seconds = max(0.1, min(float(seconds), PROFILE_MAX_SECONDS))
+    profiles, profiles_lock, local = [], threading.Lock(), threading.local()
+    original = http_handler.proses
+    skipped = 0
+
+    def profiled_proses(*args, **kwargs):
+        nonlocal skipped
+        profiler = getattr(local, 'profiler', None)
+        if profiler is None:
+            profiler = local.profiler = cProfile.Profile()
+            with profiles_lock: profiles.append(profiler)
+        try:
+            profiler.enable()
+        except ValueError: # Python 3.12+: hanya satu profiler aktif per proses; panggilan ini tidak diukur
+            skipped += 1
+            return original(*args, **kwargs)
+        try:
+            return original(*args, **kwargs)
+        finally:
+            profiler.disable()
+
+    try:
+        http_handler.proses = profiled_proses # Atribut instance menimpa method selama sesi
+        counts, samples = sample_stacks(seconds, interval)
+    finally:
+        del http_handler.proses
+        _session_lock.release()
+    return {"seconds": seconds, "samples": samples, "collapsed": format_collapsed(counts),
+            "cprofile": _summarize(profiles), "profiled_threads": len(profiles), "unprofiled_calls": skipped}
+
+def _summarize(profiles):
+    with_data = []
+    for profiler in profiles:
+        profiler.create_stats()
+        if profiler.stats: with_data.append(profiler)
+    if not with_data: return "Tidak ada request yang diproses selama sesi profiling.\n"
+    output = io.StringIO()
+    stats = pstats.Stats(*with_data, stream=output)
+    stats.sort_stats('cumulative').print_stats(CPROFILE_FILTER, CPROFILE_LIMIT)
+    return output.getvalue()
+
+def install_signal_handler(http_handler, seconds=PROFILE_SIGNAL_SECONDS, signum=getattr(signal, 'SIGUSR1', None)):
+    """kill -USR1 <pid>: profiling di thread latar, hasil ditulis ke PROFILE_OUTPUT_DIR."""
+    if signum is None: return # Windows tidak punya SIGUSR1; gunakan endpoint /admin/profile
+    def run():
+        result = profile(http_handler, seconds)
+        if result is None:
+            logging.warning("Profiling sudah berjalan, sinyal diabaikan.")
+            return
+        base = os.path.join(PROFILE_OUTPUT_DIR, f"sekata-profile-{os.getpid()}-{int(time.time())}")
+        with open(base + ".collapsed", 'w') as f: f.write(result["collapsed"])
+        with open(base + ".txt", 'w') as f: f.write(result["cprofile"])
+        logging.info(f"Hasil profiling ({result['samples']} sampel) ditulis ke {base}.collapsed dan {base}.txt")
+    signal.signal(signum, lambda _signum, _frame: threading.Thread(target=run, name="Profiler", daemon=True).start())
@@ -14,7 +14,11 @@ class GameState:
         self.popup_type = "info"
         self.popup_timer = 0
 
-    def update_from_server(self, data):
+    def update_from_server(self, data, delta=False):
+        """delta=True: data hanya berisi field yang berubah (players: hanya entri yang berubah)."""
+        if delta and self.game_data:
+            players = {**self.game_data.get("players", {}), **data.get("players", {})}
+            data = {**self.game_data, **data, "players": players}
         self.game_data = data
         if data.get("winner"): self.scene = "game_over"
         elif not data.get("game_started"): self.scene = "lobby"
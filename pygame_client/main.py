@@ -217,7 +217,7 @@ def main():
             if response.get("type") == "game_status":
                 if response['data'].get('success'):
                     old_turn = state.game_data.get('current_turn') if state.game_data else None
-                    state.update_from_server(response['data']['data'])
+                    state.update_from_server(response['data']['data'], response['data'].get('delta', False))
                     if old_turn != state.game_data.get('current_turn') and state.game_data.get('current_turn') == state.player_id:
                         reset_turn_state()
             elif response.get("type") == "action_response":
@@ -1,45 +1,92 @@
 # pygame_client/network_client.py
+import base64
+import os
 import socket
+import struct
 import threading
 import json
 import queue
 
+LONG_POLL_WAIT = 10 # Detik server boleh menahan /game_status (di bawah timeout load balancer)
+USE_WEBSOCKET = True # False: selalu memakai REST (aksi per koneksi + long-poll)
+
+WS_OP_TEXT, WS_OP_CLOSE, WS_OP_PING, WS_OP_PONG = 0x1, 0x8, 0x9, 0xA
+
+def _ws_frame(opcode, payload=b''):
+    """Frame WebSocket dari client (wajib di-mask)."""
+    if isinstance(payload, str): payload = payload.encode('utf-8')
+    mask_key = os.urandom(4)
+    length = len(payload)
+    if length < 126: head = struct.pack('!BB', 0x80 | opcode, 0x80 | length)
+    elif length < 65536: head = struct.pack('!BBH', 0x80 | opcode, 0x80 | 126, length)
+    else: head = struct.pack('!BBQ', 0x80 | opcode, 0x80 | 127, length)
+    masked = bytes(b ^ mask_key[i % 4] for i, b in enumerate(payload))
+    return head + mask_key + masked
+
+def _ws_read_frame(sock_file):
+    """Membaca satu frame dari server (tanpa mask). Mengembalikan (opcode, payload)."""
+    head = sock_file.read(2)
+    if len(head) < 2: raise ConnectionError("Koneksi WebSocket ditutup oleh server.")
+    length = head[1] & 0x7F
+    if length == 126: length = struct.unpack('!H', sock_file.read(2))[0]
+    elif length == 127: length = struct.unpack('!Q', sock_file.read(8))[0]
+    return head[0] & 0x0F, sock_file.read(length)
+
 class NetworkClient:
     def __init__(self, host, port, received_queue):
         self.host = host
         self.port = port
         self.received_queue = received_queue
         self.polling = False
+        self.ws_sock = None # Koneksi WebSocket aktif; None berarti aksi dikirim lewat REST
+        self.ws_lock = threading.Lock() # Menjaga agar frame dari thread UI dan thread penerima tidak bercampur
+        self.ws_action_id = 0
 
-    def _parse_response(self, response_data):
+    def _parse_response(self, body):
         try:
             # Mengatasi kasus di mana server mungkin tidak mengirim body
-            if b'\r\n\r\n' in response_data:
-                _, body = response_data.split(b'\r\n\r\n', 1)
-                if body:
-                    return json.loads(body.decode('utf-8'))
+            if body:
+                return json.loads(body.decode('utf-8'))
             return {"success": False, "message": "No JSON body in response"}
         except (ValueError, json.JSONDecodeError) as e:
             print(f"Error parsing response: {e}")
             return {"success": False, "message": "Invalid response from server"}
 
+    def _send_request(self, sock, method, path, body=None, keep_alive=False):
+        body_str = json.dumps(body) if body else ""
+        request = (
+            f"{method} {path} HTTP/1.1\r\n"
+            f"Host: {self.host}\r\n"
+            f"Connection: {'keep-alive' if keep_alive else 'close'}\r\n"
+            f"Content-Type: application/json\r\n"
+            f"Content-Length: {len(body_str.encode('utf-8'))}\r\n\r\n"
+            f"{body_str}"
+        )
+        sock.sendall(request.encode('utf-8'))
+
+    def _read_response(self, sock_file):
+        """Membaca satu respons utuh (sesuai Content-Length). Mengembalikan (data_json, server_masih_keep_alive)."""
+        status_line = sock_file.readline()
+        if not status_line:
+            raise ConnectionError("Koneksi ditutup oleh server.")
+        headers = {}
+        while True:
+            line = sock_file.readline()
+            if line in (b'\r\n', b'\n', b''): break
+            key, _, value = line.decode('utf-8').partition(':')
+            headers[key.strip().lower()] = value.strip()
+        body = sock_file.read(int(headers.get('content-length', 0)))
+        return self._parse_response(body), headers.get('connection', '').lower() == 'keep-alive'
+
     def _request_response(self, method, path, body=None):
         """Helper untuk aksi tunggal yang membutuhkan respons langsung."""
         try:
             with socket.socket(socket.AF_INET, socket.SOCK_STREAM) as sock:
                 sock.connect((self.host, self.port))
-                
-                body_str = json.dumps(body) if body else ""
-                request = (
-                    f"{method} {path} HTTP/1.1\r\n"
-                    f"Host: {self.host}\r\n"
-                    f"Content-Type: application/json\r\n"
-                    f"Content-Length: {len(body_str)}\r\n\r\n"
-                    f"{body_str}"
-                )
-                sock.sendall(request.encode('utf-8'))
-                response_data = sock.recv(4096)
-                return self._parse_response(response_data)
+                self._send_request(sock, method, path, body)
+                with sock.makefile('rb') as sock_file:
+                    data, _ = self._read_response(sock_file)
+                return data
         except ConnectionRefusedError:
             return {"success": False, "message": "Koneksi ke server ditolak. Pastikan server berjalan."}
         except Exception as e:
@@ -55,32 +102,134 @@ class NetworkClient:
 
     def send_game_action(self, path, body):
         """Mengirim aksi (submit, check, start) dan langsung mendapatkan feedback."""
+        if self.ws_sock and self._send_ws_action(path, body): return # Hasil datang lewat thread penerima WebSocket
         # Menjalankan di thread agar UI tidak freeze selama request
         threading.Thread(target=lambda: self.received_queue.put(
             {"type": "action_response", "data": self._request_response("POST", path, body)}
         ), daemon=True).start()
 
-    # --- Polling ---
+    def _send_ws_action(self, path, body):
+        message = {key: value for key, value in body.items() if key != 'player_id'}
+        self.ws_action_id += 1
+        message.update({"action": path.split('/')[1], "id": self.ws_action_id})
+        try:
+            with self.ws_lock: self.ws_sock.sendall(_ws_frame(WS_OP_TEXT, json.dumps(message)))
+            return True
+        except (OSError, AttributeError):
+            return False
+
+    # --- Update State (WebSocket, fallback long-poll) ---
 
     def start_polling(self, game_id, player_id):
         self.polling = True
         self.poll_thread = threading.Thread(
-            target=self._poll_status, args=(game_id, player_id), daemon=True
+            target=self._receive_updates, args=(game_id, player_id), daemon=True
         )
         self.poll_thread.start()
 
     def stop_polling(self):
         self.polling = False
+        sock, self.ws_sock = self.ws_sock, None
+        if sock:
+            try:
+                with self.ws_lock: sock.sendall(_ws_frame(WS_OP_CLOSE, struct.pack('!H', 1000)))
+                sock.shutdown(socket.SHUT_RDWR)
+            except OSError:
+                pass
+
+    def _receive_updates(self, game_id, player_id):
+        if USE_WEBSOCKET and self._websocket_loop(game_id, player_id): return
+        if self.polling: self._poll_status(game_id, player_id)
+
+    def _open_websocket(self, game_id, player_id):
+        """Handshake upgrade. Mengembalikan (sock, sock_file), atau None jika server tidak mendukung WebSocket."""
+        sock = socket.create_connection((self.host, self.port))
+        key = base64.b64encode(os.urandom(16)).decode('ascii')
+        sock.sendall((
+            f"GET /ws/{game_id}?player_id={player_id} HTTP/1.1\r\n"
+            f"Host: {self.host}\r\n"
+            "Upgrade: websocket\r\n"
+            "Connection: Upgrade\r\n"
+            f"Sec-WebSocket-Key: {key}\r\n"
+            "Sec-WebSocket-Version: 13\r\n\r\n"
+        ).encode('utf-8'))
+        sock_file = sock.makefile('rb')
+        status_line = sock_file.readline().split(b' ')
+        while sock_file.readline() not in (b'\r\n', b'\n', b''): pass
+        if len(status_line) < 2 or status_line[1] != b'101':
+            sock_file.close(); sock.close()
+            return None
+        return sock, sock_file
+
+    def _websocket_loop(self, game_id, player_id):
+        """Satu koneksi dua arah: state game didorong server (full lalu diff per key), hasil aksi datang sebagai 'result'.
+        Mengembalikan False jika WebSocket tidak tersedia atau putus sebelum game selesai (lanjut long-poll)."""
+        try:
+            opened = self._open_websocket(game_id, player_id)
+        except OSError:
+            return False
+        if not opened: return False
+        sock, sock_file = opened
+        self.ws_sock = sock
+        game_state = {}
+        try:
+            while self.polling:
+                opcode, payload = _ws_read_frame(sock_file)
+                if opcode == WS_OP_PING:
+                    with self.ws_lock: sock.sendall(_ws_frame(WS_OP_PONG, payload))
+                elif opcode == WS_OP_CLOSE:
+                    break
+                elif opcode == WS_OP_TEXT:
+                    message = json.loads(payload.decode('utf-8'))
+                    if message.get('type') == 'state':
+                        if message.get('full'): game_state = {}
+                        game_state.update(message['data'])
+                        self.received_queue.put({"type": "game_status", "data": {"success": True, "data": dict(game_state)}})
+                    elif message.get('type') == 'result':
+                        self.received_queue.put({"type": "action_response", "data": message})
+        except (OSError, ValueError) as e:
+            if self.polling: print(f"WebSocket terputus: {e}")
+        finally:
+            self.ws_sock = None
+            sock_file.close(); sock.close()
+        return not self.polling or bool(game_state.get('winner'))
 
     def _poll_status(self, game_id, player_id):
+        """Long-poll memakai satu koneksi persisten (keep-alive): server menahan request sampai
+        version game berubah, lalu koneksi yang sama dipakai lagi untuk request berikutnya."""
         import time
+        sock = sock_file = None
+        version = -1
         while self.polling:
-            path = f"/game_status/{game_id}?player_id={player_id}"
-            response = self._request_response("GET", path)
-            self.received_queue.put({"type": "game_status", "data": response})
+            path = f"/game_status/{game_id}?player_id={player_id}&since={version}&wait={LONG_POLL_WAIT}"
+            started = time.time()
+            try:
+                if sock is None:
+                    sock = socket.create_connection((self.host, self.port))
+                    sock_file = sock.makefile('rb')
+                self._send_request(sock, "GET", path, keep_alive=True)
+                response, still_open = self._read_response(sock_file)
+                if not still_open:
+                    sock_file.close(); sock.close(); sock = sock_file = None
+            except ConnectionRefusedError:
+                response = {"success": False, "message": "Koneksi ke server ditolak. Pastikan server berjalan."}
+                sock = sock_file = None
+            except Exception as e:
+                response = {"success": False, "message": f"Error jaringan: {e}"}
+                if sock: sock_file.close(); sock.close()
+                sock = sock_file = None
+
+            new_version = (response.get('data') or {}).get('version', version) if response.get('success') else version
+            changed = new_version != version
+            if changed or not response.get('success'):
+                version = new_version
+                self.received_queue.put({"type": "game_status", "data": response})
             
             # Jika ada pemenang, polling berhenti sendiri
             if response.get('data', {}).get('winner'):
                 self.stop_polling()
             
-            time.sleep(2)
\ No newline at end of file
+            # Jeda hanya saat error, atau jika server menjawab seketika tanpa perubahan (server tanpa long-poll).
+            if not response.get('success') or (not changed and time.time() - started < 1):
+                time.sleep(2)
+        if sock: sock_file.close(); sock.close()
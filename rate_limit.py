@@ -0,0 +1,114 @@
+# rate_limit.py (Admission control token bucket per player_id dan per alamat client, sebelum routing)
+import re
+import threading
+import time
+from collections import Counter, OrderedDict
+
+# (token per detik, kapasitas burst) per (cakupan, jenis request). Read = GET, write = POST.
+RATE_LIMITS = {
+    ('player', 'read'): (20.0, 40),
+    ('player', 'write'): (5.0, 15),
+    ('addr', 'read'): (100.0, 200),  # Satu alamat bisa berisi banyak pemain (NAT, jaringan sekolah/kantor)
+    ('addr', 'write'): (20.0, 60),
+}
+MAX_BUCKETS = 10000 # Bucket per tabel; yang paling lama tidak dipakai dibuang (sama saja dengan bucket penuh)
+TRUSTED_PROXIES = {'127.0.0.1', '::1'} # X-Forwarded-For hanya dipercaya dari alamat ini (worker pre-fork, load balancer)
+EXEMPT_PATHS = ('/static/',) # Plus '/'; file statis sudah di-cache dan dibutuhkan sekaligus saat halaman dimuat
+
+# player_id diambil langsung dari byte body/query tanpa parsing JSON, agar request yang ditolak tetap murah.
+BODY_PLAYER_ID = re.compile(rb'"player_id"\s*:\s*"([^"\\]{1,64})"')
+QUERY_PLAYER_ID = re.compile(r'(?:^|&)player_id=([^&]{1,64})')
+
+def client_address(request, trusted_proxies=TRUSTED_PROXIES):
+    """Alamat client asli: X-Forwarded-For (entri terakhir) jika request datang dari proxy tepercaya."""
+    if not request.remote_addr: return None
+    address = request.remote_addr[0]
+    forwarded = request.headers.get('x-forwarded-for')
+    if forwarded and address in trusted_proxies: return forwarded.rsplit(',', 1)[-1].strip()
+    return address
+
+def player_id_of(request):
+    if request.method == 'POST':
+        match = BODY_PLAYER_ID.search(request.body)
+        return match.group(1).decode('utf-8', 'replace') if match else None
+    match = QUERY_PLAYER_ID.search(request.target.partition('?')[2])
+    return match.group(1) if match else None
+
+class BucketTable:
+    """Token bucket per kunci, dibatasi max_buckets dengan urutan LRU. Dipakai di bawah lock RateLimiter."""
+    def __init__(self, rate, burst, max_buckets=MAX_BUCKETS):
+        self.rate = rate
+        self.burst = burst
+        self.max_buckets = max_buckets
+        self.buckets = OrderedDict() # kunci -> [token, waktu_isi_terakhir]
+
+    def refill(self, key, now):
+        bucket = self.buckets.get(key)
+        if bucket is None:
+            bucket = self.buckets[key] = [float(self.burst), now]
+            if len(self.buckets) > self.max_buckets: self.buckets.popitem(last=False)
+        else:
+            self.buckets.move_to_end(key)
+            bucket[0] = min(self.burst, bucket[0] + (now - bucket[1]) * self.rate)
+            bucket[1] = now
+        return bucket
+
+class RateLimiter:
+    def __init__(self, limits=None, max_buckets=MAX_BUCKETS, trusted_proxies=TRUSTED_PROXIES):
+        limits = {**RATE_LIMITS, **(limits or {})}
+        self.tables = {scope_kind: BucketTable(rate, burst, max_buckets) for scope_kind, (rate, burst) in limits.items()}
+        self.trusted_proxies = trusted_proxies
+        self.lock = threading.Lock()
+        self.limited = Counter() # (cakupan, jenis) -> jumlah request yang ditolak
+
+    def check(self, request):
+        """0 jika request boleh diproses, selain itu detik sampai token cukup (nilai Retry-After)."""
+        path = request.path
+        if path == '/' or path.startswith(EXEMPT_PATHS): return 0.0
+        kind = 'write' if request.method == 'POST' else 'read'
+        return self.take(self._keys(request), kind)
+
+    def check_batch(self, request, count):
+        """Sisa biaya /batch setelah check(): satu token per sub-request dari list hasil parsing JSON
+        (bukan dari byte body, yang bisa ditulis dengan escape). 0 jika boleh dijalankan, selain itu detik tunggu."""
+        if count <= 1: return 0.0
+        return self.take(self._keys(request), 'write', count - 1)
+
+    def _keys(self, request):
+        return [('addr', client_address(request, self.trusted_proxies)), ('player', player_id_of(request))]
+
+    def check_player(self, player_id, kind='write'):
+        """Untuk aksi di luar request HTTP (pesan WebSocket)."""
+        return self.take([('player', player_id)], kind)
+
+    def take(self, keys, kind, cost=1):
+        """Token hanya dipotong jika semua bucket cukup, agar penolakan di satu cakupan tidak menguras cakupan lain."""
+        now = time.monotonic()
+        with self.lock:
+            buckets, wait, denied_by = [], 0.0, None
+            for scope, key in keys:
+                if key is None: continue
+                table = self.tables[(scope, kind)]
+                bucket = table.refill(key, now)
+                needed = min(cost, table.burst)
+                buckets.append((bucket, needed))
+                if bucket[0] < needed and (needed - bucket[0]) / table.rate > wait:
+                    wait, denied_by = (needed - bucket[0]) / table.rate, scope
+            if denied_by:
+                self.limited[(denied_by, kind)] += 1
+                return wait
+            for bucket, needed in buckets: bucket[0] -= needed
+            return 0.0
+
+    def stats(self):
+        with self.lock:
+            return {"rate_limited": {f"{scope}_{kind}": count for (scope, kind), count in self.limited.items()},
+                    "rate_limit_buckets": sum(len(table.buckets) for table in self.tables.values())}
+
+def add_rate_limit_args(parser):
+    parser.add_argument('--no-rate-limit', action='store_true', help="Matikan rate limiting per pemain/alamat.")
+    parser.add_argument('--trusted-proxy', action='append', default=[], metavar='IP', help="Alamat proxy (misal load balancer) yang header X-Forwarded-For-nya dipercaya.")
+
+def configure_rate_limit(http_handler, args):
+    TRUSTED_PROXIES.update(args.trusted_proxy) # Juga dipakai saat worker pre-fork meneruskan alamat client
+    if args.no_rate_limit: http_handler.rate_limiter = None
@@ -0,0 +1,84 @@
+# reaper.py (Thread latar yang mengeluarkan game idle/selesai dari registry, opsional mengarsipkan game selesai)
+import json
+import logging
+import os
+import threading
+import time
+
+from server_log import log_event
+
+REAP_INTERVAL = 30 # Detik antar pemeriksaan registry
+# Detik tanpa aktivitas (request atau perubahan state) sebelum game dikeluarkan, per state game.
+GAME_TTLS = {
+    'lobby': 30 * 60,    # Belum dimulai; pemain kemungkinan sudah pergi
+    'active': 60 * 60,   # Sedang berjalan tapi tidak ada yang bergerak/polling
+    'finished': 5 * 60,  # Sudah ada pemenang; cukup lama untuk melihat hasil akhir
+}
+ARCHIVE_DIR = None # Direktori arsip game selesai (satu file JSON Lines per hari); None = tidak diarsipkan
+
+class GameReaper(threading.Thread):
+    def __init__(self, registry, interval=REAP_INTERVAL, ttls=None, archive_dir=ARCHIVE_DIR):
+        super().__init__(name="Reaper", daemon=True)
+        self.registry = registry
+        self.interval = interval
+        self.ttls = {**GAME_TTLS, **(ttls or {})}
+        self.archive_dir = archive_dir
+        self.archived = 0
+        self.archive_errors = 0
+        self._stop_event = threading.Event()
+
+    def run(self):
+        while not self._stop_event.wait(self.interval):
+            try:
+                self.reap_once()
+            except Exception as e:
+                logging.error(f"Reaper gagal: {e}", exc_info=True)
+
+    def stop(self):
+        self._stop_event.set()
+
+    def reap_once(self, now=None):
+        """Satu putaran: keluarkan game yang melewati TTL, lalu proses semua game yang sudah dikeluarkan
+        (termasuk yang terdorong keluar oleh batas max_games saat create_game)."""
+        self.registry.evict_idle(self.ttls, now)
+        for game, reason in self.registry.drain_evicted():
+            self.retire(game, reason)
+
+    def retire(self, game, reason):
+        with game.lock:
+            game.evicted = True
+            game.mark_changed() # Membangunkan long-poll; SSE/WebSocket yang masih terbuka lalu ditutup
+            record = self.archive_record(game, reason) if self.archive_dir and game.winner is not None else None
+        log_event('game', 'game_evicted', game_id=game.game_id, reason=reason, players=len(game.players), archived=record is not None)
+        if record: self.archive(record)
+
+    def archive_record(self, game, reason):
+        return {"game_id": game.game_id, "archived_at": round(time.time(), 3), "reason": reason, "winner": game.winner,
+                "host_id": game.host_id, "version": game.version, "player_order": list(game.player_order),
+                "scores": {player_id: player.score for player_id, player in game.players.items()}}
+
+    def archive(self, record):
+        path = os.path.join(self.archive_dir, f"games-{time.strftime('%Y%m%d')}.jsonl")
+        try:
+            os.makedirs(self.archive_dir, exist_ok=True)
+            with open(path, 'a', encoding='utf-8') as f: f.write(json.dumps(record) + "\n")
+            self.archived += 1
+        except OSError as e:
+            self.archive_errors += 1
+            logging.error(f"Gagal mengarsipkan game {record['game_id']} ke {path}: {e}")
+
+    def stats(self):
+        return {"evicted_games": dict(self.registry.evictions), "archived_games": self.archived}
+
+def add_reaper_args(parser):
+    parser.add_argument('--max-games', type=int, default=None, help="Batas game di registry; lobby/game selesai yang paling lama tidak diakses dikeluarkan lebih dulu (default: tanpa batas).")
+    parser.add_argument('--archive-dir', default=ARCHIVE_DIR, help="Arsipkan game selesai ke direktori ini sebelum dikeluarkan.")
+    parser.add_argument('--reap-interval', type=float, default=REAP_INTERVAL, help="Detik antar pemeriksaan game idle.")
+
+def start_reaper(registry, args, http_handler=None):
+    """Menerapkan argumen CLI ke registry, menjalankan reaper, dan mendaftarkan metriknya ke http_handler."""
+    if args.max_games is not None: registry.max_games = args.max_games or None
+    reaper = GameReaper(registry, interval=args.reap_interval, archive_dir=args.archive_dir)
+    if http_handler is not None: http_handler.reaper = reaper
+    reaper.start()
+    return reaper
@@ -0,0 +1,188 @@
+# request_reader.py (Parser request HTTP inkremental untuk server socket)
+import re
+import urllib.parse
+
+MAX_HEADER_SIZE = 16 * 1024   # Batas request line + seluruh header
+MAX_BODY_SIZE = 256 * 1024    # Batas body (Content-Length maupun total chunked)
+MAX_CHUNK_LINE = 1024         # Batas satu baris ukuran chunk / trailer
+CHUNK_SIZE_RE = re.compile(rb'[0-9A-Fa-f]+') # Ukuran chunk: hanya digit hex (tanpa tanda, 0x, atau _ yang diterima int())
+CONTENT_LENGTH_RE = re.compile(r'[0-9]+')    # Content-Length: hanya digit desimal, dengan alasan yang sama
+
+class RequestError(Exception):
+    """Request tidak bisa diproses. status_code/status_text dipakai untuk membalas sebelum koneksi ditutup."""
+    def __init__(self, status_code, status_text, message):
+        super().__init__(message)
+        self.status_code = status_code
+        self.status_text = status_text
+
+class HttpRequest:
+    def __init__(self, method, target, version, headers, body=b''):
+        self.method = method
+        self.target = target # Path lengkap termasuk query string
+        self.version = version
+        self.headers = headers # {nama_header_lowercase: nilai}
+        self.body = body
+        self.remote_addr = None # Diisi oleh layer socket jika diketahui
+        self.retry_after = None # Hasil rate limiter: None = belum diperiksa, 0 = diterima, >0 = ditolak
+
+    @property
+    def path(self):
+        return urllib.parse.urlparse(self.target).path
+
+    @property
+    def keep_alive(self):
+        connection = self.headers.get('connection', '').lower()
+        if self.version == 'HTTP/1.1': return connection != 'close'
+        return connection == 'keep-alive'
+
+    def body_text(self):
+        return self.body.decode('utf-8') if self.body else ''
+
+    def to_bytes(self, extra_headers=None):
+        """Serialisasi ulang request (misal untuk diteruskan ke server lain) dengan Connection: close,
+        kecuali request upgrade (WebSocket) yang tetap membawa Connection: Upgrade."""
+        skipped = ('connection', 'keep-alive', 'transfer-encoding', 'content-length', 'expect')
+        headers = {k: v for k, v in self.headers.items() if k not in skipped}
+        headers.update(extra_headers or {})
+        headers.update({'connection': 'Upgrade' if 'upgrade' in headers else 'close', 'content-length': len(self.body)})
+        head = "".join(f"{k}: {v}\r\n" for k, v in headers.items())
+        return f"{self.method} {self.target} HTTP/1.1\r\n".encode('utf-8') + head.encode('latin-1') + b"\r\n" + self.body
+
+    @classmethod
+    def from_text(cls, request_text):
+        """Membuat HttpRequest dari teks request utuh (kompatibilitas dengan pemanggil lama)."""
+        head, _, body = request_text.encode('utf-8').partition(b'\r\n\r\n')
+        return RequestReader()._build_request(head, body)
+
+class RequestReader:
+    """Membaca request dari aliran byte secara bertahap.
+
+    Byte dari socket dimasukkan lewat feed(); next_request() mengembalikan HttpRequest
+    setiap kali satu request lengkap tersedia (None jika masih butuh data).
+    Sisa byte (request pipelined berikutnya) tetap di buffer.
+    """
+    def __init__(self, max_header_size=MAX_HEADER_SIZE, max_body_size=MAX_BODY_SIZE):
+        self.max_header_size = max_header_size
+        self.max_body_size = max_body_size
+        self.buffer = bytearray()
+        self.expect_continue = False # True jika client menunggu '100 Continue' sebelum mengirim body
+        self._reset()
+
+    def _reset(self):
+        self._state = 'head'
+        self._scan_from = 0 # Posisi pencarian CRLFCRLF berikutnya, agar header tidak dipindai ulang
+        self._head = None
+        self._headers = None
+        self._content_length = 0
+        self._body = None
+
+    def feed(self, data):
+        self.buffer += data
+
+    def is_idle(self):
+        """True jika tidak ada request yang sedang dibaca: belum ada byte request berikutnya dan tidak ada body yang tertunda."""
+        return self._state == 'head' and not self.buffer
+
+    def next_request(self):
+        if self._state == 'head' and not self._read_head(): return None
+        if self._state == 'body' and not self._read_body(): return None
+        if self._state in ('chunk_size', 'chunk_data', 'trailers') and not self._read_chunks(): return None
+        request = self._build_request(self._head, bytes(self._body) if isinstance(self._body, bytearray) else self._body, self._headers)
+        self.expect_continue = False
+        self._reset()
+        return request
+
+    def _read_head(self):
+        while self._scan_from == 0 and self.buffer[:2] == b'\r\n':
+            del self.buffer[:2] # CRLF kosong di antara request pipelined boleh diabaikan
+        header_end = self.buffer.find(b'\r\n\r\n', self._scan_from)
+        if header_end < 0:
+            if len(self.buffer) > self.max_header_size:
+                raise RequestError(431, "Request Header Fields Too Large", "Header request terlalu besar.")
+            self._scan_from = max(0, len(self.buffer) - 3)
+            return False
+        if header_end > self.max_header_size:
+            raise RequestError(431, "Request Header Fields Too Large", "Header request terlalu besar.")
+        self._head = bytes(self.buffer[:header_end])
+        del self.buffer[:header_end + 4]
+        headers = self._headers = self._parse_headers(self._head)
+        transfer_encoding = headers.get('transfer-encoding', '').lower()
+        if transfer_encoding and 'content-length' in headers:
+            # Dua framing sekaligus bisa dibaca berbeda oleh proxy di depan server (request smuggling)
+            raise RequestError(400, "Bad Request", "Transfer-Encoding dan Content-Length tidak boleh dikirim bersamaan.")
+        if transfer_encoding:
+            if transfer_encoding != 'chunked':
+                raise RequestError(501, "Not Implemented", f"Transfer-Encoding '{transfer_encoding}' tidak didukung.")
+            self._body = bytearray()
+            self._state = 'chunk_size'
+        else:
+            content_length = headers.get('content-length', '0')
+            if not CONTENT_LENGTH_RE.fullmatch(content_length):
+                raise RequestError(400, "Bad Request", "Content-Length tidak valid.")
+            self._content_length = int(content_length)
+            if self._content_length > self.max_body_size:
+                raise RequestError(413, "Payload Too Large", "Body request terlalu besar.")
+            self._state = 'body'
+        self.expect_continue = headers.get('expect', '').lower() == '100-continue'
+        return True
+
+    def _read_body(self):
+        if len(self.buffer) < self._content_length: return False
+        self._body = bytes(self.buffer[:self._content_length])
+        del self.buffer[:self._content_length]
+        return True
+
+    def _read_line(self):
+        line_end = self.buffer.find(b'\r\n')
+        if line_end < 0:
+            if len(self.buffer) > MAX_CHUNK_LINE:
+                raise RequestError(400, "Bad Request", "Baris chunk terlalu panjang.")
+            return None
+        line = bytes(self.buffer[:line_end])
+        del self.buffer[:line_end + 2]
+        return line
+
+    def _read_chunks(self):
+        while True:
+            if self._state == 'chunk_size':
+                line = self._read_line()
+                if line is None: return False
+                size = line.split(b';', 1)[0].strip()
+                if not CHUNK_SIZE_RE.fullmatch(size):
+                    raise RequestError(400, "Bad Request", "Ukuran chunk tidak valid.")
+                self._content_length = int(size, 16)
+                if len(self._body) + self._content_length > self.max_body_size:
+                    raise RequestError(413, "Payload Too Large", "Body request terlalu besar.")
+                self._state = 'chunk_data' if self._content_length else 'trailers'
+            elif self._state == 'chunk_data':
+                if len(self.buffer) < self._content_length + 2: return False
+                if self.buffer[self._content_length:self._content_length + 2] != b'\r\n':
+                    raise RequestError(400, "Bad Request", "Chunk tidak diakhiri CRLF.")
+                self._body += self.buffer[:self._content_length]
+                del self.buffer[:self._content_length + 2]
+                self._state = 'chunk_size'
+            else: # trailers: diabaikan sampai baris kosong
+                line = self._read_line()
+                if line is None: return False
+                if not line: return True
+
+    def _parse_headers(self, head):
+        headers = {}
+        for line in head.split(b'\r\n')[1:]:
+            name, sep, value = line.partition(b':')
+            if not sep:
+                raise RequestError(400, "Bad Request", "Baris header tidak valid.")
+            name = name.strip().lower().decode('latin-1')
+            if name == 'content-length' and name in headers:
+                raise RequestError(400, "Bad Request", "Content-Length dikirim lebih dari sekali.")
+            headers[name] = value.strip().decode('latin-1')
+        return headers
+
+    def _build_request(self, head, body, headers=None):
+        request_line = head.split(b'\r\n', 1)[0].decode('utf-8', errors='replace')
+        parts = request_line.split(' ')
+        if len(parts) != 3:
+            raise RequestError(400, "Bad Request", "Request line tidak valid.")
+        method, target, version = parts
+        if headers is None: headers = self._parse_headers(head)
+        return HttpRequest(method, target, version, headers, body or b'')
@@ -0,0 +1,275 @@
+# server_async_http.py (Event loop satu thread berbasis asyncio)
+import argparse
+import asyncio
+import logging
+from concurrent.futures import ThreadPoolExecutor
+
+from http import HttpServer, FileResponse, EventStream, GameSocket, SSE_HEARTBEAT_INTERVAL, WS_PING_INTERVAL
+from request_reader import RequestReader, RequestError
+import websocket_frames as ws
+import profiler
+from reaper import add_reaper_args, start_reaper
+from rate_limit import add_rate_limit_args, configure_rate_limit
+from server_log import add_logging_args, setup_logging_from_args
+from server_thread_http import GAMES, GAMES_LOCK, DICTIONARY, FRAGMENT_INDEX, STATIC_CACHE, SERVER_PORT, LISTEN_BACKLOG, KEEP_ALIVE_TIMEOUT, MAX_KEEP_ALIVE_REQUESTS, RECV_SIZE, setup_dictionary, setup_static_cache, start_index_warmup
+
+# --- Konfigurasi Server Async ---
+EXECUTOR_WORKERS = 4          # Thread untuk handler yang berat (validasi kata, deal kartu)
+READ_TIMEOUT = 30             # Detik menunggu request pertama dari client
+# Prefix path yang dijalankan di executor; sisanya (termasuk file statis dari cache) cukup murah untuk event loop.
+# /hint/ dan /check_turn/ bisa memuat entri FragmentIndex dan mencari langkah legal (auto-check).
+EXECUTOR_PATH_PREFIXES = ('/submit_turn/', '/start_game/', '/check_turn/', '/hint/', '/batch', '/admin/')
+# Route murah yang tetap mengambil game.lock: dijalankan di event loop hanya jika lock sedang bebas (lihat _call_locked).
+GAME_LOCK_PATH_PREFIXES = ('/game_status/', '/join_game/', '/events/', '/ws/')
+
+class AsyncServer:
+    def __init__(self, port, executor_workers=EXECUTOR_WORKERS, backlog=LISTEN_BACKLOG):
+        self.port = port
+        self.backlog = backlog
+        self.http_handler = HttpServer(GAMES, GAMES_LOCK, DICTIONARY, STATIC_CACHE, FRAGMENT_INDEX)
+        self.http_handler.stats_provider = self.stats
+        self.http_handler.blocking_waits = False # Long-poll ditunggu di event loop, bukan di thread
+        self.executor = ThreadPoolExecutor(max_workers=executor_workers, thread_name_prefix="Executor")
+        self.executor_workers = executor_workers
+        self.open_connections = 0
+        self.offloaded = 0
+        self.long_polls = 0
+        self.event_streams = 0
+        self.websockets = 0
+
+    def stats(self):
+        return {"mode": "async", "open_connections": self.open_connections, "executor_workers": self.executor_workers, "offloaded_requests": self.offloaded, "waiting_long_polls": self.long_polls, "event_streams": self.event_streams, "websockets": self.websockets}
+
+    def _needs_executor(self, request):
+        return request.path.startswith(EXECUTOR_PATH_PREFIXES)
+
+    def _locked_game(self, request):
+        """Game yang lock-nya akan diambil handler request ini di event loop, atau None."""
+        path = request.path
+        if not path.startswith(GAME_LOCK_PATH_PREFIXES): return None
+        return self.http_handler.GAMES.get(path.split('/')[2])
+
+    async def _call_locked(self, game, function, *args):
+        """Menjalankan function yang mengambil game.lock. Event loop tidak boleh menunggu lock yang sedang
+        dipegang thread executor (misal /hint atau /submit_turn yang memvalidasi kata): jika lock tidak bisa
+        diambil seketika, function dipindah ke executor. Jika bisa, lock (RLock) dipegang selama function berjalan."""
+        if game is None: return function(*args)
+        if not game.lock.acquire(blocking=False):
+            self.offloaded += 1
+            return await asyncio.get_running_loop().run_in_executor(self.executor, function, *args)
+        try:
+            return function(*args)
+        finally:
+            game.lock.release()
+
+    async def _read_request(self, reader, request_reader, writer):
+        """Mengisi RequestReader dari stream sampai satu request lengkap. None jika client menutup koneksi."""
+        while True:
+            request = request_reader.next_request()
+            if request is not None: return request
+            if request_reader.expect_continue:
+                request_reader.expect_continue = False
+                writer.write(b'HTTP/1.1 100 Continue\r\n\r\n')
+            data = await reader.read(RECV_SIZE)
+            if not data: return None
+            request_reader.feed(data)
+
+    async def _wait_for_change(self, game, since, wait):
+        """Menahan long-poll tanpa memblok thread: listener game membangunkan future di event loop."""
+        loop = asyncio.get_running_loop()
+        changed = loop.create_future()
+        def on_change(_game):
+            loop.call_soon_threadsafe(lambda: changed.done() or changed.set_result(True))
+        await self._call_locked(game, game.add_listener, on_change)
+        self.long_polls += 1
+        try:
+            if game.version <= since: # Dicek ulang setelah listener terpasang agar perubahan tidak terlewat
+                await asyncio.wait_for(changed, wait)
+        except asyncio.TimeoutError:
+            pass
+        finally:
+            self.long_polls -= 1
+            await self._call_locked(game, game.remove_listener, on_change)
+
+    async def _stream_events(self, writer, stream):
+        """Stream SSE tanpa thread: listener game membangunkan loop ini setiap version berubah."""
+        loop = asyncio.get_running_loop()
+        wake = asyncio.Event()
+        def on_change(_game):
+            loop.call_soon_threadsafe(wake.set)
+        await self._call_locked(stream.game, stream.game.add_listener, on_change)
+        self.event_streams += 1
+        try:
+            writer.write(stream.header_bytes)
+            while True:
+                wake.clear()
+                event = await self._call_locked(stream.game, stream.next_event)
+                if event: writer.write(event)
+                await writer.drain()
+                if stream.finished: return
+                try:
+                    await asyncio.wait_for(wake.wait(), SSE_HEARTBEAT_INTERVAL)
+                except asyncio.TimeoutError:
+                    writer.write(EventStream.HEARTBEAT)
+        except ConnectionError:
+            pass # Client menutup stream
+        finally:
+            self.event_streams -= 1
+            await self._call_locked(stream.game, stream.game.remove_listener, on_change)
+            stream.close()
+
+    async def _run_websocket(self, reader, writer, socket_response):
+        """WebSocket tanpa thread per koneksi: state didorong dari listener game, pesan client
+        (aksi yang bisa berat, misal validasi kata) diproses di executor."""
+        loop = asyncio.get_running_loop()
+        wake = asyncio.Event()
+        def on_change(_game):
+            loop.call_soon_threadsafe(wake.set)
+        await self._call_locked(socket_response.game, socket_response.game.add_listener, on_change)
+        self.websockets += 1
+
+        async def push_state():
+            while True:
+                wake.clear()
+                frame = await self._call_locked(socket_response.game, socket_response.state_frame)
+                if frame:
+                    writer.write(frame)
+                    await writer.drain()
+                if socket_response.finished: return
+                try:
+                    await asyncio.wait_for(wake.wait(), WS_PING_INTERVAL)
+                except asyncio.TimeoutError:
+                    writer.write(GameSocket.PING)
+
+        async def read_messages():
+            data = socket_response.buffered
+            while True:
+                if data:
+                    self.offloaded += 1
+                    replies, closed = await loop.run_in_executor(self.executor, socket_response.receive, data)
+                    if replies: writer.write(b''.join(replies))
+                    if closed: return
+                    wake.set() # Aksi sendiri bisa mengubah state; pastikan push_state memeriksa ulang
+                data = await reader.read(RECV_SIZE)
+                if not data: return
+
+        writer.write(socket_response.header_bytes)
+        tasks = [asyncio.ensure_future(push_state()), asyncio.ensure_future(read_messages())]
+        try:
+            done, _ = await asyncio.wait(tasks, return_when=asyncio.FIRST_COMPLETED)
+            for task in done:
+                error = task.exception()
+                if error: raise error
+            if tasks[0] in done: # push_state selesai karena game sudah punya pemenang
+                writer.write(ws.close_frame(ws.CLOSE_NORMAL, "Game selesai"))
+            await writer.drain()
+        except ConnectionError:
+            pass # Client menutup koneksi
+        finally:
+            for task in tasks: task.cancel()
+            self.websockets -= 1
+            await self._call_locked(socket_response.game, socket_response.game.remove_listener, on_change)
+            socket_response.close()
+
+    async def _send_file(self, writer, response):
+        writer.write(response.header_bytes)
+        await writer.drain()
+        with open(response.file_path, 'rb') as f:
+            await asyncio.get_running_loop().sendfile(writer.transport, f, response.offset, response.count)
+
+    async def handle_client(self, reader, writer):
+        address = writer.get_extra_info('peername')
+        request_reader = RequestReader()
+        self.open_connections += 1
+        self.http_handler.metrics.connection_opened()
+        served = 0
+        try:
+            while True:
+                # Request pipelined tersisa di buffer RequestReader dan dijawab berurutan.
+                try:
+                    request = await asyncio.wait_for(self._read_request(reader, request_reader, writer), KEEP_ALIVE_TIMEOUT if served else READ_TIMEOUT)
+                except (asyncio.TimeoutError, ConnectionError):
+                    return
+                except RequestError as e:
+                    writer.write(self.http_handler.json_response(e.status_code, e.status_text, {"success": False, "message": str(e)}))
+                    await writer.drain()
+                    return
+                if request is None: return
+                request.remote_addr = address
+                served += 1
+                keep_open = request.keep_alive and served < MAX_KEEP_ALIVE_REQUESTS
+                keep_alive = (KEEP_ALIVE_TIMEOUT, MAX_KEEP_ALIVE_REQUESTS - served) if keep_open else None
+                long_poll = self.http_handler.long_poll_target(request)
+                if long_poll: await self._wait_for_change(*long_poll)
+                if self._needs_executor(request):
+                    self.offloaded += 1
+                    loop = asyncio.get_running_loop()
+                    response_bytes = await loop.run_in_executor(self.executor, self.http_handler.proses, request, keep_alive)
+                else:
+                    response_bytes = await self._call_locked(self._locked_game(request), self.http_handler.proses, request, keep_alive)
+                if isinstance(response_bytes, GameSocket):
+                    response_bytes.buffered = bytes(request_reader.buffer)
+                    await self._run_websocket(reader, writer, response_bytes)
+                    return
+                if isinstance(response_bytes, EventStream):
+                    await self._stream_events(writer, response_bytes)
+                    return
+                if isinstance(response_bytes, FileResponse):
+                    await self._send_file(writer, response_bytes)
+                else:
+                    writer.write(response_bytes)
+                    await writer.drain()
+                if not keep_open: return
+        except Exception as e:
+            logging.error(f"Error pada koneksi client {address}: {e}", exc_info=True)
+        finally:
+            self.open_connections -= 1
+            self.http_handler.metrics.connection_closed()
+            writer.close()
+            try:
+                await writer.wait_closed()
+            except ConnectionError:
+                pass
+
+    async def serve(self):
+        server = await asyncio.start_server(self.handle_client, '0.0.0.0', self.port, backlog=self.backlog, reuse_address=True)
+        logging.info(f"Server async berjalan di http://localhost:{self.port}/ (executor: {self.executor_workers} thread)")
+        async with server:
+            await server.serve_forever()
+
+    def run(self):
+        try:
+            asyncio.run(self.serve())
+        except KeyboardInterrupt:
+            logging.info("Server diminta berhenti.")
+        finally:
+            self.executor.shutdown(wait=False)
+            logging.info("Server async ditutup.")
+
+def parse_args():
+    parser = argparse.ArgumentParser(description="Server HTTP Sekata berbasis event loop asyncio.")
+    parser.add_argument('--port', type=int, default=SERVER_PORT)
+    parser.add_argument('--executor-workers', type=int, default=EXECUTOR_WORKERS, help="Thread untuk handler yang berat.")
+    parser.add_argument('--backlog', type=int, default=LISTEN_BACKLOG, help="Backlog listen() socket.")
+    parser.add_argument('--check-mtime', action='store_true', help="Development: cek mtime file statis setiap request dan muat ulang jika berubah.")
+    add_logging_args(parser)
+    add_reaper_args(parser)
+    add_rate_limit_args(parser)
+    parser.add_argument('--auto-check', action='store_true', help="Lewati otomatis giliran pemain yang tidak punya langkah legal.")
+    return parser.parse_args()
+
+def main():
+    args = parse_args()
+    setup_logging_from_args(args)
+    setup_dictionary()
+    setup_static_cache(args.check_mtime)
+    server = AsyncServer(args.port, executor_workers=args.executor_workers, backlog=args.backlog)
+    profiler.install_signal_handler(server.http_handler)
+    start_reaper(GAMES, args, server.http_handler)
+    configure_rate_limit(server.http_handler, args)
+    server.http_handler.auto_check = args.auto_check
+    start_index_warmup()
+    server.run()
+
+if __name__=="__main__":
+    main()
@@ -0,0 +1,112 @@
+# server_log.py (Logging terstruktur lewat antrian + thread latar, dengan sampling per kategori)
+import atexit
+import json
+import logging
+import logging.handlers
+import os
+import queue
+import random
+
+LOG_LEVEL = logging.INFO
+LOG_FORMAT = 'text'        # 'text' atau 'json' (satu objek JSON per baris)
+LOG_QUEUE_SIZE = 10000     # Record yang belum ditulis; jika penuh record baru dibuang (dihitung di stats)
+# Peluang satu event dicatat per kategori (0 = mati, 1 = semua). Kategori yang tidak terdaftar selalu dicatat.
+SAMPLE_RATES = {
+    'request': 0.01,    # Setiap request HTTP yang diproses
+    'connection': 0.0,  # Koneksi diterima/ditutup, request tidak valid
+    'pool': 0.1,        # Load shedding worker pool
+    'stream': 1.0,      # SSE/WebSocket dibuka/ditutup
+    'game': 1.0,        # Event giliran dan siklus hidup game
+    'limit': 0.1,       # Request yang ditolak rate limiter (bisa sangat banyak saat flood)
+}
+
+_listener = None
+_listener_pid = None
+_handler = None
+
+class DroppingQueueHandler(logging.handlers.QueueHandler):
+    """QueueHandler yang tidak pernah memblok thread pemanggil: record dibuang jika antrian penuh,
+    dan format pesan dikerjakan oleh thread listener, bukan di hot path."""
+    def __init__(self, log_queue):
+        super().__init__(log_queue)
+        self.dropped = 0
+
+    def prepare(self, record):
+        return record # Satu proses: record tidak perlu di-pickle, pemformatan ditunda ke listener
+
+    def enqueue(self, record):
+        try:
+            self.queue.put_nowait(record)
+        except queue.Full:
+            self.dropped += 1
+
+class StructuredFormatter(logging.Formatter):
+    """Record dari log_event ditulis sebagai 'kategori.event key=value ...' atau JSON; record logging biasa apa adanya."""
+    def __init__(self, fmt='text'):
+        super().__init__('[%(levelname)s] (%(threadName)-10s) %(message)s')
+        self.fmt = fmt
+
+    def format(self, record):
+        fields = getattr(record, 'fields', None)
+        category = getattr(record, 'category', None)
+        if self.fmt == 'json':
+            data = {"ts": round(record.created, 3), "level": record.levelname, "thread": record.threadName}
+            if category: data.update({"category": category, "event": record.event, **fields})
+            else: data["message"] = record.getMessage()
+            if record.exc_info: data["exc"] = self.formatException(record.exc_info)
+            return json.dumps(data, default=str)
+        message = super().format(record)
+        if category is None: return message
+        pairs = " ".join(f"{key}={value}" for key, value in fields.items())
+        return f"{message} {pairs}" if pairs else message
+
+def log_event(category, event, level=logging.INFO, **fields):
+    """Mencatat event terstruktur jika kategori aktif dan lolos sampling. Murah jika kategori mati."""
+    rate = SAMPLE_RATES.get(category, 1.0)
+    if rate <= 0.0 or (rate < 1.0 and random.random() >= rate): return
+    logging.getLogger(f"sekata.{category}").log(level, "%s.%s", category, event, extra={'category': category, 'event': event, 'fields': fields})
+
+def setup_logging(level=LOG_LEVEL, fmt=LOG_FORMAT, sample_rates=None):
+    """Memasang handler antrian di root logger dan menjalankan listener di thread latar.
+    Dipanggil ulang di proses hasil fork, karena thread listener tidak ikut tersalin."""
+    global _listener, _listener_pid, _handler
+    if sample_rates: SAMPLE_RATES.update(sample_rates)
+    if _listener is not None and _listener_pid == os.getpid(): _listener.stop()
+    log_queue = queue.Queue(maxsize=LOG_QUEUE_SIZE)
+    output = logging.StreamHandler()
+    output.setFormatter(StructuredFormatter(fmt))
+    _handler = DroppingQueueHandler(log_queue)
+    root = logging.getLogger()
+    for handler in list(root.handlers): root.removeHandler(handler)
+    root.addHandler(_handler)
+    root.setLevel(level)
+    _listener = logging.handlers.QueueListener(log_queue, output, respect_handler_level=False)
+    _listener.start()
+    _listener_pid = os.getpid()
+
+def shutdown_logging():
+    """Menulis sisa record di antrian lalu menghentikan listener."""
+    global _listener
+    if _listener is not None and _listener_pid == os.getpid():
+        _listener.stop()
+        _listener = None
+
+def parse_sample_rates(values):
+    """['request=0.1', 'game=1'] -> {'request': 0.1, 'game': 1.0}"""
+    rates = {}
+    for value in values or []:
+        category, _, rate = value.partition('=')
+        rates[category.strip()] = max(0.0, min(1.0, float(rate)))
+    return rates
+
+def add_logging_args(parser):
+    parser.add_argument('--log-format', choices=['text', 'json'], default=LOG_FORMAT)
+    parser.add_argument('--log-sample', action='append', metavar='KATEGORI=RATE', help=f"Sampling per kategori, misal request=0.1 (default: {SAMPLE_RATES}).")
+
+def setup_logging_from_args(args):
+    setup_logging(fmt=args.log_format, sample_rates=parse_sample_rates(args.log_sample))
+
+def stats():
+    return {"log_queue_depth": _handler.queue.qsize() if _handler else 0, "log_dropped": _handler.dropped if _handler else 0}
+
+atexit.register(shutdown_logging)
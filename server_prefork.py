@@ -0,0 +1,205 @@
+# server_prefork.py (Mode pre-fork: N proses worker pada port yang sama, game di-shard per worker)
+import argparse
+import gc
+import logging
+import os
+import hmac
+import re
+import secrets
+import select
+import signal
+import socket
+import zlib
+
+from http import HttpServer, StreamResponse, MAX_LONG_POLL_WAIT
+import profiler
+from reaper import add_reaper_args, start_reaper
+from rate_limit import add_rate_limit_args, configure_rate_limit, client_address
+from server_log import add_logging_args, setup_logging_from_args, shutdown_logging
+from server_thread_http import GAMES, GAMES_LOCK, DICTIONARY, FRAGMENT_INDEX, STATIC_CACHE, SERVER_PORT, EXECUTION_MODE, WORKER_POOL_SIZE, ACCEPT_QUEUE_SIZE, LISTEN_BACKLOG, Server, setup_dictionary, setup_static_cache
+
+# --- Konfigurasi Pre-fork ---
+NUM_WORKERS = os.cpu_count() or 2
+INTERNAL_HOST = '127.0.0.1'
+INTERNAL_PORT_OFFSET = 1000   # Worker ke-i mendengarkan request terusan di port + offset + i
+FORWARD_TIMEOUT = MAX_LONG_POLL_WAIT + 5 # Detik menunggu worker pemilik game menjawab (termasuk long-poll)
+# Dibuat di master sebelum fork, sama untuk semua worker. Menandai /batch terusan yang sudah dipotong token rate limit
+# di worker penerima; client tidak bisa memalsukannya karena nilainya acak per proses master.
+FORWARD_TOKEN = secrets.token_hex(16)
+
+def shard_of(game_id, num_shards):
+    """Aturan routing: worker pemilik game ditentukan dari CRC32 ID game."""
+    return zlib.crc32(game_id.encode('utf-8')) % num_shards
+
+class RelayStream(StreamResponse):
+    """Meneruskan stream (SSE, WebSocket) antara client dan worker pemilik, dua arah,
+    sampai salah satu sisi menutup koneksi."""
+    def __init__(self, upstream, release=None):
+        super().__init__(b'', release)
+        self.upstream = upstream
+
+    def run_blocking(self, sock):
+        try:
+            if self.buffered: self.upstream.sendall(self.buffered)
+            while True:
+                readable, _, _ = select.select([self.upstream, sock], [], [])
+                for source in readable:
+                    chunk = source.recv(65536)
+                    if not chunk: return
+                    (sock if source is self.upstream else self.upstream).sendall(chunk)
+        except OSError:
+            pass
+        finally:
+            self.upstream.close()
+            self.close()
+
+class ShardRouter:
+    """Meneruskan request untuk game milik worker lain ke port internal worker tersebut."""
+    GAME_PATH = re.compile(r'^/(?:join_game|start_game|game_status|hint|submit_turn|check_turn|events|ws)/([A-Z0-9]+)')
+
+    def __init__(self, http_handler, index, num_shards, public_port, internal_host=INTERNAL_HOST, port_offset=INTERNAL_PORT_OFFSET):
+        self.http_handler = http_handler
+        self.index = index
+        self.num_shards = num_shards
+        self.internal_host = internal_host
+        self.internal_port_base = public_port + port_offset
+        self.forwarded = 0
+
+    def internal_port(self, shard):
+        return self.internal_port_base + shard
+
+    def shard_for(self, game_id):
+        return shard_of(game_id, self.num_shards)
+
+    def owns(self, game_id):
+        return self.shard_for(game_id) == self.index
+
+    def game_id_for(self, path):
+        match = self.GAME_PATH.match(path)
+        return match.group(1) if match else None
+
+    def route(self, request):
+        """Mengembalikan bytes respons dari worker pemilik, atau None jika request ditangani di sini."""
+        game_id = self.game_id_for(request.path)
+        if game_id is None or self.owns(game_id): return None
+        return self.forward(request, self.shard_for(game_id))
+
+    def forward(self, request, shard, precharged=False):
+        """precharged: request sudah melewati rate limiter di worker ini (kelompok /batch), pemilik tidak memotong lagi."""
+        self.forwarded += 1
+        address = client_address(request) # Alamat asli tetap dibawa jika request sudah lewat load balancer
+        extra_headers = {'x-forwarded-for': address} if address else {}
+        if precharged: extra_headers['x-sekata-forward'] = FORWARD_TOKEN
+        if request.path.startswith(('/events/', '/ws/')): return self.forward_stream(request, shard, extra_headers)
+        try:
+            with socket.create_connection((self.internal_host, self.internal_port(shard)), timeout=FORWARD_TIMEOUT) as sock:
+                sock.sendall(request.to_bytes(extra_headers))
+                chunks = []
+                while True:
+                    chunk = sock.recv(65536)
+                    if not chunk: break
+                    chunks.append(chunk)
+            return b''.join(chunks)
+        except OSError as e:
+            logging.error(f"Gagal meneruskan {request.path} ke worker {shard}: {e}")
+            return self.http_handler.json_response(502, "Bad Gateway", {"success": False, "message": "Worker pemilik game tidak dapat dihubungi."})
+
+    def forward_stream(self, request, shard, extra_headers):
+        """Stream SSE/WebSocket tidak bisa dibaca sampai EOF; byte direlai selama koneksi hidup."""
+        if not self.http_handler.stream_slots.acquire(blocking=False):
+            return self.http_handler.json_response(503, "Service Unavailable", {"success": False, "message": "Stream penuh, gunakan long-poll /game_status."})
+        try:
+            upstream = socket.create_connection((self.internal_host, self.internal_port(shard)), timeout=FORWARD_TIMEOUT)
+            upstream.sendall(request.to_bytes(extra_headers))
+        except OSError as e:
+            self.http_handler.stream_slots.release()
+            logging.error(f"Gagal meneruskan stream {request.path} ke worker {shard}: {e}")
+            return self.http_handler.json_response(502, "Bad Gateway", {"success": False, "message": "Worker pemilik game tidak dapat dihubungi."})
+        return RelayStream(upstream, self.http_handler.stream_slots.release)
+
+    def is_precharged(self, request):
+        return hmac.compare_digest(request.headers.get('x-sekata-forward', ''), FORWARD_TOKEN)
+
+    def stats(self):
+        return {"shard_index": self.index, "num_shards": self.num_shards, "forwarded_requests": self.forwarded}
+
+def run_worker(index, args):
+    """Badan proses worker: listener publik (SO_REUSEPORT) + listener internal untuk request terusan."""
+    http_handler = HttpServer(GAMES, GAMES_LOCK, DICTIONARY, STATIC_CACHE, FRAGMENT_INDEX)
+    router = ShardRouter(http_handler, index, args.workers, args.port)
+    http_handler.shard_router = router
+    profiler.install_signal_handler(http_handler) # kill -USR1 <pid worker>
+    start_reaper(GAMES, args, http_handler) # Tiap worker membersihkan shard miliknya sendiri
+    configure_rate_limit(http_handler, args) # Request game diberi token oleh worker pemiliknya, setelah diteruskan
+    http_handler.auto_check = args.auto_check
+    public = Server(args.port, mode=args.mode, pool_size=args.pool_size, queue_size=args.queue_size, backlog=args.backlog, http_handler=http_handler, reuse_port=True)
+    internal = Server(router.internal_port(index), mode=args.mode, pool_size=args.pool_size, queue_size=args.queue_size, backlog=args.backlog, host=INTERNAL_HOST, http_handler=http_handler)
+    public.setName(f"Shard{index}-Public")
+    internal.setName(f"Shard{index}-Internal")
+    http_handler.stats_provider = lambda: {**public.stats(), **router.stats(), "pid": os.getpid()}
+    internal.daemon = True
+    internal.start()
+    public.start()
+    public.join()
+
+def spawn_worker(index, args):
+    pid = os.fork()
+    if pid == 0:
+        signal.signal(signal.SIGINT, signal.SIG_DFL)
+        signal.signal(signal.SIGTERM, signal.SIG_DFL)
+        try:
+            setup_logging_from_args(args) # Thread listener log milik master tidak ikut ter-fork
+            run_worker(index, args)
+        finally:
+            shutdown_logging()
+            os._exit(0)
+    logging.info(f"Worker {index} berjalan dengan pid {pid}.")
+    return pid
+
+def _raise_interrupt(signum, frame):
+    raise KeyboardInterrupt
+
+def parse_args():
+    parser = argparse.ArgumentParser(description="Server Sekata pre-fork dengan sharding game per proses worker.")
+    parser.add_argument('--port', type=int, default=SERVER_PORT)
+    parser.add_argument('--workers', type=int, default=NUM_WORKERS, help="Jumlah proses worker.")
+    parser.add_argument('--mode', choices=['pool', 'thread'], default=EXECUTION_MODE, help="Mode eksekusi di dalam tiap worker.")
+    parser.add_argument('--pool-size', type=int, default=WORKER_POOL_SIZE, help="Jumlah worker thread per proses (mode pool).")
+    parser.add_argument('--queue-size', type=int, default=ACCEPT_QUEUE_SIZE)
+    parser.add_argument('--backlog', type=int, default=LISTEN_BACKLOG)
+    parser.add_argument('--check-mtime', action='store_true', help="Development: cek mtime file statis setiap request dan muat ulang jika berubah.")
+    add_logging_args(parser)
+    add_reaper_args(parser)
+    add_rate_limit_args(parser)
+    parser.add_argument('--auto-check', action='store_true', help="Lewati otomatis giliran pemain yang tidak punya langkah legal.")
+    return parser.parse_args()
+
+def main():
+    if not hasattr(socket, 'SO_REUSEPORT') or not hasattr(os, 'fork'):
+        raise SystemExit("Mode pre-fork membutuhkan os.fork dan SO_REUSEPORT (Linux/BSD).")
+    args = parse_args()
+    setup_logging_from_args(args)
+    signal.signal(signal.SIGTERM, _raise_interrupt) # Worker ikut dihentikan saat master di-terminate
+    setup_dictionary() # Dimuat sebelum fork; halaman mmap dictionary.lex dibagi semua worker lewat page cache
+    setup_static_cache(args.check_mtime)
+    FRAGMENT_INDEX.warm() # Dibangun sekali di master, dibagi ke worker (copy-on-write) tanpa warmup per proses
+    gc.freeze() # Objek yang sudah ada tidak disentuh GC siklik di worker, agar halamannya tidak ikut tersalin
+    workers = {spawn_worker(i, args): i for i in range(args.workers)}
+    try:
+        while workers:
+            pid, status = os.wait()
+            index = workers.pop(pid, None)
+            if index is None: continue
+            # Game di shard ini hilang bersama prosesnya, tapi shard tetap harus dilayani.
+            logging.warning(f"Worker {index} (pid {pid}) berhenti dengan status {status}. Menjalankan ulang.")
+            workers[spawn_worker(index, args)] = index
+    except KeyboardInterrupt:
+        logging.info("Server pre-fork diminta berhenti.")
+        for pid in workers:
+            try:
+                os.kill(pid, signal.SIGTERM)
+            except ProcessLookupError:
+                pass
+
+if __name__=="__main__":
+    main()
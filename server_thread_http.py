@@ -1,16 +1,129 @@
-# server.py (Tidak ada perubahan)
+# server.py (Mode eksekusi: thread-per-koneksi atau worker pool, HTTP/1.1 keep-alive)
+import argparse
+import json
+import queue
+import select
 import socket
 import threading
+import time
 import logging
 import os
 
-from http import HttpServer
+from http import HttpServer, FileResponse, StreamResponse
+from request_reader import RequestReader, RequestError
+from static_cache import StaticCache
+from models import GameRegistry, FRAGMENTS
+from utils import FragmentIndex
+from lexicon import Lexicon
+from server_log import log_event, add_logging_args, setup_logging_from_args
+import profiler
+from reaper import add_reaper_args, start_reaper
+from rate_limit import add_rate_limit_args, configure_rate_limit
 
 logging.basicConfig(level=logging.INFO, format='[%(levelname)s] (%(threadName)-10s) %(message)s')
 
-GAMES = {}
-GAMES_LOCK = threading.Lock()
-DICTIONARY = set()
+GAMES = GameRegistry()
+GAMES_LOCK = GAMES.lock # Lock registry (lookup saja); tiap game punya game.lock sendiri
+DICTIONARY = Lexicon() # Kamus read-only (lexicon.py); dimuat di tempat oleh setup_dictionary
+FRAGMENT_INDEX = FragmentIndex() # Potongan yang bisa disambung ke setiap kartu meja; dibangun di setup_dictionary
+STATIC_CACHE = StaticCache(check_mtime=False) # --check-mtime saat development agar perubahan file langsung terlihat
+
+# --- Konfigurasi Server ---
+SERVER_PORT = 8000
+EXECUTION_MODE = 'pool'     # 'pool' (worker thread tetap) atau 'thread' (satu thread per koneksi)
+WORKER_POOL_SIZE = 32       # Jumlah worker thread pada mode 'pool'
+ACCEPT_QUEUE_SIZE = 256     # Koneksi yang boleh mengantri sebelum ditolak dengan 503
+LISTEN_BACKLOG = 128        # Backlog listen() di level kernel
+POOL_STATS_INTERVAL = 60    # Detik antar log statistik pool (0 = mati)
+SHED_RETRY_AFTER = 1        # Nilai header Retry-After untuk respons 503
+KEEP_ALIVE_TIMEOUT = 5      # Detik koneksi persisten boleh idle sebelum ditutup
+MAX_KEEP_ALIVE_REQUESTS = 100 # Maksimal request per koneksi TCP
+IDLE_CHECK_INTERVAL = 0.25  # Detik antar pemeriksaan antrian selama koneksi keep-alive idle (mode pool)
+RECV_SIZE = 4096
+STREAM_SEND_TIMEOUT = 60    # Detik maksimal satu send pada stream SSE sebelum client dianggap mati
+
+def send_responses(connection, responses):
+    """Mengirim respons berurutan; respons bytes digabung, FileResponse dikirim via sendfile,
+    StreamResponse (SSE, WebSocket) mengambil alih koneksi sampai selesai."""
+    pending = []
+    try:
+        for response in responses:
+            if isinstance(response, StreamResponse):
+                if pending: connection.sendall(b''.join(pending)); pending = []
+                connection.settimeout(STREAM_SEND_TIMEOUT)
+                response.run_blocking(connection)
+            elif isinstance(response, FileResponse):
+                if pending: connection.sendall(b''.join(pending)); pending = []
+                response.send(connection)
+            else:
+                pending.append(response)
+        if pending: connection.sendall(b''.join(pending))
+    finally:
+        for response in responses:
+            if isinstance(response, StreamResponse): response.close()
+
+def wait_for_next_request(connection, keep_alive_allowed):
+    """Menunggu request berikutnya pada koneksi keep-alive yang idle, dalam potongan pendek.
+    False jika KEEP_ALIVE_TIMEOUT habis atau keep_alive_allowed() menjadi False (ada koneksi lain yang mengantri)."""
+    deadline = time.monotonic() + KEEP_ALIVE_TIMEOUT
+    while True:
+        remaining = deadline - time.monotonic()
+        if remaining <= 0: return False
+        readable, _, _ = select.select([connection], [], [], min(IDLE_CHECK_INTERVAL, remaining))
+        if readable: return True
+        if not keep_alive_allowed(): return False
+
+def handle_connection(connection, address, http_handler, keep_alive_allowed=None):
+    """Melayani satu koneksi client (keep-alive + pipelining) sampai ditutup.
+    keep_alive_allowed: callable opsional; jika mengembalikan False, koneksi ditutup setelah respons berikutnya,
+    atau langsung saat koneksi sedang idle di antara request."""
+    reader = RequestReader()
+    recv_buffer = bytearray(RECV_SIZE) # Dipakai ulang untuk setiap recv_into
+    recv_view = memoryview(recv_buffer)
+    served = 0
+    http_handler.metrics.connection_opened()
+    try:
+        connection.settimeout(KEEP_ALIVE_TIMEOUT)
+        while True:
+            # Request yang di-pipeline dijawab berurutan lalu dikirim sekaligus.
+            responses, keep_open = [], True
+            try:
+                while keep_open:
+                    request = reader.next_request()
+                    if request is None: break
+                    request.remote_addr = address
+                    served += 1
+                    keep_open = request.keep_alive and served < MAX_KEEP_ALIVE_REQUESTS and (keep_alive_allowed is None or keep_alive_allowed())
+                    keep_alive = (KEEP_ALIVE_TIMEOUT, MAX_KEEP_ALIVE_REQUESTS - served) if keep_open else None
+                    response = http_handler.proses(request, keep_alive)
+                    responses.append(response)
+                    if isinstance(response, StreamResponse):
+                        response.buffered = bytes(reader.buffer) # Mis. frame WebSocket yang dikirim langsung setelah handshake
+                        keep_open = False
+            except RequestError as e:
+                log_event('connection', 'invalid_request', logging.WARNING, address=address, status=e.status_code, error=e)
+                responses.append(http_handler.json_response(e.status_code, e.status_text, {"success": False, "message": str(e)}))
+                keep_open = False
+            if responses: send_responses(connection, responses)
+            if not keep_open: return
+            if reader.expect_continue:
+                reader.expect_continue = False
+                connection.sendall(b'HTTP/1.1 100 Continue\r\n\r\n')
+            # Idle di antara request: worker dilepas begitu ada koneksi lain yang menunggu, tanpa menunggu timeout penuh
+            if served and reader.is_idle() and keep_alive_allowed is not None and not wait_for_next_request(connection, keep_alive_allowed):
+                return
+            try:
+                received = connection.recv_into(recv_buffer)
+            except (socket.timeout, ConnectionError):
+                return # Idle terlalu lama atau client memutus koneksi
+            if not received: return
+            reader.feed(recv_view[:received])
+    except Exception as e:
+        logging.error(f"Error pada koneksi client {address}: {e}", exc_info=True)
+    finally:
+        connection.close()
+        http_handler.metrics.connection_closed()
+        log_event('connection', 'closed', address=address, requests=served)
 
 class ProcessTheClient(threading.Thread):
     def __init__(self, connection, address, http_handler):
@@ -21,58 +134,202 @@ class ProcessTheClient(threading.Thread):
         self.setName(f"Client-{address[0]}:{address[1]}")
 
     def run(self):
+        handle_connection(self.connection, self.address, self.http_handler)
+
+class WorkerPool:
+    """Sekumpulan worker thread tetap yang mengambil koneksi dari antrian terbatas."""
+    def __init__(self, http_handler, size=WORKER_POOL_SIZE, queue_size=ACCEPT_QUEUE_SIZE):
+        self.http_handler = http_handler
+        self.size = size
+        self.queue = queue.Queue(maxsize=queue_size)
+        self.workers = []
+        self.stats_lock = threading.Lock()
+        self.busy_workers = 0
+        self.handled = 0
+        self.rejected = 0
+
+    def start(self):
+        for i in range(self.size):
+            worker = threading.Thread(target=self._worker_loop, name=f"Worker-{i}", daemon=True)
+            worker.start()
+            self.workers.append(worker)
+        logging.info(f"Worker pool dimulai: {self.size} worker, antrian maks {self.queue.maxsize}.")
+
+    def submit(self, connection, address):
+        """Memasukkan koneksi ke antrian. Mengembalikan False jika antrian penuh."""
         try:
-            request_text = self.connection.recv(4096).decode('utf-8')
-            if not request_text: return
-            response_bytes = self.http_handler.proses(request_text)
-            self.connection.sendall(response_bytes)
-        except Exception as e:
-            logging.error(f"Error pada thread client {self.address}: {e}", exc_info=True)
+            self.queue.put_nowait((connection, address))
+            return True
+        except queue.Full:
+            with self.stats_lock: self.rejected += 1
+            return False
+
+    def reject(self, connection, address):
+        """Load shedding: balas 503 dengan Retry-After lalu tutup koneksi."""
+        log_event('pool', 'connection_shed', logging.WARNING, address=address, queue_depth=self.queue.qsize())
+        try:
+            connection.settimeout(1.0)
+            body = json.dumps({"success": False, "message": "Server sedang sibuk, coba lagi."})
+            connection.sendall(self.http_handler.build_response(503, "Service Unavailable", {"Content-Type": "application/json", "Retry-After": SHED_RETRY_AFTER}, body))
+        except OSError:
+            pass
         finally:
-            self.connection.close()
-            logging.info(f"Koneksi dengan {self.address} ditutup.")
+            connection.close()
+
+    def shutdown(self):
+        for _ in self.workers:
+            self.queue.put((None, None))
+        for worker in self.workers:
+            worker.join(timeout=5)
+
+    def _worker_loop(self):
+        while True:
+            connection, address = self.queue.get()
+            if connection is None: break
+            with self.stats_lock: self.busy_workers += 1
+            try:
+                # Keep-alive hanya dipertahankan selama tidak ada koneksi lain yang mengantri.
+                handle_connection(connection, address, self.http_handler, self.queue.empty)
+            finally:
+                with self.stats_lock:
+                    self.busy_workers -= 1
+                    self.handled += 1
+
+    def stats(self):
+        with self.stats_lock:
+            busy, handled, rejected = self.busy_workers, self.handled, self.rejected
+        return {
+            "mode": "pool",
+            "workers": self.size,
+            "busy_workers": busy,
+            "worker_utilisation": round(busy / self.size, 3) if self.size else 0.0,
+            "queue_depth": self.queue.qsize(),
+            "queue_capacity": self.queue.maxsize,
+            "handled": handled,
+            "rejected": rejected,
+        }
 
 class Server(threading.Thread):
-    def __init__(self, port):
+    def __init__(self, port, mode=EXECUTION_MODE, pool_size=WORKER_POOL_SIZE, queue_size=ACCEPT_QUEUE_SIZE, backlog=LISTEN_BACKLOG, host='0.0.0.0', http_handler=None, reuse_port=False):
+        if mode not in ('pool', 'thread'):
+            raise ValueError(f"Mode eksekusi tidak dikenal: {mode}")
+        self.host = host
         self.port = port
+        self.mode = mode
+        self.backlog = backlog
         self.my_socket = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
         self.my_socket.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
-        self.http_handler = HttpServer(GAMES, GAMES_LOCK, DICTIONARY)
+        if reuse_port:
+            # Beberapa proses worker bind ke port yang sama; kernel membagi koneksi masuk.
+            self.my_socket.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEPORT, 1)
+        self.http_handler = http_handler or HttpServer(GAMES, GAMES_LOCK, DICTIONARY, STATIC_CACHE, FRAGMENT_INDEX)
+        self.pool = WorkerPool(self.http_handler, pool_size, queue_size) if mode == 'pool' else None
+        if self.pool:
+            # Long-poll dan stream (SSE/WebSocket) memblok worker, masing-masing dengan batas sendiri agar stream yang
+            # hidup selama game tidak menghabiskan slot long-poll; sisakan setidaknya seperempat pool untuk request biasa.
+            # Client yang ditolak stream (503) beralih ke long-poll.
+            self.http_handler.blocking_slots = threading.BoundedSemaphore(max(1, pool_size // 2))
+            self.http_handler.stream_slots = threading.BoundedSemaphore(max(1, pool_size // 4))
+            # setdefault: pada mode pre-fork handler dipakai bersama listener internal; yang dilaporkan pool publik.
+            self.http_handler.metrics.gauges.setdefault("sekata_accept_queue_depth", ("Koneksi yang menunggu worker.", self.pool.queue.qsize))
+            self.http_handler.metrics.gauges.setdefault("sekata_busy_workers", ("Worker thread yang sedang melayani koneksi.", lambda: self.pool.busy_workers))
+            self.http_handler.metrics.counters.setdefault("sekata_shed_connections_total", ("Koneksi yang ditolak dengan 503 karena antrian penuh.", lambda: self.pool.rejected))
+        self.http_handler.stats_provider = self.stats
         threading.Thread.__init__(self)
         self.setName("ServerThread")
 
+    def stats(self):
+        if self.pool: return self.pool.stats()
+        return {"mode": "thread", "active_threads": threading.active_count()}
+
+    def _log_stats_loop(self):
+        while True:
+            time.sleep(POOL_STATS_INTERVAL)
+            logging.info(f"Statistik server: {self.stats()}")
+
     def run(self):
-        self.my_socket.bind(('0.0.0.0', self.port))
-        self.my_socket.listen(10)
-        logging.info(f"Server socket berjalan di http://localhost:{self.port}/")
+        self.my_socket.bind((self.host, self.port))
+        self.my_socket.listen(self.backlog)
+        if self.pool: self.pool.start()
+        if POOL_STATS_INTERVAL > 0:
+            threading.Thread(target=self._log_stats_loop, name="StatsLogger", daemon=True).start()
+        logging.info(f"Server socket berjalan di http://localhost:{self.port}/ (mode: {self.mode}, backlog: {self.backlog})")
         try:
             while True:
                 connection, client_address = self.my_socket.accept()
-                logging.info(f"Koneksi diterima dari {client_address}")
-                clt = ProcessTheClient(connection, client_address, self.http_handler)
-                clt.start()
+                log_event('connection', 'accepted', address=client_address)
+                if self.pool:
+                    if not self.pool.submit(connection, client_address):
+                        self.pool.reject(connection, client_address)
+                else:
+                    clt = ProcessTheClient(connection, client_address, self.http_handler)
+                    clt.start()
         except KeyboardInterrupt:
             logging.info("Server diminta berhenti.")
         finally:
             self.my_socket.close()
+            if self.pool: self.pool.shutdown()
             logging.info("Socket server ditutup.")
 
 def setup_dictionary():
+    """Memetakan static/dictionary.lex (hasil `python lexicon.py`) lewat mmap; waktunya tidak bergantung pada ukuran kamus.
+    Jika file terkompilasi belum ada atau lebih lama dari dictionary.txt, kamus teks dikompilasi di memori."""
+    static_dir = os.path.join(os.path.dirname(__file__), 'static')
+    text_path, compiled_path = os.path.join(static_dir, 'dictionary.txt'), os.path.join(static_dir, 'dictionary.lex')
     try:
-        dictionary_path = os.path.join(os.path.dirname(__file__), 'static', 'dictionary.txt')
-        with open(dictionary_path, 'r', encoding='utf-8') as f:
-            DICTIONARY.update(line.strip().upper() for line in f)
-        logging.info(f"Kamus berhasil dimuat: {len(DICTIONARY)} kata.")
+        if os.path.exists(compiled_path) and (not os.path.exists(text_path) or os.path.getmtime(compiled_path) >= os.path.getmtime(text_path)):
+            DICTIONARY.load(compiled_path)
+            logging.info(f"Kamus terkompilasi dimuat (mmap): {len(DICTIONARY)} kata.")
+        else:
+            if os.path.exists(compiled_path): logging.warning("dictionary.lex lebih lama dari dictionary.txt, kompilasi ulang dengan 'python lexicon.py'.")
+            with open(text_path, 'r', encoding='utf-8') as f:
+                DICTIONARY.load_words(f)
+            logging.info(f"Kamus berhasil dimuat: {len(DICTIONARY)} kata.")
     except FileNotFoundError:
         logging.warning(f"File dictionary.txt tidak ditemukan. Menggunakan kamus fallback.")
-        DICTIONARY.update({"KULIT", "RUMAH", "KOTA", "MATA", "HATI", "BUKU", "PENA", "PINTAR", "AKAN"})
+        DICTIONARY.load_words({"KULIT", "RUMAH", "KOTA", "MATA", "HATI", "BUKU", "PENA", "PINTAR", "AKAN"})
+    FRAGMENT_INDEX.rebuild(DICTIONARY, FRAGMENTS) # Entri per kartu meja dihitung saat pertama dibutuhkan
+
+def start_index_warmup():
+    """Mengisi FRAGMENT_INDEX di thread latar, agar giliran pertama untuk tiap kartu meja tidak menunggu.
+    Untuk server satu proses; mode pre-fork membangunnya di master sebelum fork."""
+    threading.Thread(target=FRAGMENT_INDEX.warm, name="IndexWarmup", daemon=True).start()
+
+def setup_static_cache(check_mtime=False):
+    """Memuat index.html dan isi folder static ke cache (termasuk varian gzip) saat startup."""
+    STATIC_CACHE.check_mtime = check_mtime
+    base_dir = os.path.dirname(os.path.abspath(__file__))
+    STATIC_CACHE.preload([os.path.join(base_dir, 'index.html'), os.path.join(base_dir, 'static')], HttpServer.MIME_TYPES)
+    logging.info(f"Cache statis siap: {STATIC_CACHE.stats()['cached_assets']} file.")
+
+def parse_args():
+    parser = argparse.ArgumentParser(description="Server HTTP Sekata berbasis socket.")
+    parser.add_argument('--port', type=int, default=SERVER_PORT)
+    parser.add_argument('--mode', choices=['pool', 'thread'], default=EXECUTION_MODE)
+    parser.add_argument('--workers', type=int, default=WORKER_POOL_SIZE, help="Jumlah worker thread (mode pool).")
+    parser.add_argument('--queue-size', type=int, default=ACCEPT_QUEUE_SIZE, help="Kapasitas antrian koneksi (mode pool).")
+    parser.add_argument('--backlog', type=int, default=LISTEN_BACKLOG, help="Backlog listen() socket.")
+    parser.add_argument('--check-mtime', action='store_true', help="Development: cek mtime file statis setiap request dan muat ulang jika berubah.")
+    add_logging_args(parser)
+    add_reaper_args(parser)
+    add_rate_limit_args(parser)
+    parser.add_argument('--auto-check', action='store_true', help="Lewati otomatis giliran pemain yang tidak punya langkah legal.")
+    return parser.parse_args()
 
 def main():
+    args = parse_args()
+    setup_logging_from_args(args)
     setup_dictionary()
-    server = Server(8000)
+    setup_static_cache(args.check_mtime)
+    server = Server(args.port, mode=args.mode, pool_size=args.workers, queue_size=args.queue_size, backlog=args.backlog)
+    profiler.install_signal_handler(server.http_handler)
+    start_reaper(GAMES, args, server.http_handler)
+    configure_rate_limit(server.http_handler, args)
+    server.http_handler.auto_check = args.auto_check
+    start_index_warmup()
     server.start()
     server.join()
     logging.info("Server dihentikan sepenuhnya.")
 
 if __name__=="__main__":
-    main()
\ No newline at end of file
+    main()
@@ -23,8 +23,10 @@ export const startGame = async (gameId, playerId) => {
   return response.json();
 };
 
-export const getGameStatus = async (gameId, playerId) => {
-  const response = await fetch(`/game_status/${gameId}?player_id=${playerId}`);
+// Long-poll: jika `since` diisi, server menahan request sampai version game > since (maks `wait` detik).
+export const getGameStatus = async (gameId, playerId, since = null, wait = 10) => {
+  const longPoll = since === null ? "" : `&since=${since}&wait=${wait}`;
+  const response = await fetch(`/game_status/${gameId}?player_id=${playerId}${longPoll}`);
   return response.json();
 };
 
@@ -22,39 +22,94 @@ function resetTurnState() {
   ui.updateGameUI(gameData, turnState, handleCardClick);
 }
 
-// --- Logika Polling ---
-let pollInterval = null;
-const startPolling = () => {
-  if (pollInterval) clearInterval(pollInterval);
-  const poll = async () => {
+// --- Logika Polling (long-poll) ---
+let pollSession = 0;
+const sleep = (ms) => new Promise((resolve) => setTimeout(resolve, ms));
+
+const applyGameStatus = (data) => {
+  const playerId = state.getCurrentPlayerId();
+  const oldTurn = state.getGameData()?.current_turn;
+  state.setGameData(data);
+  const newTurn = data.current_turn;
+
+  if (oldTurn !== newTurn && newTurn === playerId) {
+    resetTurnState();
+  } else {
+    if (newTurn !== playerId || !turnState.previewWord) {
+      turnState.previewWord = data.card_on_table;
+      ui.updateWordPreview(turnState.previewWord);
+    }
+  }
+
+  ui.updateGameUI(data, turnState, handleCardClick);
+};
+
+// Respons delta hanya berisi field yang berubah; players hanya memuat entri pemain yang berubah.
+const mergeDelta = (current, delta) => ({
+  ...current,
+  ...delta,
+  players: { ...(current?.players || {}), ...(delta.players || {}) },
+});
+
+const startPolling = async () => {
+  const session = ++pollSession; // Memulai polling baru menghentikan loop sebelumnya
+  let version = -1;
+  while (session === pollSession) {
     const gameId = state.getCurrentGameId();
     const playerId = state.getCurrentPlayerId();
     if (!gameId || !playerId) return;
 
-    const response = await api.getGameStatus(gameId, playerId);
-    if (response.success) {
-      const oldTurn = state.getGameData()?.current_turn;
-      state.setGameData(response.data);
-      const newTurn = response.data.current_turn;
-
-      if (oldTurn !== newTurn && newTurn === playerId) {
-        resetTurnState();
-      } else {
-        if (newTurn !== playerId || !turnState.previewWord) {
-          turnState.previewWord = response.data.card_on_table;
-          ui.updateWordPreview(turnState.previewWord);
-        }
-      }
-      
-      ui.updateGameUI(response.data, turnState, handleCardClick);
-      if (response.data.winner) clearInterval(pollInterval);
-    } else {
+    const startedAt = Date.now();
+    let response;
+    try {
+      response = await api.getGameStatus(gameId, playerId, version);
+    } catch (err) {
+      response = { success: false, message: err.message };
+    }
+    if (session !== pollSession) return;
+    if (!response.success) {
       console.error("Polling failed:", response.message);
-      clearInterval(pollInterval);
+      return;
+    }
+
+    const changed = response.data.version !== version;
+    const data = response.delta ? mergeDelta(state.getGameData(), response.data) : response.data;
+    if (changed) {
+      version = data.version;
+      applyGameStatus(data);
+    }
+    if (data.winner) return;
+    // Server tanpa dukungan long-poll menjawab seketika: kembali ke jeda 2 detik.
+    if (!changed && Date.now() - startedAt < 1000) await sleep(2000);
+  }
+};
+
+// --- Server-Sent Events (fallback ke long-poll) ---
+let eventSource = null;
+
+const startUpdates = () => {
+  if (eventSource) eventSource.close();
+  eventSource = null;
+  const gameId = state.getCurrentGameId();
+  const playerId = state.getCurrentPlayerId();
+  if (!window.EventSource || !gameId || !playerId) return startPolling();
+
+  pollSession++; // Menghentikan loop long-poll yang mungkin masih berjalan
+  const source = (eventSource = new EventSource(
+    `/events/${encodeURIComponent(gameId)}?player_id=${encodeURIComponent(playerId)}`
+  ));
+  source.addEventListener("state", (e) => {
+    const data = JSON.parse(e.data);
+    applyGameStatus(data);
+    if (data.winner) source.close();
+  });
+  source.onerror = () => {
+    // EventSource menyambung ulang sendiri; jika ditutup (mis. 503/404), beralih ke long-poll.
+    if (source.readyState === EventSource.CLOSED && eventSource === source) {
+      eventSource = null;
+      startPolling();
     }
   };
-  pollInterval = setInterval(poll, 2000);
-  poll();
 };
 
 // --- Event Handlers ---
@@ -115,7 +170,7 @@ document.addEventListener("DOMContentLoaded", () => {
     const response = await api.createGame(playerId);
     if (response.success) {
       state.setCurrentGameId(response.game_id);
-      startPolling();
+      startUpdates();
     } else { ui.showPopup(response.message, 'error'); }
   });
 
@@ -127,7 +182,7 @@ document.addEventListener("DOMContentLoaded", () => {
     state.setCurrentGameId(gameId);
     const response = await api.joinGame(gameId, playerId);
     if (response.success) {
-      startPolling();
+      startUpdates();
     } else { ui.showPopup(response.message, 'error'); }
   });
   
@@ -0,0 +1,155 @@
+# static_cache.py (Cache aset statis di memori dengan ETag dan varian gzip)
+import gzip
+import hashlib
+import logging
+import os
+import threading
+from email.utils import formatdate, parsedate_to_datetime
+
+GZIP_MIN_SIZE = 256 # File lebih kecil dari ini tidak dikompres
+GZIP_MAX_SIZE = 4 * 1024 * 1024 # File lebih besar tidak diprakompresi (disajikan apa adanya)
+SENDFILE_MIN_SIZE = 8 * 1024 # File sebesar ini atau lebih tidak disimpan di memori; body dikirim via sendfile
+HASH_CHUNK_SIZE = 64 * 1024
+COMPRESSIBLE_TYPES = ("text/", "application/javascript", "application/json")
+
+class StaticAsset:
+    """Metadata satu file statis. body berisi isi file hanya untuk file kecil; file besar dibaca dari disk saat dikirim."""
+    def __init__(self, file_path, content_type, mtime, size, body=None):
+        self.file_path = file_path
+        self.content_type = content_type
+        self.body = body
+        self.size = size
+        self.mtime = mtime
+        self.last_modified = formatdate(mtime, usegmt=True)
+        self.gzip_body = None
+        self.gzip_etag = None
+        if body is not None:
+            self.etag = '"' + hashlib.sha1(body).hexdigest()[:20] + '"'
+        else:
+            self.etag = '"' + self._hash_file() + '"'
+        if GZIP_MIN_SIZE <= size <= GZIP_MAX_SIZE and content_type.startswith(COMPRESSIBLE_TYPES):
+            raw = body
+            if raw is None:
+                with open(file_path, 'rb') as f: raw = f.read()
+            compressed = gzip.compress(raw, compresslevel=9, mtime=0)
+            if len(compressed) < size:
+                self.gzip_body = compressed
+                self.gzip_etag = self.etag[:-1] + '-gz"'
+
+    def _hash_file(self):
+        digest = hashlib.sha1()
+        with open(self.file_path, 'rb') as f:
+            for chunk in iter(lambda: f.read(HASH_CHUNK_SIZE), b''):
+                digest.update(chunk)
+        return digest.hexdigest()[:20]
+
+    def is_not_modified(self, request_headers, etag):
+        """Validasi kondisional: If-None-Match diutamakan, lalu If-Modified-Since."""
+        if request_headers.get('if-none-match') is not None:
+            return etag_matches(request_headers, etag)
+        if_modified_since = request_headers.get('if-modified-since')
+        if if_modified_since:
+            try:
+                return int(self.mtime) <= parsedate_to_datetime(if_modified_since).timestamp()
+            except (TypeError, ValueError):
+                return False
+        return False
+
+    def byte_range(self, request_headers):
+        """Menerjemahkan header Range (satu rentang 'bytes=').
+        Mengembalikan None (kirim utuh), (start, end) inklusif, atau 'unsatisfiable'."""
+        range_header = request_headers.get('range')
+        if not range_header or not range_header.startswith('bytes=') or ',' in range_header: return None
+        if_range = request_headers.get('if-range')
+        if if_range and if_range.strip() not in (self.etag, self.last_modified): return None
+        start_str, _, end_str = range_header[len('bytes='):].strip().partition('-')
+        try:
+            if not start_str: # Suffix range: N byte terakhir
+                length = int(end_str)
+                if length <= 0: return 'unsatisfiable'
+                return max(0, self.size - length), self.size - 1
+            start = int(start_str)
+            end = int(end_str) if end_str else self.size - 1
+        except ValueError:
+            return None
+        if start >= self.size or start > end: return 'unsatisfiable'
+        return start, min(end, self.size - 1)
+
+def etag_matches(request_headers, etag):
+    """True jika If-None-Match memuat etag (perbandingan lemah, sesuai RFC 9110)."""
+    if_none_match = request_headers.get('if-none-match')
+    if if_none_match is None: return False
+    tags = [tag.strip() for tag in if_none_match.split(',')]
+    return '*' in tags or etag in tags or ('W/' + etag) in tags
+
+def accepts_gzip(request_headers):
+    """True jika client menerima gzip. Entri 'gzip' eksplisit mengalahkan '*' (misal '*, gzip;q=0' berarti menolak)."""
+    wildcard = None
+    for coding in request_headers.get('accept-encoding', '').split(','):
+        name, _, params = coding.strip().partition(';')
+        name = name.strip().lower()
+        if name == 'gzip': return _quality(params) > 0
+        if name == '*': wildcard = _quality(params) > 0
+    return bool(wildcard)
+
+def _quality(params):
+    """Nilai q dari parameter Accept-Encoding (default 1); q yang tidak valid dianggap 0."""
+    for param in params.split(';'):
+        key, _, value = param.strip().partition('=')
+        if key.strip().lower() != 'q': continue
+        try: return float(value.strip())
+        except ValueError: return 0.0
+    return 1.0
+
+class StaticCache:
+    """Memuat file statis sekali, lalu melayaninya dari memori.
+
+    check_mtime=True (development): mtime dicek setiap akses dan file dimuat ulang jika berubah.
+    """
+    def __init__(self, check_mtime=True):
+        self.check_mtime = check_mtime
+        self.assets = {}
+        self.lock = threading.Lock()
+        self.hits = 0
+        self.loads = 0
+
+    def get(self, file_path, content_type):
+        """Mengembalikan StaticAsset untuk file_path, atau None jika file tidak ada."""
+        asset = self.assets.get(file_path)
+        if asset is not None and not self.check_mtime:
+            self.hits += 1
+            return asset
+        try:
+            mtime = os.stat(file_path).st_mtime
+        except (FileNotFoundError, NotADirectoryError):
+            if asset is not None:
+                with self.lock: self.assets.pop(file_path, None)
+            return None
+        if asset is not None and asset.mtime == mtime:
+            self.hits += 1
+            return asset
+        return self._load(file_path, content_type, mtime)
+
+    def _load(self, file_path, content_type, mtime):
+        if not os.path.isfile(file_path): return None
+        size = os.path.getsize(file_path)
+        body = None
+        if size < SENDFILE_MIN_SIZE:
+            with open(file_path, 'rb') as f: body = f.read()
+        asset = StaticAsset(file_path, content_type, mtime, size, body)
+        with self.lock:
+            self.assets[file_path] = asset
+            self.loads += 1
+        logging.info(f"Aset statis dimuat ke cache: {file_path} ({size} byte, {'memori' if body is not None else 'sendfile'}, gzip: {len(asset.gzip_body) if asset.gzip_body else '-'})")
+        return asset
+
+    def preload(self, paths, mime_types):
+        """Memuat dan mengompres file (atau seluruh isi direktori) lebih awal, misal sebelum fork."""
+        for path in paths:
+            file_paths = [os.path.join(root, name) for root, _, files in os.walk(path) for name in files] if os.path.isdir(path) else [path]
+            for file_path in file_paths:
+                _, ext = os.path.splitext(file_path)
+                self.get(file_path, mime_types.get(ext.lower(), "application/octet-stream"))
+
+    def stats(self):
+        return {"cached_assets": len(self.assets), "hits": self.hits, "loads": self.loads}
@@ -0,0 +1,74 @@
+# tests/test_async_server.py (Server async: route yang mengambil game.lock tidak memblok event loop)
+import asyncio
+import socket
+import threading
+import unittest
+
+from http import HttpServer
+from models import Game, GameRegistry
+from request_reader import HttpRequest
+from server_async_http import AsyncServer
+
+class AsyncLockTest(unittest.TestCase):
+    def setUp(self):
+        self.server = AsyncServer(0, executor_workers=2)
+        self.addCleanup(self.server.executor.shutdown)
+        self.server.http_handler = HttpServer(GameRegistry(), threading.Lock(), set())
+        self.server.http_handler.blocking_waits = False
+        self.server.http_handler.rate_limiter = None
+        self.game = Game('ABC123', 'host')
+        self.server.http_handler.GAMES.add(self.game)
+
+    def hold_game_lock(self):
+        """Thread lain (seperti executor yang menjalankan /hint) memegang game.lock sampai release di-set."""
+        held, release = threading.Event(), threading.Event()
+        def worker():
+            with self.game.lock:
+                held.set()
+                release.wait(5)
+        thread = threading.Thread(target=worker, daemon=True)
+        thread.start()
+        held.wait(5)
+        return release, thread
+
+    def request(self, raw):
+        async def scenario():
+            client_sock, server_sock = socket.socketpair()
+            server_reader, server_writer = await asyncio.open_connection(sock=server_sock)
+            client_reader, client_writer = await asyncio.open_connection(sock=client_sock)
+            handler = asyncio.ensure_future(self.server.handle_client(server_reader, server_writer))
+            release, thread = self.hold_game_lock()
+            client_writer.write(raw)
+            for _ in range(20): await asyncio.sleep(0.005) # Event loop tetap berjalan selama lock dipegang thread lain
+            self.assertFalse(handler.done())
+            release.set()
+            response = await asyncio.wait_for(client_reader.read(), 5)
+            await asyncio.wait_for(handler, 5)
+            client_writer.close()
+            thread.join(5)
+            return response
+        return asyncio.run(scenario())
+
+    def test_game_status_waits_in_executor(self):
+        response = self.request(b'GET /game_status/ABC123?player_id=host HTTP/1.1\r\nConnection: close\r\n\r\n')
+        self.assertTrue(response.startswith(b'HTTP/1.1 200 '))
+        self.assertEqual(self.server.offloaded, 1)
+
+    def test_join_game_waits_in_executor(self):
+        body = b'{"player_id": "tamu"}'
+        response = self.request(b'POST /join_game/ABC123 HTTP/1.1\r\nConnection: close\r\nContent-Length: %d\r\n\r\n%s' % (len(body), body))
+        self.assertTrue(response.startswith(b'HTTP/1.1 200 '))
+        self.assertIn('tamu', self.game.players)
+        self.assertEqual(self.server.offloaded, 1)
+
+    def test_free_lock_stays_on_event_loop(self):
+        async def scenario():
+            parsed = HttpRequest.from_text('GET /game_status/ABC123?player_id=host HTTP/1.1\r\n\r\n')
+            return await self.server._call_locked(self.server._locked_game(parsed), self.server.http_handler.proses, parsed, None)
+        self.assertTrue(asyncio.run(scenario()).startswith(b'HTTP/1.1 200 '))
+        self.assertEqual(self.server.offloaded, 0)
+        self.assertTrue(self.game.lock.acquire(blocking=False)) # Lock sudah dilepas lagi
+        self.game.lock.release()
+
+if __name__ == '__main__':
+    unittest.main()
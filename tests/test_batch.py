@@ -0,0 +1,78 @@
+# tests/test_batch.py (POST /batch: hasil per sub-request, pengelompokan per game, dan penolakan)
+import json
+import threading
+import unittest
+
+from http import HttpServer, MAX_BATCH_REQUESTS
+from models import Game, GameRegistry
+from request_reader import HttpRequest
+
+class BatchTest(unittest.TestCase):
+    def setUp(self):
+        self.server = HttpServer(GameRegistry(), threading.Lock(), set())
+        self.server.rate_limiter = None
+        self.game = Game('ABC123', 'host')
+        self.server.GAMES.add(self.game)
+
+    def batch(self, requests):
+        body = json.dumps({"requests": requests}).encode('utf-8') if not isinstance(requests, bytes) else requests
+        status_code, body = self.server.split_response(self.server.proses(HttpRequest('POST', '/batch', 'HTTP/1.1', {}, body)))
+        return status_code, body
+
+    def test_results_in_order(self):
+        status_code, body = self.batch([
+            {"method": "POST", "path": "/join_game/ABC123", "body": {"player_id": "tamu"}},
+            {"method": "POST", "path": "/start_game/ABC123", "body": {"player_id": "host"}},
+            {"path": "/game_status/ABC123?player_id=tamu"},
+            {"method": "POST", "path": "/start_game/TIDAKADA", "body": {"player_id": "host"}},
+        ])
+        self.assertEqual(status_code, 200)
+        self.assertEqual([result["status"] for result in body["results"]], [200, 200, 200, 404])
+        state = body["results"][2]["body"]["data"]
+        self.assertTrue(state["game_started"])
+        self.assertEqual(state["players"]["tamu"]["hand"], self.game.players["tamu"].hand)
+        self.assertEqual(state["version"], self.game.version)
+
+    def test_groups_consecutive_requests_per_game(self):
+        groups = self.server._batch_groups([{"path": "/game_status/A"}, {"path": "/hint/A?player_id=x"}, {"path": "/create_game"},
+                                            {"path": "/join_game/B"}, {"path": "/game_status/A"}, "bukan dict"])
+        self.assertEqual([(game_id, len(group)) for game_id, group in groups], [('A', 2), (None, 1), ('B', 1), ('A', 1), (None, 1)])
+
+    def test_group_runs_under_game_lock(self):
+        seen = [] # Apakah thread lain bisa mengambil game.lock saat tiap sub-request berjalan
+        def try_lock():
+            if self.game.lock.acquire(blocking=False):
+                self.game.lock.release()
+                seen.append(True)
+            else: seen.append(False)
+        original = self.server.handle_get_request
+        def handle_get_request(path, headers=None):
+            other = threading.Thread(target=try_lock)
+            other.start()
+            other.join()
+            return original(path, headers)
+        self.server.handle_get_request = handle_get_request
+        self.batch([{"path": "/game_status/ABC123"}, {"path": "/game_status/ABC123"}])
+        self.assertEqual(seen, [False, False])
+        try_lock()
+        self.assertEqual(seen[-1], True)
+
+    def test_rejected_sub_requests(self):
+        status_code, body = self.batch([
+            {"path": "/game_status/ABC123?since=0&wait=5"},
+            {"method": "DELETE", "path": "/game_status/ABC123"},
+            {"method": "POST", "path": "/admin/profile"},
+            {"method": "GET"},
+            "bukan dict",
+        ])
+        self.assertEqual(status_code, 200)
+        self.assertEqual([result["status"] for result in body["results"]], [400] * 5)
+
+    def test_invalid_batches(self):
+        self.assertEqual(self.batch(b'{"requests": {}}')[0], 400)
+        self.assertEqual(self.batch(b'bukan json')[0], 400)
+        self.assertEqual(self.batch([{"path": "/game_status/ABC123"}] * (MAX_BATCH_REQUESTS + 1))[0], 413)
+        self.assertEqual(self.batch([])[1], {"success": True, "results": []})
+
+if __name__ == '__main__':
+    unittest.main()
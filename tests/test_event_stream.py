@@ -0,0 +1,94 @@
+# tests/test_event_stream.py (Stream SSE /events: event per version, Last-Event-ID, heartbeat, dan batas slot)
+import json
+import socket
+import threading
+import unittest
+from unittest import mock
+
+from http import HttpServer, EventStream
+from models import Game, GameRegistry
+
+def parse_event(event):
+    fields = dict(line.split(': ', 1) for line in event.decode('utf-8').strip().split('\n'))
+    return int(fields['id']), fields['event'], json.loads(fields['data'])
+
+class EventStreamTest(unittest.TestCase):
+    def setUp(self):
+        self.server = HttpServer(GameRegistry(), threading.Lock(), set())
+        self.server.stream_slots = threading.BoundedSemaphore(1)
+        self.game = Game('ABC123', 'host')
+        self.game.add_player('tamu')
+        self.server.GAMES.add(self.game)
+
+    def open_stream(self, headers=None):
+        stream = self.server.handle_events('/events/ABC123', 'player_id=host', headers or {})
+        self.assertIsInstance(stream, EventStream)
+        self.addCleanup(stream.close)
+        return stream
+
+    def test_one_event_per_version(self):
+        stream = self.open_stream()
+        self.assertIn(b'Content-Type: text/event-stream\r\n', stream.header_bytes)
+        self.assertNotIn(b'Content-Length', stream.header_bytes)
+        version, name, data = parse_event(stream.next_event())
+        self.assertEqual((version, name, data['players']['host']['hand']), (self.game.version, 'state', []))
+        self.assertIsNone(stream.next_event())
+        self.game.start_game()
+        version, _, data = parse_event(stream.next_event())
+        self.assertEqual(version, self.game.version)
+        self.assertEqual(data['players']['host']['hand'], self.game.players['host'].hand)
+        self.assertEqual(data['players']['tamu']['hand'], [])
+
+    def test_last_event_id_resumes(self):
+        stream = self.open_stream({'last-event-id': str(self.game.version)})
+        self.assertIsNone(stream.next_event())
+        self.game.mark_changed()
+        self.assertEqual(parse_event(stream.next_event())[0], self.game.version)
+
+    def test_slots_exhausted_and_released(self):
+        stream = self.open_stream()
+        response = self.server.handle_events('/events/ABC123', 'player_id=tamu', {})
+        self.assertTrue(response.startswith(b'HTTP/1.1 503 '))
+        stream.close()
+        self.open_stream()
+        self.assertTrue(self.server.handle_events('/events/TIDAKADA', '', {}).startswith(b'HTTP/1.1 404 '))
+
+    def test_long_poll_still_blocks_when_streams_are_full(self):
+        self.open_stream()
+        self.assertTrue(self.server.handle_events('/events/ABC123', 'player_id=tamu', {}).startswith(b'HTTP/1.1 503 '))
+        since, results = self.game.version, []
+        poll = threading.Thread(target=lambda: results.append(self.server.handle_game_status('/game_status/ABC123', f'since={since}&wait=5')))
+        poll.start()
+        poll.join(0.2)
+        self.assertTrue(poll.is_alive()) # Ditahan sampai ada perubahan, bukan langsung dijawab
+        self.game.mark_changed()
+        poll.join(5)
+        self.assertEqual(json.loads(results[0].partition(b'\r\n\r\n')[2])['data']['version'], since + 1)
+
+    def test_run_blocking_streams_until_winner(self):
+        stream = self.open_stream()
+        client, server_side = socket.socketpair()
+        self.addCleanup(client.close)
+        self.addCleanup(server_side.close)
+        client.settimeout(5)
+        with mock.patch('http.SSE_HEARTBEAT_INTERVAL', 0.05):
+            thread = threading.Thread(target=stream.run_blocking, args=(server_side,), daemon=True)
+            thread.start()
+            data = b''
+            while EventStream.HEARTBEAT not in data: data += client.recv(65536) # Tidak ada perubahan: heartbeat
+            with self.game.lock:
+                self.game.winner = 'host'
+                self.game.mark_changed()
+            thread.join(5)
+        self.assertFalse(thread.is_alive())
+        server_side.close()
+        while True:
+            chunk = client.recv(65536)
+            if not chunk: break
+            data += chunk
+        events = [event for event in data.partition(b'\r\n\r\n')[2].split(b'\n\n') if event.startswith(b'id: ')]
+        self.assertEqual([parse_event(event + b'\n\n')[2]['winner'] for event in events], [None, 'host'])
+        self.assertTrue(self.server.stream_slots.acquire(blocking=False)) # Slot dikembalikan saat stream selesai
+
+if __name__ == '__main__':
+    unittest.main()
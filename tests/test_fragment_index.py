@@ -0,0 +1,118 @@
+# tests/test_fragment_index.py (Langkah legal per kartu meja, dibandingkan dengan pencarian brute force)
+import itertools
+import unittest
+
+from lexicon import Lexicon
+from models import Game
+from utils import FragmentIndex
+
+FRAGMENTS = ['MA', 'KA', 'N', 'AN', 'I', 'KI', 'BA', 'R']
+WORDS = ['MAKAN', 'MAKANAN', 'KAKI', 'BAKAR', 'IKAN', 'KAN', 'MAIN', 'BAN']
+
+def brute_force(table_card, hand, helpers, words):
+    """Semua (kata, langkah) dengan menyambung satu kartu tangan dan opsional satu helper ke segala posisi."""
+    found = set()
+    for hand_card in set(hand):
+        options = [[('hand', hand_card)]] + [[('hand', hand_card), ('helper', helper)] for helper in set(helpers)]
+        for cards in options:
+            for order in itertools.permutations(cards):
+                for positions in itertools.product(('before', 'after'), repeat=len(order)):
+                    word = table_card
+                    for (_, card), position in zip(order, positions): word = card + word if position == 'before' else word + card
+                    if word in words: found.add((word, tuple((kind, card, position) for (kind, card), position in zip(order, positions))))
+    return found
+
+def as_set(results):
+    return {(result['word'], tuple((move['type'], move['card'], move['position']) for move in result['moves'])) for result in results}
+
+def words_of(results):
+    return {result['word'] for result in results}
+
+class FragmentIndexTest(unittest.TestCase):
+    def setUp(self):
+        self.lexicon = Lexicon.from_words(WORDS)
+        self.index = FragmentIndex(self.lexicon, FRAGMENTS)
+
+    def test_matches_brute_force(self):
+        words = set(WORDS)
+        for table_card in FRAGMENTS:
+            for hand in (['MA', 'N', 'AN'], ['KI', 'BA', 'R', 'I']):
+                expected = brute_force(table_card, hand, ['N', 'AN'], words)
+                actual = as_set(self.index.legal_moves(table_card, hand, ['N', 'AN']))
+                with self.subTest(table_card=table_card, hand=hand):
+                    self.assertEqual({word for word, _ in actual}, {word for word, _ in expected})
+                    # Urutan langkah boleh berbeda dari brute force, tapi setiap langkah harus membentuk kata
+                    self.assertTrue(actual <= expected)
+                    self.assertEqual(self.index.has_legal_move(table_card, hand, ['N', 'AN']), bool(expected))
+
+    def test_hint_order_and_moves(self):
+        results = self.index.legal_moves('KA', ['MA', 'I'], ['N'])
+        self.assertEqual([(result['word'], result['score']) for result in results], [('MAKAN', 5), ('IKAN', 4)])
+        self.assertEqual(results[0]['moves'], [{'type': 'hand', 'card': 'MA', 'position': 'before'},
+                                               {'type': 'helper', 'card': 'N', 'position': 'after'}])
+
+    def test_empty_hand(self):
+        self.assertEqual(self.index.legal_moves('KA', []), [])
+        self.assertEqual(self.index.legal_moves('KA', [], ['N']), [])
+        self.assertFalse(self.index.has_legal_move('KA', [], ['N']))
+
+    def test_unknown_table_card(self):
+        self.assertEqual(self.index.legal_moves('ZZ', ['MA', 'N']), [])
+        self.assertFalse(self.index.has_legal_move('ZZ', ['MA', 'N']))
+
+    def test_helper_alone_is_not_a_move(self):
+        self.assertEqual(self.index.legal_moves('KA', ['R'], ['N']), [])
+        self.assertFalse(self.index.has_legal_move('KA', ['R'], ['N']))
+
+    def test_helpers_for(self):
+        self.assertEqual(self.index.helpers_for('KA', 'before'), ()) # Tidak ada kata potongan+KA di kamus uji
+        self.assertEqual(self.index.helpers_for('KA', 'after'), ('N', 'KI'))
+        self.assertEqual(self.index.helpers_for('ZZ', 'after'), ())
+
+    def test_live_edits_refresh_helpers(self):
+        self.index.warm()
+        self.index.add_words(['MAKA'])
+        self.assertEqual(self.index.helpers_for('KA', 'before'), ('MA',))
+        self.index.remove_words(['MAKA'])
+        self.assertEqual(self.index.helpers_for('KA', 'before'), ())
+
+    def test_set_fragments_and_plain_set(self):
+        index = FragmentIndex(set(WORDS), FRAGMENTS)
+        self.assertEqual(words_of(index.legal_moves('KA', ['KI'])), {'KAKI'})
+        index.set_fragments(['KA', 'K', 'I'])
+        self.assertEqual(index.placements, {}) # Dihitung ulang saat dibutuhkan
+        self.assertEqual(words_of(index.legal_moves('KA', ['K', 'I'], ['I'])), {'KAKI'})
+        self.assertEqual(index.legal_moves('KA', ['N']), []) # N bukan potongan lagi
+
+    def test_give_helper_card(self):
+        game = Game('ABC123', 'host')
+        game.card_on_table = 'KA'
+        self.assertEqual(game.give_helper_card('host', 'after', self.index), 'N')
+        self.assertEqual(game.players['host'].helper_card, 'N')
+        self.assertIsNone(game.give_helper_card('host', 'before', self.index))
+        self.assertIsNone(game.give_helper_card('tamu', 'after', self.index))
+
+    def test_words_absent_and_live_edits(self):
+        self.assertEqual(self.index.legal_moves('KA', ['R']), [])
+        self.index.add_words(['KAR'])
+        self.assertEqual(words_of(self.index.legal_moves('KA', ['R'])), {'KAR'})
+        self.assertIn('KAR', self.lexicon)
+        self.index.remove_words(['KAR', 'TIDAKADA'])
+        self.assertEqual(self.index.legal_moves('KA', ['R']), [])
+        self.assertNotIn('KAR', self.lexicon)
+        self.assertTrue(self.index.has_legal_move('KA', ['N']))
+        self.index.remove_words(['KAN', 'MAKAN', 'IKAN', 'MAKANAN'])
+        self.assertFalse(self.index.has_legal_move('KA', ['N'], ['MA']))
+
+    def test_live_edits_do_not_mutate_loaded_entries(self):
+        by_cards = self.index._placements_for('KA')
+        entries = by_cards[('N',)]
+        snapshot = set(entries)
+        self.index.remove_words(['MAKAN', 'KAN'])
+        self.index.add_words(['KAR'])
+        self.assertEqual(entries, snapshot) # Pembaca yang memegang referensi lama tetap melihat data utuh
+        self.assertNotIn(('R',), by_cards)
+        self.assertIn(('R',), self.index._placements_for('KA'))
+
+if __name__ == '__main__':
+    unittest.main()
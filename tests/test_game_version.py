@@ -0,0 +1,54 @@
+# tests/test_game_version.py (Version game naik tepat sekali per giliran, setelah giliran lengkap diterapkan)
+import json
+import threading
+import unittest
+from array import array
+
+from http import HttpServer
+from models import Game, GameRegistry, card_ids
+
+class GameVersionTest(unittest.TestCase):
+    def setUp(self):
+        self.server = HttpServer(GameRegistry(), threading.Lock(), {'MAKAN'})
+        self.game = Game('ABC123', 'host')
+        self.game.add_player('tamu')
+        ok, _ = self.game.start_game()
+        self.assertTrue(ok)
+        self.server.GAMES.add(self.game)
+        self.game.current_turn_index = self.game.player_order.index('host')
+        self.game.card_on_table = 'KA'
+        self.game.players['host'].cards = array('B', card_ids(['MA', 'BA']))
+        self.game.helper_card_ids = array('B', card_ids(['N']))
+        self.game.mark_changed()
+        self.seen = [] # (version, current_turn, used_helper_cards) yang dilihat listener
+        self.game.add_listener(lambda game: self.seen.append((game.version, game.get_current_player_id(), game.used_helper_cards)))
+
+    def submit(self, moves):
+        response = self.server.handle_submit_turn('/submit_turn/ABC123', json.dumps({"player_id": "host", "moves": moves}))
+        return self.server.split_response(response)
+
+    def test_submit_with_helper_bumps_version_once(self):
+        since = self.game.version
+        status, body = self.submit([{"type": "hand", "card": "MA", "position": "before"}, {"type": "helper", "card": "N", "position": "after"}])
+        self.assertEqual((status, body["success"]), (200, True))
+        self.assertEqual(self.game.version, since + 1)
+        self.assertEqual(self.seen, [(since + 1, 'tamu', ['N'])]) # Listener hanya melihat state setelah giliran lengkap
+        delta = json.loads(self.game.serialized_delta_for_player('tamu', since))
+        self.assertEqual(delta["used_helper_cards"], ['N'])
+        self.assertEqual(delta["current_turn"], 'tamu')
+
+    def test_rejected_submit_does_not_bump_version(self):
+        since = self.game.version
+        status, _ = self.submit([{"type": "hand", "card": "BA", "position": "before"}, {"type": "helper", "card": "N", "position": "after"}])
+        self.assertEqual(status, 400)
+        self.assertEqual((self.game.version, self.seen), (since, []))
+
+    def test_all_checked_reshuffle_bumps_version_once(self):
+        since = self.game.version
+        self.game.next_turn(action_was_check=True)
+        self.game.next_turn(action_was_check=True) # Semua pemain check: kartu meja dikocok ulang
+        self.assertEqual(self.game.version, since + 2)
+        self.assertEqual([version for version, _, _ in self.seen], [since + 1, since + 2])
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,65 @@
+# tests/test_keep_alive.py (handle_connection: pipelining, dan pelepasan worker hanya saat koneksi benar-benar idle)
+import socket
+import threading
+import time
+import unittest
+from unittest import mock
+
+import server_thread_http
+from http import HttpServer
+from models import GameRegistry
+
+CREATE = b'POST /create_game HTTP/1.1\r\nContent-Length: 19\r\n\r\n{"player_id": "x"}\n'
+
+class KeepAliveTest(unittest.TestCase):
+    def setUp(self):
+        self.server = HttpServer(GameRegistry(), threading.Lock(), set())
+        self.server.rate_limiter = None
+        self.client, server_side = socket.socketpair()
+        self.client.settimeout(5)
+        self.addCleanup(self.client.close)
+        self.queue_empty = True # keep_alive_allowed: False seolah ada koneksi lain yang mengantri
+        patcher = mock.patch.object(server_thread_http, 'IDLE_CHECK_INTERVAL', 0.02)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        self.thread = threading.Thread(target=server_thread_http.handle_connection, args=(server_side, ('127.0.0.1', 1), self.server, lambda: self.queue_empty), daemon=True)
+        self.thread.start()
+
+    def read_until(self, marker, count=1):
+        data = b''
+        while data.count(marker) < count:
+            chunk = self.client.recv(65536)
+            if not chunk: break
+            data += chunk
+        return data
+
+    def test_pipelined_requests_answered_in_order(self):
+        self.client.sendall(CREATE + b'GET /nope HTTP/1.1\r\n\r\n')
+        data = self.read_until(b'HTTP/1.1 404 ')
+        self.assertLess(data.index(b'HTTP/1.1 200 '), data.index(b'HTTP/1.1 404 '))
+        self.assertIn(b'Connection: keep-alive', data)
+
+    def test_idle_connection_released_when_others_queue(self):
+        self.client.sendall(CREATE)
+        self.read_until(b'"game_id"')
+        self.queue_empty = False
+        self.thread.join(2)
+        self.assertFalse(self.thread.is_alive())
+        self.assertEqual(self.client.recv(1), b'')
+
+    def test_pending_body_is_not_dropped(self):
+        self.client.sendall(CREATE)
+        self.read_until(b'"game_id"')
+        self.client.sendall(CREATE.replace(b'\r\n\r\n', b'\r\nExpect: 100-continue\r\n\r\n').partition(b'\r\n\r\n')[0] + b'\r\n\r\n')
+        self.assertIn(b'100 Continue', self.read_until(b'\r\n\r\n'))
+        self.queue_empty = False # Ada yang mengantri saat client sedang mengirim body
+        time.sleep(0.1)
+        self.client.sendall(CREATE.partition(b'\r\n\r\n')[2])
+        response = self.read_until(b'"game_id"')
+        self.assertIn(b'HTTP/1.1 200 ', response)
+        self.assertIn(b'Connection: close', response)
+        self.thread.join(2)
+        self.assertFalse(self.thread.is_alive())
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,78 @@
+# tests/test_lexicon.py (Kamus terkompilasi: lookup, query awalan/akhiran, dan overlay perubahan)
+import os
+import tempfile
+import unittest
+
+from lexicon import Lexicon, compile_file, compile_words
+
+WORDS = ['makan', 'makanan', 'main', 'KAKI', 'ikan', 'bakar', 'akan', '']
+
+class LexiconTest(unittest.TestCase):
+    def setUp(self):
+        self.lexicon = Lexicon.from_words(WORDS)
+
+    def test_membership_and_order(self):
+        self.assertEqual(len(self.lexicon), 7)
+        self.assertEqual(list(self.lexicon), sorted(word.upper() for word in WORDS if word))
+        self.assertIn('MAKAN', self.lexicon)
+        self.assertNotIn('MAKA', self.lexicon)
+        self.assertNotIn('', self.lexicon)
+
+    def test_prefix(self):
+        self.assertEqual(list(self.lexicon.with_prefix('MAKAN')), ['MAKAN', 'MAKANAN'])
+        self.assertEqual(list(self.lexicon.with_prefix('MA')), ['MAIN', 'MAKAN', 'MAKANAN'])
+        self.assertEqual(list(self.lexicon.with_prefix('ZZ')), [])
+        self.assertEqual(list(self.lexicon.with_prefix('')), list(self.lexicon))
+
+    def test_suffix(self):
+        # Diurutkan menurut kata yang dibalik: NAKA, NAKAM, NAKI, NANAKAM
+        self.assertEqual(list(self.lexicon.with_suffix('KAN')), ['AKAN', 'MAKAN', 'IKAN'])
+        self.assertEqual(list(self.lexicon.with_suffix('AN')), ['AKAN', 'MAKAN', 'IKAN', 'MAKANAN'])
+        self.assertEqual(list(self.lexicon.with_suffix('QQ')), [])
+
+    def test_empty(self):
+        lexicon = Lexicon()
+        self.assertEqual(len(lexicon), 0)
+        self.assertNotIn('A', lexicon)
+        self.assertEqual(list(lexicon.with_prefix('A')), [])
+        self.assertEqual(list(lexicon.with_suffix('A')), [])
+
+    def test_overlay(self):
+        self.assertEqual(self.lexicon.add_words(['makin', 'makan']), {'MAKIN'})
+        self.assertEqual(self.lexicon.remove_words(['ikan', 'tidakada']), {'IKAN'})
+        self.assertIn('MAKIN', self.lexicon)
+        self.assertNotIn('IKAN', self.lexicon)
+        self.assertEqual(len(self.lexicon), 7)
+        self.assertEqual(list(self.lexicon.with_prefix('MAK')), ['MAKAN', 'MAKANAN', 'MAKIN'])
+        self.assertEqual(list(self.lexicon.with_suffix('KAN')), ['AKAN', 'MAKAN'])
+        self.assertEqual(self.lexicon.add_words(['ikan']), {'IKAN'})
+        self.assertEqual(self.lexicon.remove_words(['makin']), {'MAKIN'})
+        self.assertEqual(list(self.lexicon), sorted(word.upper() for word in WORDS if word))
+
+    def test_compiled_file(self):
+        with tempfile.TemporaryDirectory() as directory:
+            source, output = os.path.join(directory, 'kata.txt'), os.path.join(directory, 'kata.lex')
+            with open(source, 'w', encoding='utf-8') as f: f.write('\n'.join(WORDS))
+            self.assertEqual(compile_file(source, output)[0], 7)
+            lexicon = Lexicon()
+            lexicon.load(output)
+            self.assertEqual(list(lexicon.with_suffix('KAN')), list(self.lexicon.with_suffix('KAN')))
+            self.assertEqual(list(lexicon), list(self.lexicon))
+
+    def test_load_words_replaces_buffer_and_overlay(self):
+        self.lexicon.add_words(['makin'])
+        prefix = self.lexicon.with_prefix('MA')
+        self.assertEqual(next(prefix), 'MAIN')
+        self.lexicon.load_words(['minum', 'makan'])
+        self.assertEqual(list(prefix), ['MAKAN', 'MAKANAN', 'MAKIN']) # Query yang sedang berjalan tetap membaca buffer lama
+        self.assertEqual(list(self.lexicon), ['MAKAN', 'MINUM'])
+        self.assertNotIn('MAKIN', self.lexicon) # Overlay milik buffer lama tidak ikut
+        self.assertIsNone(self.lexicon.path)
+
+    def test_rejects_invalid_buffer(self):
+        with self.assertRaises(ValueError): Lexicon(b'XXXX' + bytes(12))
+        with self.assertRaises(ValueError): Lexicon(b'SK')
+        with self.assertRaises(ValueError): Lexicon(compile_words(WORDS)[:-3]) # Blob terpotong
+
+if __name__ == '__main__':
+    unittest.main()
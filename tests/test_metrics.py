@@ -0,0 +1,39 @@
+# tests/test_metrics.py (Label route metrik dan pencatatan latensi/status di HttpServer.proses)
+import threading
+import unittest
+from unittest import mock
+
+from http import HttpServer
+from metrics import route_of
+from models import GameRegistry
+from request_reader import HttpRequest
+
+class RouteTest(unittest.TestCase):
+    def test_route_labels(self):
+        for path, query, expected in (('/', '', 'static'), ('/static/app.js', '', 'static'), ('/game_status/ABC', '', 'game_status'),
+                                      ('/game_status/ABC', 'since=1&wait=5', 'game_status_wait'), ('/create_game', '', 'create_game'),
+                                      ('/tidak/dikenal', '', 'other'), ('*', '', 'other'), ('foo', '', 'other'), ('', '', 'other')):
+            with self.subTest(path=path): self.assertEqual(route_of(path, query), expected)
+
+class ProsesMetricsTest(unittest.TestCase):
+    def setUp(self):
+        self.server = HttpServer(GameRegistry(), threading.Lock(), set())
+        self.server.rate_limiter = None
+
+    def proses(self, method, target):
+        return self.server.proses(HttpRequest(method, target, 'HTTP/1.1', {}))
+
+    def test_target_without_leading_slash(self):
+        self.assertTrue(self.proses('OPTIONS', '*').startswith(b'HTTP/1.1 405 '))
+        self.assertTrue(self.proses('GET', 'foo').startswith(b'HTTP/1.1 404 '))
+        self.assertEqual(self.server.metrics.responses, {('other', 405): 1, ('other', 404): 1})
+
+    def test_metrics_error_does_not_escape(self):
+        self.proses('GET', '/server_stats')
+        with mock.patch.object(self.server.metrics, 'observe_request', side_effect=RuntimeError("rusak")):
+            with self.assertLogs(level='ERROR'): response = self.proses('GET', '/server_stats')
+        self.assertTrue(response.startswith(b'HTTP/1.1 200 '))
+        self.assertIn('route="server_stats",status="200"} 1', self.server.metrics.render())
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,65 @@
+# tests/test_models_delta.py (Respons delta /game_status: penyisipan tangan viewer dan batas riwayat)
+import json
+import unittest
+
+from models import Game, STATE_HISTORY_SIZE
+
+def decode(encoded):
+    return json.loads(encoded.decode('utf-8'))
+
+class DeltaTest(unittest.TestCase):
+    def setUp(self):
+        self.game = Game('ABC123', 'host')
+        self.game.add_player('tamu')
+        ok, _ = self.game.start_game()
+        self.assertTrue(ok)
+
+    def test_full_state_splices_only_viewer_hand(self):
+        state = decode(self.game.serialized_state_for_player('host'))
+        self.assertEqual(state['players']['host']['hand'], self.game.players['host'].hand)
+        self.assertEqual(state['players']['tamu']['hand'], [])
+        self.assertEqual(decode(self.game.serialized_state_for_player('penonton')), self.game.get_game_state_for_player(None))
+
+    def test_splice_by_position_with_lookalike_player_ids(self):
+        game = Game('XYZ789', 'x"a')
+        game.add_player('a') # Entri publik 'a' sama dengan akhir teks entri 'x"a'
+        self.assertTrue(game.start_game()[0])
+        for viewer in ('x"a', 'a', None):
+            with self.subTest(viewer=viewer):
+                self.assertEqual(decode(game.serialized_state_for_player(viewer)), game.get_game_state_for_player(viewer))
+        self.assertEqual(game.serialized_state_for_player(None), json.dumps(game.get_game_state_for_player(None)).encode('utf-8'))
+
+    def test_delta_contains_only_changed_fields(self):
+        since = self.game.version
+        self.game.check_count += 1
+        self.game.mark_changed()
+        delta = decode(self.game.serialized_delta_for_player('host', since))
+        self.assertEqual(delta, {'check_count': 1, 'version': since + 1})
+
+    def test_delta_player_entry_keeps_viewer_hand(self):
+        since = self.game.version
+        self.game.players['host'].score += 5
+        self.game.mark_changed()
+        delta = decode(self.game.serialized_delta_for_player('host', since))
+        self.assertEqual(set(delta['players']), {'host'})
+        self.assertEqual(delta['players']['host']['hand'], self.game.players['host'].hand)
+        other = decode(self.game.serialized_delta_for_player('tamu', since))
+        self.assertEqual(other['players']['host']['hand'], [])
+
+    def test_same_version_is_empty_delta(self):
+        self.assertEqual(decode(self.game.serialized_delta_for_player('host', self.game.version)), {'version': self.game.version})
+
+    def test_since_outside_history_returns_none(self):
+        since = self.game.version
+        for _ in range(STATE_HISTORY_SIZE + 1):
+            self.game.check_count += 1
+            self.game.mark_changed()
+        self.assertEqual(len(self.game.history), STATE_HISTORY_SIZE)
+        self.assertIsNone(self.game.serialized_delta_for_player('host', since))
+        self.assertIsNotNone(self.game.serialized_delta_for_player('host', since + 1)) # Masih tepat di tepi riwayat
+
+    def test_since_in_future_returns_none(self):
+        self.assertIsNone(self.game.serialized_delta_for_player('host', self.game.version + 1))
+
+if __name__ == '__main__':
+    unittest.main()
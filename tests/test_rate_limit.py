@@ -0,0 +1,100 @@
+# tests/test_rate_limit.py (Token bucket per pemain/alamat: burst, isi ulang, cakupan, dan respons 429)
+import threading
+import unittest
+from unittest import mock
+
+from http import HttpServer
+from models import GameRegistry
+from rate_limit import BucketTable, RateLimiter, client_address, player_id_of
+from request_reader import HttpRequest
+
+LIMITS = {('player', 'write'): (1.0, 2), ('addr', 'write'): (10.0, 3), ('player', 'read'): (1.0, 2), ('addr', 'read'): (10.0, 100)}
+
+def make_request(method='POST', target='/submit_turn/ABC123', body=b'{"player_id": "host"}', addr='10.0.0.1', headers=None):
+    request = HttpRequest(method, target, 'HTTP/1.1', headers or {}, body)
+    request.remote_addr = (addr, 5000) if addr else None
+    return request
+
+class RateLimiterTest(unittest.TestCase):
+    def setUp(self):
+        self.now = 100.0
+        patcher = mock.patch('rate_limit.time.monotonic', lambda: self.now)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        self.limiter = RateLimiter(LIMITS)
+
+    def test_burst_then_retry_after_then_refill(self):
+        self.assertEqual(self.limiter.check(make_request()), 0)
+        self.assertEqual(self.limiter.check(make_request()), 0)
+        self.assertAlmostEqual(self.limiter.check(make_request()), 1.0)
+        self.now += 0.5
+        self.assertAlmostEqual(self.limiter.check(make_request()), 0.5)
+        self.now += 0.5
+        self.assertEqual(self.limiter.check(make_request()), 0)
+        self.assertEqual(self.limiter.limited[('player', 'write')], 2)
+
+    def test_denial_does_not_drain_other_scope(self):
+        for _ in range(2): self.limiter.check(make_request())
+        for _ in range(5): self.assertGreater(self.limiter.check(make_request()), 0) # Ditolak per pemain
+        # Bucket alamat (burst 3) hanya terpotong dua kali, jadi pemain lain dari alamat yang sama masih bisa masuk
+        self.assertEqual(self.limiter.check(make_request(body=b'{"player_id": "tamu"}')), 0)
+        self.assertGreater(self.limiter.check(make_request(body=b'{"player_id": "lain"}')), 0)
+        self.assertEqual(self.limiter.limited[('addr', 'write')], 1)
+
+    def test_reads_and_writes_use_separate_buckets(self):
+        for _ in range(2): self.limiter.check(make_request())
+        self.assertEqual(self.limiter.check(make_request('GET', '/game_status/ABC123?player_id=host', b'')), 0)
+
+    def test_exempt_paths(self):
+        for target in ('/', '/static/app.js'):
+            for _ in range(10): self.assertEqual(self.limiter.check(make_request('GET', target, b'')), 0)
+
+    def test_batch_costs_one_token_per_parsed_sub_request(self):
+        server = HttpServer(GameRegistry(), threading.Lock(), set())
+        server.rate_limiter = RateLimiter({**LIMITS, ('player', 'write'): (1.0, 5)})
+        # Key "path" ditulis dengan escape: byte body tidak memuat '"path"', tapi hasil parsing JSON sama
+        body = b'{"player_id": "host", "requests": [' + b', '.join([b'{"method": "POST", "p\\u0061th": "/create_game", "body": {"player_id": "host"}}'] * 3) + b']}'
+        self.assertNotIn(b'"path"', body)
+        response = server.proses(make_request(target='/batch', body=body))
+        self.assertTrue(response.startswith(b'HTTP/1.1 200 '))
+        self.assertEqual(len(server.GAMES), 3)
+        response = server.proses(make_request(target='/batch', body=body)) # Sisa 2 token, butuh 3
+        self.assertTrue(response.startswith(b'HTTP/1.1 429 '))
+        self.assertIn(b'\r\nRetry-After: 1\r\n', response)
+        self.assertEqual(len(server.GAMES), 3)
+
+    def test_websocket_actions(self):
+        self.assertEqual(self.limiter.check_player('host'), 0)
+        self.assertEqual(self.limiter.check_player('host'), 0)
+        self.assertGreater(self.limiter.check_player('host'), 0)
+
+    def test_bucket_table_is_bounded_lru(self):
+        table = BucketTable(1.0, 2, max_buckets=2)
+        table.refill('a', 0)
+        table.refill('b', 0)
+        table.refill('a', 0)
+        table.refill('c', 0)
+        self.assertEqual(list(table.buckets), ['a', 'c'])
+
+    def test_client_address_and_player_id(self):
+        forwarded = {'x-forwarded-for': '1.2.3.4, 5.6.7.8'}
+        self.assertEqual(client_address(make_request(addr='127.0.0.1', headers=forwarded)), '5.6.7.8')
+        self.assertEqual(client_address(make_request(addr='10.0.0.9', headers=forwarded)), '10.0.0.9') # Bukan proxy tepercaya
+        self.assertIsNone(client_address(make_request(addr=None)))
+        self.assertEqual(player_id_of(make_request(body=b'{"moves": [], "player_id" : "tamu"}')), 'tamu')
+        self.assertEqual(player_id_of(make_request('GET', '/hint/ABC123?limit=3&player_id=host', b'')), 'host')
+        self.assertIsNone(player_id_of(make_request(body=b'{}')))
+
+    def test_http_server_answers_429(self):
+        server = HttpServer(GameRegistry(), threading.Lock(), set())
+        server.rate_limiter = self.limiter
+        for _ in range(2): self.assertIsNone(server.admit(make_request()))
+        request = make_request()
+        response = server.admit(request)
+        self.assertTrue(response.startswith(b'HTTP/1.1 429 Too Many Requests\r\n'))
+        self.assertIn(b'\r\nRetry-After: 1\r\n', response)
+        self.assertIsNotNone(server.admit(request)) # Hasil disimpan di request; token tidak dipotong lagi
+        self.assertEqual(self.limiter.limited[('player', 'write')], 1)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,116 @@
+# tests/test_reaper.py (Pengeluaran game idle per state, batas max_games LRU, dan arsip game selesai)
+import json
+import os
+import tempfile
+import unittest
+
+from models import Game, GameRegistry
+from reaper import GameReaper
+
+TTLS = {'lobby': 10, 'active': 100, 'finished': 5}
+
+def make_game(game_id, state='lobby', last_activity=0.0):
+    game = Game(game_id, 'host')
+    if state != 'lobby':
+        game.add_player('tamu')
+        game.start_game()
+    if state == 'finished':
+        game.winner, game.game_started = 'host', False
+    game.last_activity = last_activity
+    return game
+
+class ReaperTest(unittest.TestCase):
+    def setUp(self):
+        self.registry = GameRegistry()
+        self.reaper = GameReaper(self.registry, ttls=TTLS)
+
+    def add(self, *games):
+        for game in games: self.assertTrue(self.registry.add(game))
+        return games
+
+    def test_ttl_per_state(self):
+        lobby, active, finished = self.add(make_game('LOBBY1'), make_game('AKTIF1', 'active'), make_game('SELESAI', 'finished'))
+        self.reaper.reap_once(now=8)
+        self.assertEqual(sorted(game.game_id for game in self.registry.snapshot()), ['AKTIF1', 'LOBBY1'])
+        self.reaper.reap_once(now=50)
+        self.assertEqual([game.game_id for game in self.registry.snapshot()], ['AKTIF1'])
+        self.assertEqual(dict(self.registry.evictions), {'finished_idle': 1, 'lobby_idle': 1})
+        self.assertTrue(lobby.evicted and finished.evicted)
+        self.assertFalse(active.evicted)
+
+    def test_retire_wakes_waiters(self):
+        game, = self.add(make_game('LOBBY1'))
+        since = game.version
+        self.reaper.reap_once(now=100)
+        self.assertEqual(game.version, since + 1)
+        self.assertTrue(game.wait_for_change(since, 0))
+
+    def test_access_keeps_game_alive(self):
+        game, = self.add(make_game('LOBBY1'))
+        self.assertIs(self.registry.get('LOBBY1'), game) # Memperbarui last_activity ke waktu sekarang
+        self.reaper.reap_once(now=game.last_activity + 9)
+        self.assertIn('LOBBY1', self.registry)
+
+    def test_max_games_evicts_idle_before_active(self):
+        self.registry.max_games = 2
+        active, lobby = self.add(make_game('AKTIF1', 'active'), make_game('LOBBY1'))
+        self.add(make_game('BARU01')) # AKTIF1 paling lama, tapi lobby dikeluarkan lebih dulu
+        self.assertEqual(sorted(game.game_id for game in self.registry.snapshot()), ['AKTIF1', 'BARU01'])
+        self.add(make_game('BARU02'))
+        self.assertEqual(sorted(game.game_id for game in self.registry.snapshot()), ['AKTIF1', 'BARU02'])
+        self.registry.max_games = 1
+        self.registry.remove('BARU02')
+        self.add(make_game('AKTIF2', 'active')) # Hanya tersisa game aktif
+        self.assertEqual(dict(self.registry.evictions), {'lru': 2, 'lru_active': 1})
+        self.assertFalse(lobby.evicted) # Ditandai saat reaper berjalan, bukan di bawah lock registry
+        self.reaper.reap_once(now=0)
+        self.assertTrue(lobby.evicted and active.evicted)
+
+    def test_idle_set_follows_state_changes(self):
+        self.registry.max_games = 2
+        lobby, active = self.add(make_game('LOBBY1'), make_game('AKTIF1', 'active'))
+        self.assertEqual(list(self.registry.idle), ['LOBBY1'])
+        with lobby.lock:
+            lobby.add_player('tamu')
+            lobby.start_game() # Lobby menjadi aktif: keluar dari kandidat eviction
+        self.assertEqual(list(self.registry.idle), [])
+        with active.lock:
+            active.winner, active.game_started = 'host', False
+            active.mark_changed() # Game selesai: menjadi kandidat eviction
+        self.assertEqual(list(self.registry.idle), ['AKTIF1'])
+        self.add(make_game('BARU01')) # LOBBY1 paling lama, tapi sedang berjalan
+        self.assertEqual(sorted(game.game_id for game in self.registry.snapshot()), ['BARU01', 'LOBBY1'])
+        self.assertEqual(list(self.registry.idle), ['BARU01'])
+        self.assertEqual(dict(self.registry.evictions), {'lru': 1})
+
+    def test_stale_idle_entry_is_skipped(self):
+        self.registry.max_games = 2
+        stale, lobby = self.add(make_game('BASI01'), make_game('LOBBY1'))
+        stale.game_started = True # Berubah tanpa mark_changed: entri idle-nya basi
+        self.add(make_game('BARU01'))
+        self.assertEqual(sorted(game.game_id for game in self.registry.snapshot()), ['BARU01', 'BASI01'])
+        self.assertTrue(self.registry.idle.keys() == {'BARU01'})
+
+    def test_archive_finished_games(self):
+        with tempfile.TemporaryDirectory() as directory:
+            self.reaper.archive_dir = os.path.join(directory, 'arsip')
+            self.add(make_game('SELESAI', 'finished'), make_game('LOBBY1'))
+            self.reaper.reap_once(now=100)
+            files = os.listdir(self.reaper.archive_dir)
+            self.assertEqual(len(files), 1)
+            with open(os.path.join(self.reaper.archive_dir, files[0]), encoding='utf-8') as f:
+                records = [json.loads(line) for line in f]
+        self.assertEqual([(record['game_id'], record['winner'], record['reason']) for record in records], [('SELESAI', 'host', 'finished_idle')])
+        self.assertEqual(set(records[0]['scores']), {'host', 'tamu'})
+        self.assertEqual(self.reaper.stats(), {"evicted_games": {'finished_idle': 1, 'lobby_idle': 1}, "archived_games": 1})
+
+    def test_archive_error_is_counted(self):
+        with tempfile.NamedTemporaryFile() as not_a_directory:
+            self.reaper.archive_dir = not_a_directory.name
+            self.add(make_game('SELESAI', 'finished'))
+            with self.assertLogs(level='ERROR'): self.reaper.reap_once(now=100)
+        self.assertEqual((self.reaper.archived, self.reaper.archive_errors), (0, 1))
+        self.assertNotIn('SELESAI', self.registry)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,111 @@
+# tests/test_request_reader.py (Parser request inkremental: Content-Length, chunked, dan batas ukuran)
+import unittest
+
+from request_reader import RequestReader, RequestError
+
+CHUNKED_HEAD = b'POST /batch HTTP/1.1\r\nHost: x\r\nTransfer-Encoding: chunked\r\n\r\n'
+
+class RequestReaderTest(unittest.TestCase):
+    def read(self, data, **limits):
+        reader = RequestReader(**limits)
+        reader.feed(data)
+        return reader, reader.next_request()
+
+    def assertStatus(self, status_code, data, **limits):
+        with self.assertRaises(RequestError) as raised: self.read(data, **limits)
+        self.assertEqual(raised.exception.status_code, status_code)
+
+    def test_content_length_and_pipelining(self):
+        reader, request = self.read(b'POST /a HTTP/1.1\r\nContent-Length: 3\r\n\r\nabcGET /b HTTP/1.1\r\n\r\n')
+        self.assertEqual((request.method, request.path, request.body), ('POST', '/a', b'abc'))
+        self.assertEqual(reader.next_request().path, '/b')
+        self.assertIsNone(reader.next_request())
+
+    def test_byte_by_byte(self):
+        reader = RequestReader()
+        data = CHUNKED_HEAD + b'3\r\nabc\r\n0\r\n\r\n'
+        for index in range(len(data) - 1):
+            reader.feed(data[index:index + 1])
+            self.assertIsNone(reader.next_request())
+        reader.feed(data[-1:])
+        self.assertEqual(reader.next_request().body, b'abc')
+
+    def test_chunked_with_extension_and_trailer(self):
+        _, request = self.read(CHUNKED_HEAD + b'3;ext=1\r\nabc\r\nA\r\n0123456789\r\n0\r\nX-Trailer: y\r\n\r\n')
+        self.assertEqual(request.body, b'abc0123456789')
+
+    def test_truncated_chunk_waits_for_data(self):
+        reader, request = self.read(CHUNKED_HEAD + b'5\r\nab')
+        self.assertIsNone(request)
+        reader.feed(b'cde\r\n0\r\n\r\n')
+        self.assertEqual(reader.next_request().body, b'abcde')
+
+    def test_is_idle_only_between_requests(self):
+        reader = RequestReader()
+        self.assertTrue(reader.is_idle())
+        reader.feed(b'POST /a HTTP/1.1\r\nContent-Length: 3\r\nExpect: 100-continue\r\n\r\n')
+        self.assertIsNone(reader.next_request())
+        self.assertEqual(reader.buffer, b'') # Header sudah dibaca, body belum datang
+        self.assertFalse(reader.is_idle())
+        reader.feed(b'abc')
+        self.assertEqual(reader.next_request().body, b'abc')
+        self.assertTrue(reader.is_idle())
+
+    def test_blank_lines_between_requests_and_expect(self):
+        reader, request = self.read(b'\r\n\r\nPOST /a HTTP/1.1\r\nContent-Length: 1\r\nExpect: 100-continue\r\n\r\n')
+        self.assertIsNone(request)
+        self.assertTrue(reader.expect_continue) # Server boleh membalas 100 Continue sebelum body datang
+        reader.feed(b'x\r\nGET /b HTTP/1.0\r\n\r\n')
+        self.assertEqual(reader.next_request().body, b'x')
+        self.assertFalse(reader.expect_continue)
+        self.assertEqual(reader.next_request().path, '/b')
+
+    def test_keep_alive_by_version(self):
+        cases = [(b'HTTP/1.1', b'', True), (b'HTTP/1.1', b'Connection: close\r\n', False),
+                 (b'HTTP/1.0', b'', False), (b'HTTP/1.0', b'Connection: Keep-Alive\r\n', True)]
+        for version, header, expected in cases:
+            with self.subTest(version=version, header=header):
+                self.assertEqual(self.read(b'GET / ' + version + b'\r\n' + header + b'\r\n')[1].keep_alive, expected)
+
+    def test_to_bytes_rewrites_framing(self):
+        _, request = self.read(CHUNKED_HEAD + b'3\r\nabc\r\n0\r\n\r\n')
+        forwarded = RequestReader()
+        forwarded.feed(request.to_bytes({'x-forwarded-for': '10.0.0.1'}))
+        copy = forwarded.next_request()
+        self.assertEqual((copy.body, copy.keep_alive, copy.headers['x-forwarded-for']), (b'abc', False, '10.0.0.1'))
+        self.assertNotIn('transfer-encoding', copy.headers)
+
+    def test_chunk_without_crlf(self):
+        self.assertStatus(400, CHUNKED_HEAD + b'3\r\nabcd\r\n0\r\n\r\n')
+
+    def test_invalid_chunk_sizes(self):
+        for size in (b'-1', b'+3', b'0x3', b'1_0', b'', b'zz'):
+            with self.subTest(size=size): self.assertStatus(400, CHUNKED_HEAD + size + b'\r\nabc\r\n0\r\n\r\n')
+
+    def test_chunk_line_too_long(self):
+        self.assertStatus(400, CHUNKED_HEAD + b'1' * 2000)
+
+    def test_body_limits(self):
+        self.assertStatus(413, b'POST / HTTP/1.1\r\nContent-Length: 11\r\n\r\n', max_body_size=10)
+        self.assertStatus(413, CHUNKED_HEAD + b'6\r\nabcdef\r\n6\r\n', max_body_size=10)
+
+    def test_header_limit(self):
+        self.assertStatus(431, b'GET / HTTP/1.1\r\nX: ' + b'a' * 100, max_header_size=64)
+
+    def test_bad_content_length_and_encoding(self):
+        self.assertStatus(400, b'POST / HTTP/1.1\r\nContent-Length: -1\r\n\r\n')
+        self.assertStatus(400, b'POST / HTTP/1.1\r\nContent-Length: abc\r\n\r\n')
+        self.assertStatus(501, b'POST / HTTP/1.1\r\nTransfer-Encoding: gzip\r\n\r\n')
+
+    def test_content_length_must_be_plain_digits(self):
+        for value in (b'+5', b' 1_0', b'1_0', b'0x5', b'5.0', b'5 5', b''):
+            with self.subTest(value=value): self.assertStatus(400, b'POST / HTTP/1.1\r\nContent-Length: ' + value + b'\r\n\r\nabcdefghij')
+        self.assertEqual(self.read(b'POST / HTTP/1.1\r\nContent-Length: 005\r\n\r\nabcde')[1].body, b'abcde')
+
+    def test_ambiguous_framing(self):
+        self.assertStatus(400, b'POST / HTTP/1.1\r\nContent-Length: 3\r\nContent-Length: 3\r\n\r\nabc')
+        self.assertStatus(400, b'POST / HTTP/1.1\r\nContent-Length: 3\r\ncontent-length: 4\r\n\r\nabcd')
+        self.assertStatus(400, b'POST / HTTP/1.1\r\nTransfer-Encoding: chunked\r\nContent-Length: 3\r\n\r\n3\r\nabc\r\n0\r\n\r\n')
+
+if __name__ == '__main__':
+    unittest.main()
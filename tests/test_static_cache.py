@@ -0,0 +1,126 @@
+# tests/test_static_cache.py (Cache aset statis: ETag/304, varian gzip, Range, dan pemuatan ulang berdasarkan mtime)
+import gzip
+import hashlib
+import os
+import tempfile
+import threading
+import unittest
+
+import static_cache
+from http import HttpServer, FileResponse
+from models import GameRegistry
+from static_cache import StaticCache, accepts_gzip, etag_matches
+
+def split(response):
+    head, _, body = response.partition(b'\r\n\r\n')
+    return head.decode('latin-1'), body
+
+class StaticCacheTest(unittest.TestCase):
+    def setUp(self):
+        directory = tempfile.TemporaryDirectory()
+        self.addCleanup(directory.cleanup)
+        self.directory = directory.name
+
+    def write(self, name, data, mtime=None):
+        path = os.path.join(self.directory, name)
+        with open(path, 'wb') as f: f.write(data)
+        if mtime is not None: os.utime(path, (mtime, mtime))
+        return path
+
+    def test_gzip_variant_only_for_large_text(self):
+        cache = StaticCache()
+        text = cache.get(self.write('a.js', b'var x = 1;\n' * 100), 'application/javascript')
+        self.assertEqual(gzip.decompress(text.gzip_body), b'var x = 1;\n' * 100)
+        self.assertEqual(text.gzip_etag, text.etag[:-1] + '-gz"')
+        self.assertIsNone(cache.get(self.write('b.js', b'var x;'), 'application/javascript').gzip_body) # Terlalu kecil
+        self.assertIsNone(cache.get(self.write('c.bin', os.urandom(1000)), 'application/octet-stream').gzip_body)
+
+    def test_hits_without_mtime_check(self):
+        cache = StaticCache(check_mtime=False)
+        path = self.write('a.txt', b'satu', mtime=1000)
+        first = cache.get(path, 'text/plain')
+        self.write('a.txt', b'dua', mtime=2000)
+        self.assertIs(cache.get(path, 'text/plain'), first) # Tidak ada stat(): isi lama tetap dipakai
+        self.assertEqual(cache.stats(), {"cached_assets": 1, "hits": 1, "loads": 1})
+
+    def test_reload_on_mtime_change_and_delete(self):
+        cache = StaticCache(check_mtime=True)
+        path = self.write('a.txt', b'satu', mtime=1000)
+        first = cache.get(path, 'text/plain')
+        self.assertIs(cache.get(path, 'text/plain'), first)
+        self.write('a.txt', b'dua', mtime=2000)
+        second = cache.get(path, 'text/plain')
+        self.assertEqual(second.body, b'dua')
+        self.assertNotEqual(second.etag, first.etag)
+        os.remove(path)
+        self.assertIsNone(cache.get(path, 'text/plain'))
+        self.assertEqual(cache.stats()["cached_assets"], 0)
+        self.assertIsNone(cache.get(self.directory, 'text/plain'))
+
+    def test_large_file_is_not_kept_in_memory(self):
+        data = os.urandom(static_cache.SENDFILE_MIN_SIZE)
+        asset = StaticCache().get(self.write('besar.bin', data), 'application/octet-stream')
+        self.assertIsNone(asset.body)
+        self.assertEqual(asset.size, len(data))
+        self.assertEqual(asset.etag, '"' + hashlib.sha1(data).hexdigest()[:20] + '"') # Di-hash per potongan dari disk
+
+    def test_conditional_and_range(self):
+        asset = StaticCache().get(self.write('a.txt', b'0123456789', mtime=1000), 'text/plain')
+        self.assertTrue(asset.is_not_modified({'if-none-match': asset.etag}, asset.etag))
+        self.assertTrue(asset.is_not_modified({'if-none-match': '"lain", W/' + asset.etag}, asset.etag))
+        self.assertFalse(asset.is_not_modified({'if-none-match': '"lain"', 'if-modified-since': asset.last_modified}, asset.etag))
+        self.assertTrue(asset.is_not_modified({'if-modified-since': asset.last_modified}, asset.etag))
+        self.assertFalse(asset.is_not_modified({'if-modified-since': 'bukan tanggal'}, asset.etag))
+        for header, expected in (('bytes=2-4', (2, 4)), ('bytes=7-', (7, 9)), ('bytes=-3', (7, 9)), ('bytes=5-100', (5, 9)),
+                                 ('bytes=10-', 'unsatisfiable'), ('bytes=-0', 'unsatisfiable'), ('bytes=1-2,4-5', None), ('items=1-2', None)):
+            with self.subTest(range=header): self.assertEqual(asset.byte_range({'range': header}), expected)
+        self.assertIsNone(asset.byte_range({'range': 'bytes=2-4', 'if-range': '"lain"'}))
+
+    def test_header_helpers(self):
+        self.assertTrue(accepts_gzip({'accept-encoding': 'br, gzip;q=0.5'}))
+        self.assertFalse(accepts_gzip({'accept-encoding': 'gzip;q=0'}))
+        self.assertFalse(accepts_gzip({}))
+
+    def test_explicit_gzip_beats_wildcard(self):
+        cases = {'*, gzip;q=0': False, 'gzip;q=0, *': False, '*;q=0, gzip': True, '*': True, '*;q=0': False,
+                 'br, *;q=0.1': True, 'GZIP; Q=0.000': False, 'gzip;level=1;q=0': False, 'gzip;q=abc': False, 'x-gzip': False}
+        for header, expected in cases.items():
+            with self.subTest(header=header): self.assertEqual(accepts_gzip({'accept-encoding': header}), expected)
+        self.assertTrue(etag_matches({'if-none-match': '*'}, '"x"'))
+        self.assertFalse(etag_matches({}, '"x"'))
+
+class ServeStaticTest(unittest.TestCase):
+    def setUp(self):
+        self.server = HttpServer(GameRegistry(), threading.Lock(), set(), StaticCache(check_mtime=False))
+        with open(os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'index.html'), 'rb') as f: self.index = f.read()
+
+    def test_gzip_etag_and_304(self):
+        head, body = split(self.server.serve_static_file('index.html', request_headers={'accept-encoding': 'gzip'}))
+        self.assertIn('Content-Encoding: gzip', head)
+        self.assertEqual(gzip.decompress(body), self.index)
+        etag = next(line.split(': ', 1)[1] for line in head.split('\r\n') if line.startswith('ETag: '))
+        self.assertTrue(etag.endswith('-gz"'))
+        head, body = split(self.server.serve_static_file('index.html', request_headers={'accept-encoding': 'gzip', 'if-none-match': etag}))
+        self.assertTrue(head.startswith('HTTP/1.1 304 '))
+        self.assertEqual(body, b'')
+        head, body = split(self.server.serve_static_file('index.html'))
+        self.assertNotIn('Content-Encoding', head)
+        self.assertEqual(body, self.index)
+
+    def test_range_and_missing(self):
+        head, body = split(self.server.serve_static_file('index.html', request_headers={'range': 'bytes=0-9', 'accept-encoding': 'gzip'}))
+        self.assertTrue(head.startswith('HTTP/1.1 206 '))
+        self.assertIn(f'Content-Range: bytes 0-9/{len(self.index)}', head)
+        self.assertEqual(body, self.index[:10])
+        self.assertTrue(self.server.serve_static_file('index.html', request_headers={'range': f'bytes={len(self.index)}-'}).startswith(b'HTTP/1.1 416 '))
+        self.assertTrue(self.server.serve_static_file('tidak-ada.js', is_static=True).startswith(b'HTTP/1.1 404 '))
+        self.assertTrue(self.server.serve_static_file('../../etc/passwd', is_static=True).startswith(b'HTTP/1.1 403 '))
+
+    def test_large_file_uses_sendfile(self):
+        response = self.server.serve_static_file('dictionary.txt', is_static=True, request_headers={'range': 'bytes=0-99'})
+        self.assertIsInstance(response, FileResponse)
+        self.assertEqual((response.offset, response.count), (0, 100))
+        self.assertIn(b'206 Partial Content', response.header_bytes)
+
+if __name__ == '__main__':
+    unittest.main()
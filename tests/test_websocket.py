@@ -0,0 +1,152 @@
+# tests/test_websocket.py (Framing WebSocket dan koneksi GameSocket: state awal, aksi, ping, dan close)
+import json
+import os
+import socket
+import threading
+import unittest
+
+import websocket_frames as ws
+from http import HttpServer, GameSocket
+from models import Game, GameRegistry
+
+UPGRADE_HEADERS = {'upgrade': 'websocket', 'connection': 'keep-alive, Upgrade', 'sec-websocket-key': 'dGhlIHNhbXBsZSBub25jZQ==', 'sec-websocket-version': '13'}
+
+def client_frame(opcode, payload=b'', fin=True):
+    frame = bytearray(ws.encode_frame(opcode, payload, mask_key=os.urandom(4)))
+    if not fin: frame[0] &= 0x7F
+    return bytes(frame)
+
+def read_all(data, require_mask=True):
+    reader = ws.FrameReader(require_mask=require_mask)
+    reader.feed(data)
+    messages = []
+    while True:
+        message = reader.next_message()
+        if message is None: return messages
+        messages.append(message)
+
+class FrameTest(unittest.TestCase):
+    def test_accept_key(self):
+        # Contoh dari RFC 6455 bagian 1.3
+        self.assertEqual(ws.accept_key('dGhlIHNhbXBsZSBub25jZQ=='), 's3pPLMBiTxaQ9kYGzzhZRbK+xOo=')
+        self.assertTrue(ws.is_upgrade_request(UPGRADE_HEADERS))
+        self.assertFalse(ws.is_upgrade_request({'upgrade': 'websocket', 'connection': 'keep-alive'}))
+
+    def test_masked_round_trip_all_length_forms(self):
+        for size in (0, 1, 125, 126, 65535, 65536):
+            payload = os.urandom(size)
+            with self.subTest(size=size):
+                self.assertEqual(read_all(client_frame(ws.OP_BINARY, payload)), [(ws.OP_BINARY, payload)])
+                self.assertEqual(read_all(ws.encode_frame(ws.OP_BINARY, payload), require_mask=False), [(ws.OP_BINARY, payload)])
+
+    def test_fragments_with_interleaved_ping_byte_by_byte(self):
+        data = client_frame(ws.OP_TEXT, b'hal', fin=False) + client_frame(ws.OP_PING, b'p') + client_frame(ws.OP_CONTINUATION, b'o')
+        reader, messages = ws.FrameReader(), []
+        for index in range(len(data)):
+            reader.feed(data[index:index + 1])
+            message = reader.next_message()
+            if message: messages.append(message)
+        self.assertEqual(messages, [(ws.OP_PING, b'p'), (ws.OP_TEXT, b'halo')])
+
+    def test_protocol_errors(self):
+        cases = ((ws.encode_frame(ws.OP_TEXT, b'x'), ws.CLOSE_PROTOCOL_ERROR),               # Tanpa mask
+                 (client_frame(ws.OP_CONTINUATION, b'x'), ws.CLOSE_PROTOCOL_ERROR),          # Lanjutan tanpa awal
+                 (client_frame(ws.OP_PING, b'x', fin=False), ws.CLOSE_PROTOCOL_ERROR),       # Frame kontrol terfragmentasi
+                 (client_frame(0x3, b'x'), ws.CLOSE_PROTOCOL_ERROR),                         # Opcode tidak dikenal
+                 (client_frame(ws.OP_TEXT, b'a', fin=False) + client_frame(ws.OP_TEXT, b'b'), ws.CLOSE_PROTOCOL_ERROR),
+                 (client_frame(ws.OP_TEXT, b'x' * (ws.MAX_MESSAGE_SIZE + 1)), ws.CLOSE_TOO_BIG))
+        for data, close_code in cases:
+            with self.subTest(data=data[:2]):
+                with self.assertRaises(ws.WebSocketError) as raised: read_all(data)
+                self.assertEqual(raised.exception.close_code, close_code)
+
+    def test_reserved_opcodes_rejected_from_header(self):
+        for opcode in (0x3, 0x4, 0x5, 0x6, 0x7, 0xB, 0xC, 0xD, 0xE, 0xF):
+            with self.subTest(opcode=opcode):
+                # Hanya header: opcode cadangan ditolak sebelum payload datang (termasuk 0xB-0xF yang >= OP_CLOSE)
+                with self.assertRaises(ws.WebSocketError) as raised: read_all(client_frame(opcode, b'x' * 200)[:4])
+                self.assertEqual(raised.exception.close_code, ws.CLOSE_PROTOCOL_ERROR)
+
+class GameSocketTest(unittest.TestCase):
+    def setUp(self):
+        self.server = HttpServer(GameRegistry(), threading.Lock(), set())
+        self.game = Game('ABC123', 'host')
+        self.game.add_player('tamu')
+        ok, _ = self.game.start_game()
+        self.assertTrue(ok)
+        self.server.GAMES.add(self.game)
+        self.player_id = self.game.get_current_player_id()
+        self.client, self.server_side = socket.socketpair()
+        self.client.settimeout(5)
+        self.addCleanup(self.client.close)
+        self.addCleanup(self.server_side.close)
+        self.reader = ws.FrameReader(require_mask=False)
+
+    def next_message(self):
+        while True:
+            message = self.reader.next_message()
+            if message: return message
+            data = self.client.recv(65536)
+            if not data: return None
+            self.reader.feed(data)
+
+    def next_json(self):
+        opcode, payload = self.next_message()
+        self.assertEqual(opcode, ws.OP_TEXT)
+        return json.loads(payload)
+
+    def test_handshake_rejections(self):
+        response = self.server.handle_websocket('/ws/ABC123', 'player_id=host', {})
+        self.assertTrue(response.startswith(b'HTTP/1.1 426 '))
+        response = self.server.handle_websocket('/ws/ABC123', 'player_id=penonton', UPGRADE_HEADERS)
+        self.assertTrue(response.startswith(b'HTTP/1.1 403 '))
+
+    def test_state_action_ping_and_close(self):
+        socket_response = self.server.handle_websocket('/ws/ABC123', f'player_id={self.player_id}', UPGRADE_HEADERS)
+        self.assertIsInstance(socket_response, GameSocket)
+        thread = threading.Thread(target=socket_response.run_blocking, args=(self.server_side,), daemon=True)
+        thread.start()
+        head = b''
+        while b'\r\n\r\n' not in head: head += self.client.recv(1)
+        self.assertTrue(head.startswith(b'HTTP/1.1 101 Switching Protocols\r\n'))
+        self.assertIn(b'Sec-WebSocket-Accept: s3pPLMBiTxaQ9kYGzzhZRbK+xOo=\r\n', head)
+        first = self.next_json()
+        self.assertEqual((first['type'], first['full'], first['data']['current_turn']), ('state', True, self.player_id))
+        self.assertEqual(first['data']['players'][self.player_id]['hand'], self.game.players[self.player_id].hand)
+
+        self.client.sendall(client_frame(ws.OP_TEXT, json.dumps({"action": "check_turn", "id": 7})))
+        result = self.next_json()
+        self.assertEqual((result['type'], result['id'], result['status'], result['success']), ('result', 7, 200, True))
+        update = self.next_json()
+        self.assertEqual((update['type'], update['full']), ('state', False))
+        self.assertNotEqual(update['data']['current_turn'], self.player_id)
+        self.assertNotIn('game_id', update['data']) # Hanya key yang berubah
+
+        self.client.sendall(client_frame(ws.OP_TEXT, json.dumps({"action": "create_game"})))
+        self.assertEqual(self.next_json()['status'], 400)
+        self.client.sendall(client_frame(ws.OP_PING, b'abc'))
+        self.assertEqual(self.next_message(), (ws.OP_PONG, b'abc'))
+        self.client.sendall(client_frame(ws.OP_CLOSE, b'\x03\xe8bye'))
+        self.assertEqual(self.next_message(), (ws.OP_CLOSE, b'\x03\xe8'))
+        thread.join(5)
+        self.assertFalse(thread.is_alive())
+        self.assertEqual(self.game.listeners, [self.server.GAMES._state_changed]) # Listener socket sudah dilepas
+
+    def test_protocol_error_closes_with_code(self):
+        socket_response = self.server.handle_websocket('/ws/ABC123', f'player_id={self.player_id}', UPGRADE_HEADERS)
+        socket_response.buffered = ws.encode_frame(ws.OP_TEXT, b'tanpa mask') # Terbaca bersama request handshake
+        thread = threading.Thread(target=socket_response.run_blocking, args=(self.server_side,), daemon=True)
+        thread.start()
+        thread.join(5)
+        self.server_side.close() # Seperti layer socket setelah stream selesai
+        data = b''
+        while True:
+            chunk = self.client.recv(65536)
+            if not chunk: break
+            data += chunk
+        _, _, frames = data.partition(b'\r\n\r\n')
+        opcode, payload = read_all(frames, require_mask=False)[-1]
+        self.assertEqual((opcode, int.from_bytes(payload[:2], 'big')), (ws.OP_CLOSE, ws.CLOSE_PROTOCOL_ERROR))
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,89 @@
+# tests/test_wire_binary.py (Encoding biner: round-trip state/aksi, negosiasi Accept, dan batas field)
+import json
+import threading
+import unittest
+
+import wire_binary
+from http import HttpServer
+from models import Game, GameRegistry
+
+def status_request(server, game_id, player_id, accept=wire_binary.CONTENT_TYPE):
+    server.wire.binary = True
+    try: return server.handle_game_status(f'/game_status/{game_id}', f'player_id={player_id}', {'accept': accept})
+    finally: server.wire.binary = False
+
+def split(response):
+    head, _, body = response.partition(b'\r\n\r\n')
+    return head.decode('latin-1'), body
+
+class WireBinaryTest(unittest.TestCase):
+    def setUp(self):
+        self.game = Game('ABC123', 'host')
+        self.game.add_player('tamu')
+        ok, _ = self.game.start_game()
+        self.assertTrue(ok)
+
+    def test_state_round_trip(self):
+        for viewer in ('host', 'tamu', None):
+            state = self.game.get_game_state_for_player(viewer)
+            with self.subTest(viewer=viewer):
+                self.assertEqual(wire_binary.decode(wire_binary.encode_state(state)), json.loads(json.dumps(state)))
+
+    def test_state_round_trip_with_literal_cards_and_winner(self):
+        state = self.game.get_game_state_for_player('host')
+        state.update(card_on_table='ÉKSTRA', helper_cards=['KA', 'ZZ'], winner='tamu', current_turn=None)
+        self.assertEqual(wire_binary.decode(wire_binary.encode_state(state)), state)
+
+    def test_result_round_trip(self):
+        for data in ({"success": True, "message": "ok", "score_earned": 5, "winner": "host"},
+                     {"success": False, "message": "Game not found."},
+                     {"success": True, "message": "", "game_id": "ABC123"}):
+            with self.subTest(data=data): self.assertEqual(wire_binary.decode(wire_binary.encode_result(data)), data)
+
+    def test_player_limit(self):
+        game = Game('BESAR1', 'p0')
+        for index in range(1, wire_binary.MAX_PLAYERS): game.add_player(f'p{index}')
+        state = game.get_game_state_for_player(None)
+        state['current_turn'] = state['winner'] = f'p{wire_binary.MAX_PLAYERS - 1}' # Indeks tertinggi tetap bukan NO_PLAYER
+        decoded = wire_binary.decode(wire_binary.encode_state(state))
+        self.assertEqual((decoded['current_players_count'], decoded['current_turn'], decoded['winner']), (wire_binary.MAX_PLAYERS, state['winner'], state['winner']))
+        game.add_player('satu-lagi')
+        with self.assertRaises(ValueError): wire_binary.encode_state(game.get_game_state_for_player(None))
+
+    def test_field_limits_raise_value_error(self):
+        state = self.game.get_game_state_for_player('host')
+        for field, value in (('host_id', 'x' * 0x10000), ('check_count', 256), ('main_deck_count', 0x10000), ('helper_cards', ['KA'] * 256)):
+            with self.subTest(field=field):
+                with self.assertRaises(ValueError): wire_binary.encode_state(dict(state, **{field: value}))
+        self.assertEqual(wire_binary.decode(wire_binary.encode_state(dict(state, host_id='x' * 0xFFFF)))['host_id'], 'x' * 0xFFFF) # Tepat di batas u16
+        with self.assertRaises(ValueError): wire_binary.encode_result({"success": True, "message": 'x' * 0x10000})
+        with self.assertRaises(ValueError): wire_binary.encode_result({"success": True, "message": "", "score_earned": 0x10000})
+
+    def test_accept_negotiation(self):
+        for accept, expected in (('application/x-sekata', True), ('application/json, application/x-sekata', True),
+                                 ('application/x-sekata;q=0.5, application/json', False), ('application/x-sekata;q=0', False),
+                                 ('application/json', False), ('', False)):
+            with self.subTest(accept=accept): self.assertEqual(wire_binary.accepts_binary({'accept': accept}), expected)
+
+    def test_game_status_falls_back_to_json(self):
+        server = HttpServer(GameRegistry(), threading.Lock(), set())
+        server.GAMES.add(self.game)
+        head, body = split(status_request(server, 'ABC123', 'host'))
+        self.assertIn('Content-Type: application/x-sekata', head)
+        self.assertEqual(wire_binary.decode(body)['players']['host']['hand'], self.game.players['host'].hand)
+        self.game.add_player('y' * 0x10000)
+        head, body = split(status_request(server, 'ABC123', 'host'))
+        self.assertIn('Content-Type: application/json', head)
+        self.assertNotIn('-b"', head)
+        self.assertEqual(json.loads(body)['data']['host_id'], 'host')
+
+    def test_result_falls_back_to_json(self):
+        server = HttpServer(GameRegistry(), threading.Lock(), set())
+        server.wire.binary = True
+        try: head, body = split(server.json_response(400, "Bad Request", {"success": False, "message": 'x' * 0x10000}))
+        finally: server.wire.binary = False
+        self.assertIn('Content-Type: application/json', head)
+        self.assertEqual(json.loads(body)['message'], 'x' * 0x10000)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -1,7 +1,10 @@
 # sekata_game/utils.py
+import threading
+
+from lexicon import Lexicon
 
 # Asumsi DICTIONARY dimuat di server.py dan diakses sebagai global
-# DICTIONARY = set() # Akan dimuat dari file di server.py
+# DICTIONARY = Lexicon() # Akan dimuat dari file di server.py (lihat lexicon.py)
 
 def is_word_in_dictionary(word, dictionary_set):
     """
@@ -50,4 +53,177 @@ def calculate_score_for_word(formed_word):
         int: Skor yang didapat (misal, berdasarkan panjang kata).
     """
     # Skor sederhana: 1 poin per huruf
-    return len(formed_word)
\ No newline at end of file
+    return len(formed_word)
+
+class FragmentIndex:
+    """
+    Indeks kata di sekitar kartu meja. Untuk setiap kartu meja T disimpan semua cara kata kamus ditulis sebagai
+    kiri + T + kanan, dengan kiri/kanan tersusun dari potongan tabel dan total 1-2 potongan tambahan
+    (satu kartu tangan, opsional satu kartu helper). Entri satu kartu meja dihitung saat pertama dibutuhkan dari
+    query awalan/akhiran kamus (lexicon.Lexicon), sehingga membangun indeks tidak perlu membaca seluruh kamus.
+    Perubahan kamus/tabel saat server berjalan diterapkan lewat add_words, remove_words, dan set_fragments;
+    perubahan kata disimpan di overlay Lexicon yang sama, sehingga validasi /submit_turn ikut melihatnya.
+    Entri yang sudah dimuat tidak pernah diubah di tempat: perubahan membangun dict/set baru lalu menukar referensinya,
+    sehingga pembaca (legal_moves, /hint) tidak perlu lock.
+    """
+    MAX_EXTRA_CARDS = 2 # Satu kartu tangan + satu kartu helper per giliran
+
+    def __init__(self, dictionary_set=(), fragments=()):
+        self.lexicon = None   # Lexicon sumber query awalan/akhiran (di server: objek DICTIONARY yang sama)
+        self.fragments = {}   # potongan -> urutan di tabel kartu (hasil lookup ikut urutan ini)
+        self.max_length = 0   # Panjang potongan terpanjang; membatasi panjang kata yang mungkin terbentuk
+        self.placements = {}  # kartu_meja -> {kartu_tambahan (tuple terurut) -> {(potongan_kiri, potongan_kanan, kata)}}
+        self.adjacent = {}    # (kartu_meja, 'before'|'after') -> tuple potongan tunggal (dipakai give_helper_card)
+        self.edit_lock = threading.Lock() # Menyerialkan add_words/remove_words; pembaca tidak mengambilnya
+        self.rebuild(dictionary_set, fragments)
+
+    def rebuild(self, dictionary_set, fragments):
+        """Mengganti kamus dan tabel potongan (misal setelah kamus dimuat). Kamus berupa set dikompilasi di memori
+        sebagai salinan; untuk perubahan kata saat server berjalan, berikan Lexicon yang juga dipakai validasi."""
+        self.lexicon = dictionary_set if isinstance(dictionary_set, Lexicon) else Lexicon.from_words(dictionary_set)
+        self._set_table(fragments)
+        self.placements, self.adjacent = {}, {}
+
+    def _set_table(self, fragments):
+        self.fragments = {fragment.upper(): order for order, fragment in enumerate(dict.fromkeys(fragments))}
+        self.max_length = max(map(len, self.fragments), default=0)
+
+    def _splits(self, word, parts):
+        """Semua cara menulis word sebagai tepat `parts` potongan dari tabel."""
+        if parts == 1: return [(word,)] if word in self.fragments else []
+        return [(word[:cut],) + rest for cut in range(1, min(len(word), self.max_length + 1))
+                if word[:cut] in self.fragments for rest in self._splits(word[cut:], parts - 1)]
+
+    def _collect(self, word):
+        """(kartu_meja, kiri, kanan, kata) untuk setiap cara word terbentuk dari kartu meja + 1-2 potongan."""
+        entries = []
+        if len(word) > (self.MAX_EXTRA_CARDS + 1) * self.max_length: return entries
+        for parts in range(2, self.MAX_EXTRA_CARDS + 2):
+            for split in self._splits(word, parts):
+                for index, table_card in enumerate(split): entries.append((table_card, split[:index], split[index + 1:], word))
+        return entries
+
+    def _collect_around(self, words, table_card):
+        """Seperti _collect, tapi hanya untuk satu kartu meja: cukup memecah teks di kiri/kanan setiap kemunculan T."""
+        max_extra = self.MAX_EXTRA_CARDS * self.max_length
+        for word in words:
+            if len(word) > max_extra + len(table_card): continue
+            start = word.find(table_card)
+            while start != -1:
+                left_text, right_text = word[:start], word[start + len(table_card):]
+                lefts = [()] if not left_text else self._splits(left_text, 1) + self._splits(left_text, 2)
+                rights = [()] if not right_text else self._splits(right_text, 1) + self._splits(right_text, 2)
+                for left in lefts:
+                    for right in rights:
+                        if 0 < len(left) + len(right) <= self.MAX_EXTRA_CARDS: yield left, right, word
+                start = word.find(table_card, start + 1)
+
+    def _collect_all(self, words):
+        return [entry for word in words for entry in self._collect(word)]
+
+    def _placements_for(self, table_card):
+        by_cards = self.placements.get(table_card)
+        return by_cards if by_cards is not None else self._load(table_card)
+
+    def _load(self, table_card):
+        """Menghitung entri satu kartu meja. Kandidat diambil dengan query per potongan (T+p.., p+T, p+T+..),
+        bukan memindai kamus, sehingga biayanya bergantung pada jumlah kata di sekitar T saja."""
+        candidates = set()
+        for fragment in self.fragments:
+            candidates.update(self.lexicon.with_prefix(table_card + fragment))
+            candidates.update(self.lexicon.with_suffix(fragment + table_card))
+            candidates.update(self.lexicon.with_prefix(fragment + table_card))
+        by_cards = {}
+        for left, right, word in self._collect_around(candidates, table_card):
+            by_cards.setdefault(tuple(sorted(left + right)), set()).add((left, right, word))
+        self._refresh_adjacent(table_card, by_cards) # Adjacency dulu, agar thread lain tidak melihat kartu meja setengah dimuat
+        self.placements[table_card] = by_cards
+        return by_cards
+
+    def warm(self):
+        """Memuat entri semua kartu meja di tabel (dijalankan di thread latar setelah server mulai)."""
+        for table_card in list(self.fragments): self._placements_for(table_card)
+
+    def _merge(self, entries, remove=False):
+        """Menerapkan perubahan ke kartu meja yang sudah dimuat; sisanya ikut terhitung saat dimuat nanti."""
+        changes = {}
+        for table_card, left, right, word in entries:
+            changes.setdefault(table_card, []).append((tuple(sorted(left + right)), (left, right, word)))
+        with self.edit_lock:
+            for table_card, placed in changes.items():
+                by_cards = self.placements.get(table_card)
+                if by_cards is None: continue
+                # Salinan dict dan set yang tersentuh; thread lain mungkin sedang mengiterasi yang lama
+                updated, keys = dict(by_cards), {key for key, _ in placed}
+                for key in keys: updated[key] = set(by_cards.get(key, ()))
+                for key, entry in placed:
+                    if remove: updated[key].discard(entry)
+                    else: updated[key].add(entry)
+                for key in keys:
+                    if not updated[key]: del updated[key]
+                self._refresh_adjacent(table_card, updated)
+                self.placements[table_card] = updated
+
+    def _refresh_adjacent(self, table_card, by_cards):
+        singles = [entry for key, entries in by_cards.items() if len(key) == 1 for entry in entries]
+        before = {left[0] for left, _, _ in singles if left}
+        after = {right[0] for _, right, _ in singles if right}
+        for position, fragments in (('before', before), ('after', after)):
+            if fragments: self.adjacent[(table_card, position)] = tuple(sorted(fragments, key=self.fragments.__getitem__))
+            else: self.adjacent.pop((table_card, position), None)
+
+    def add_words(self, words):
+        """Menambahkan kata ke kamus (Lexicon.add_words) dan memperbarui kartu meja yang sudah dimuat."""
+        self._merge(self._collect_all(self.lexicon.add_words(words)))
+
+    def remove_words(self, words):
+        """Menghapus kata dari kamus (Lexicon.remove_words) dan memperbarui kartu meja yang sudah dimuat."""
+        self._merge(self._collect_all(self.lexicon.remove_words(words)), remove=True)
+
+    def set_fragments(self, fragments):
+        """Mengganti tabel potongan. Entri setiap kartu meja dihitung ulang saat dibutuhkan berikutnya."""
+        self._set_table(fragments)
+        self.placements, self.adjacent = {}, {}
+
+    def helpers_for(self, table_card, position):
+        """Potongan yang membentuk kata jika disambung di position ('before'/'after') kartu meja."""
+        if table_card not in self.placements: self._load(table_card)
+        return self.adjacent.get((table_card, position), ())
+
+    def has_legal_move(self, table_card, hand, helper_cards=()):
+        """True jika ada setidaknya satu langkah legal; berhenti di kombinasi pertama yang ditemukan."""
+        by_cards = self._placements_for(table_card)
+        if not by_cards: return False
+        for hand_card in hand:
+            if (hand_card,) in by_cards: return True
+            for helper in helper_cards:
+                if (hand_card, helper) in by_cards or (helper, hand_card) in by_cards: return True
+        return False
+
+    def legal_moves(self, table_card, hand, helper_cards=()):
+        """
+        Semua langkah legal untuk satu giliran: tepat satu kartu tangan, opsional satu kartu helper, masing-masing
+        disambung 'before'/'after'. Setiap hasil berisi 'moves' dalam urutan yang diterima /submit_turn apa adanya.
+        Returns:
+            list: [{"word", "score", "moves": [{"type", "card", "position"}, ...]}], skor tertinggi dulu.
+        """
+        by_cards = self._placements_for(table_card)
+        if not by_cards: return []
+        helpers = set(helper_cards)
+        results = {}
+        # Lookup per kombinasi kartu (maks. 7 + 7 x jumlah helper), bukan memindai semua kata di sekitar kartu meja
+        for hand_card in set(hand):
+            for key in [(hand_card,)] + [tuple(sorted((hand_card, helper))) for helper in helpers]:
+                for left, right, word in by_cards.get(key, ()):
+                    cards = left + right
+                    # Urutan penerapan: kartu yang paling dekat ke kartu meja disambung lebih dulu
+                    positions = ('before',) * len(left) + ('after',) * len(right)
+                    order = tuple(range(len(left) - 1, -1, -1)) + tuple(range(len(left), len(cards)))
+                    for hand_slot in range(len(cards)):
+                        if cards[hand_slot] != hand_card or (len(cards) == 2 and cards[1 - hand_slot] not in helpers): continue
+                        moves = tuple(('hand' if slot == hand_slot else 'helper', cards[slot], positions[slot]) for slot in order)
+                        results[moves] = word
+        ranked = sorted(results.items(), key=lambda item: (-calculate_score_for_word(item[1]), item[1], item[0]))
+        return [{"word": word, "score": calculate_score_for_word(word),
+                 "moves": [{"type": kind, "card": card, "position": position} for kind, card, position in moves]}
+                for moves, word in ranked]
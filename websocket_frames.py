@@ -0,0 +1,126 @@
+# websocket_frames.py (Handshake dan framing WebSocket RFC 6455 untuk server socket)
+import base64
+import hashlib
+import struct
+
+WS_GUID = "258EAFA5-E914-47DA-95CA-C5AB0DC85B11"
+MAX_MESSAGE_SIZE = 64 * 1024 # Batas satu pesan (gabungan seluruh fragmen)
+
+OP_CONTINUATION, OP_TEXT, OP_BINARY = 0x0, 0x1, 0x2
+OP_CLOSE, OP_PING, OP_PONG = 0x8, 0x9, 0xA
+KNOWN_OPCODES = frozenset((OP_CONTINUATION, OP_TEXT, OP_BINARY, OP_CLOSE, OP_PING, OP_PONG)) # 0x3-0x7 dan 0xB-0xF dicadangkan
+
+CLOSE_NORMAL = 1000
+CLOSE_PROTOCOL_ERROR = 1002
+CLOSE_UNSUPPORTED = 1003
+CLOSE_TOO_BIG = 1009
+
+class WebSocketError(Exception):
+    """Pelanggaran protokol dari client. close_code dikirim di frame close sebelum koneksi ditutup."""
+    def __init__(self, close_code, message):
+        super().__init__(message)
+        self.close_code = close_code
+
+def is_upgrade_request(headers):
+    connection = [token.strip().lower() for token in headers.get('connection', '').split(',')]
+    return headers.get('upgrade', '').lower() == 'websocket' and 'upgrade' in connection
+
+def accept_key(key):
+    return base64.b64encode(hashlib.sha1((key + WS_GUID).encode('latin-1')).digest()).decode('ascii')
+
+def handshake_response(key):
+    return ("HTTP/1.1 101 Switching Protocols\r\n"
+            "Upgrade: websocket\r\n"
+            "Connection: Upgrade\r\n"
+            f"Sec-WebSocket-Accept: {accept_key(key)}\r\n\r\n").encode('latin-1')
+
+def apply_mask(payload, mask_key):
+    """XOR payload dengan mask 4 byte; dikerjakan sebagai satu bilangan besar, bukan per byte."""
+    if not payload: return b''
+    length = len(payload)
+    mask = (mask_key * (length // 4 + 1))[:length]
+    return (int.from_bytes(payload, 'big') ^ int.from_bytes(mask, 'big')).to_bytes(length, 'big')
+
+def encode_frame(opcode, payload=b'', mask_key=None):
+    """Satu frame FIN. Server mengirim tanpa mask; client wajib memberi mask_key (4 byte)."""
+    if isinstance(payload, str): payload = payload.encode('utf-8')
+    length = len(payload)
+    mask_bit = 0x80 if mask_key else 0
+    if length < 126:
+        head = struct.pack('!BB', 0x80 | opcode, mask_bit | length)
+    elif length < 65536:
+        head = struct.pack('!BBH', 0x80 | opcode, mask_bit | 126, length)
+    else:
+        head = struct.pack('!BBQ', 0x80 | opcode, mask_bit | 127, length)
+    if mask_key: return head + mask_key + apply_mask(payload, mask_key)
+    return head + payload
+
+def close_frame(code=CLOSE_NORMAL, reason=''):
+    return encode_frame(OP_CLOSE, struct.pack('!H', code) + reason.encode('utf-8'))
+
+class FrameReader:
+    """Membaca frame secara bertahap, seperti RequestReader untuk HTTP.
+
+    next_message() mengembalikan (opcode, payload) untuk setiap pesan utuh (fragmen sudah digabung)
+    atau frame kontrol, dan None jika masih butuh data.
+    """
+    def __init__(self, require_mask=True, max_message_size=MAX_MESSAGE_SIZE):
+        self.require_mask = require_mask
+        self.max_message_size = max_message_size
+        self.buffer = bytearray()
+        self._fragments = None # (opcode, bytearray) selama pesan terfragmentasi belum selesai
+
+    def feed(self, data):
+        self.buffer += data
+
+    def next_message(self):
+        while True:
+            frame = self._read_frame()
+            if frame is None: return None
+            fin, opcode, payload = frame
+            if opcode >= OP_CLOSE:
+                if not fin or len(payload) > 125:
+                    raise WebSocketError(CLOSE_PROTOCOL_ERROR, "Frame kontrol tidak valid.")
+                return opcode, payload
+            if opcode == OP_CONTINUATION:
+                if self._fragments is None:
+                    raise WebSocketError(CLOSE_PROTOCOL_ERROR, "Frame lanjutan tanpa awal pesan.")
+                self._fragments[1].extend(payload)
+                if len(self._fragments[1]) > self.max_message_size:
+                    raise WebSocketError(CLOSE_TOO_BIG, "Pesan terlalu besar.")
+                if not fin: continue
+                opcode, payload = self._fragments[0], bytes(self._fragments[1])
+                self._fragments = None
+                return opcode, payload
+            if self._fragments is not None:
+                raise WebSocketError(CLOSE_PROTOCOL_ERROR, "Pesan baru sebelum fragmen selesai.")
+            if fin: return opcode, payload
+            self._fragments = (opcode, bytearray(payload))
+
+    def _read_frame(self):
+        if len(self.buffer) < 2: return None
+        first, second = self.buffer[0], self.buffer[1]
+        if first & 0x70:
+            raise WebSocketError(CLOSE_PROTOCOL_ERROR, "Bit RSV tanpa ekstensi.")
+        if first & 0x0F not in KNOWN_OPCODES: # Ditolak dari header, tanpa menunggu payload
+            raise WebSocketError(CLOSE_PROTOCOL_ERROR, f"Opcode {first & 0x0F} tidak dikenal.")
+        masked, length, offset = second & 0x80, second & 0x7F, 2
+        if self.require_mask and not masked:
+            raise WebSocketError(CLOSE_PROTOCOL_ERROR, "Frame dari client harus di-mask.")
+        if length == 126:
+            if len(self.buffer) < 4: return None
+            length, offset = struct.unpack_from('!H', self.buffer, 2)[0], 4
+        elif length == 127:
+            if len(self.buffer) < 10: return None
+            length, offset = struct.unpack_from('!Q', self.buffer, 2)[0], 10
+        if length > self.max_message_size:
+            raise WebSocketError(CLOSE_TOO_BIG, "Pesan terlalu besar.")
+        mask_key = None
+        if masked:
+            if len(self.buffer) < offset + 4: return None
+            mask_key, offset = bytes(self.buffer[offset:offset + 4]), offset + 4
+        if len(self.buffer) < offset + length: return None
+        payload = bytes(self.buffer[offset:offset + length])
+        del self.buffer[:offset + length]
+        if mask_key: payload = apply_mask(payload, mask_key)
+        return bool(first & 0x80), first & 0x0F, payload
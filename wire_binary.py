@@ -0,0 +1,206 @@
+# wire_binary.py (Encoding biner ringkas untuk /game_status dan respons aksi, dipilih client lewat header Accept)
+#
+# Semua angka big-endian. Setiap pesan diawali header: magic b'SK', versi format (u8), jenis pesan (u8).
+# String: panjang u16 + UTF-8. Kartu: u8 ID dari models.FRAGMENTS (tabel yang sama dengan penyimpanan di memori); CARD_NONE = tidak ada, CARD_LITERAL = diikuti string.
+#
+# MSG_STATE : game_id, version u32, host_id, card_on_table, flags u8 (bit0 game_started), check_count u8,
+#             main_deck_count u16, min_players_to_start u8, current_turn u8, winner u8 (indeks pemain, 0xFF = tidak ada),
+#             helper_cards, used_helper_cards (u8 jumlah + kartu), jumlah pemain u8,
+#             per pemain: player_id, score i32, hand_size u8, hand (u8 jumlah + kartu; kosong kecuali milik viewer)
+# MSG_RESULT: flags u8 (bit0 success, bit1 game_id, bit2 score_earned, bit3 winner), message,
+#             lalu game_id / score_earned u16 / winner sesuai flags
+#
+# Nilai yang tidak muat di field-nya (misal lebih dari 254 pemain, atau string lebih dari 64 KiB) membuat encode_*
+# melempar ValueError; pemanggil lalu menjawab dengan JSON.
+import struct
+
+from models import FRAGMENTS, FRAGMENT_IDS
+
+CONTENT_TYPE = 'application/x-sekata'
+MAGIC = b'SK'
+WIRE_VERSION = 1
+MSG_STATE = 1
+MSG_RESULT = 2
+CARD_NONE = 0xFF
+CARD_LITERAL = 0xFE # Kartu di luar tabel (tidak terjadi dengan deck bawaan, tapi tidak boleh membuat encoding gagal)
+NO_PLAYER = 0xFF
+MAX_PLAYERS = NO_PLAYER - 1 # Indeks pemain 0..MAX_PLAYERS-1 tidak pernah bertabrakan dengan NO_PLAYER
+
+_HEADER = struct.Struct('>2sBB')
+_U8 = struct.Struct('>B')
+_U16 = struct.Struct('>H')
+_STATE_FIELDS = struct.Struct('>IBBHBBB') # version, flags, check_count, main_deck_count, min_players, current_turn, winner
+_SCORE = struct.Struct('>iB')             # score, hand_size
+_STATE_HEADER = _HEADER.pack(MAGIC, WIRE_VERSION, MSG_STATE)
+_RESULT_HEADER = _HEADER.pack(MAGIC, WIRE_VERSION, MSG_RESULT)
+
+def _media_ranges(accept):
+    """Header Accept -> {media_type: q}. q yang tidak valid dianggap 0 (range diabaikan)."""
+    ranges = {}
+    for item in accept.split(','):
+        media_type, *params = [part.strip() for part in item.split(';')]
+        if not media_type: continue
+        q = 1.0
+        for param in params:
+            name, _, value = param.partition('=')
+            if name.strip().lower() != 'q': continue
+            try: q = float(value.strip())
+            except ValueError: q = 0.0
+        ranges[media_type.lower()] = max(q, ranges.get(media_type.lower(), 0.0))
+    return ranges
+
+def accepts_binary(request_headers):
+    """True jika client menyebut CONTENT_TYPE dengan q > 0 dan tidak lebih rendah dari media type lain yang disebut."""
+    ranges = _media_ranges(request_headers.get('accept', ''))
+    q = ranges.get(CONTENT_TYPE, 0.0)
+    return q > 0 and q >= max(ranges.values())
+
+def _string(value):
+    data = str(value).encode('utf-8')
+    return _U16.pack(len(data)) + data
+
+def _card(card):
+    if card is None: return bytes((CARD_NONE,))
+    card_id = FRAGMENT_IDS.get(card)
+    return bytes((card_id,)) if card_id is not None else bytes((CARD_LITERAL,)) + _string(card)
+
+def _cards(cards):
+    ids = [FRAGMENT_IDS.get(card) for card in cards]
+    if None not in ids: return bytes((len(ids), *ids))
+    return bytes((len(cards),)) + b''.join(_card(card) for card in cards)
+
+def encode_state(state):
+    """Dict dari Game.get_game_state_for_player -> bytes MSG_STATE. ValueError jika state melebihi batas format."""
+    player_ids = list(state["players"])
+    if len(player_ids) > MAX_PLAYERS: raise ValueError(f"Encoding biner mendukung paling banyak {MAX_PLAYERS} pemain.")
+    try:
+        return _encode_state(state, player_ids)
+    except struct.error as e:
+        raise ValueError(f"State tidak muat dalam encoding biner: {e}") from e
+
+def _encode_state(state, player_ids):
+    current, winner = state["current_turn"], state["winner"]
+    parts = [_STATE_HEADER, _string(state["game_id"]),
+             _STATE_FIELDS.pack(state["version"], 1 if state["game_started"] else 0, state["check_count"], state["main_deck_count"], state["min_players_to_start"],
+                                player_ids.index(current) if current in state["players"] else NO_PLAYER,
+                                player_ids.index(winner) if winner in state["players"] else NO_PLAYER),
+             _string(state["host_id"]), _card(state["card_on_table"]), _cards(state["helper_cards"]), _cards(state["used_helper_cards"]),
+             _U8.pack(len(player_ids))]
+    for player_id, player in state["players"].items():
+        parts += [_string(player_id), _SCORE.pack(player["score"], player["hand_size"]), _cards(player["hand"])]
+    return b''.join(parts)
+
+def encode_result(data):
+    """Body respons aksi ({"success", "message", opsional "game_id"/"score_earned"/"winner"}) -> bytes MSG_RESULT.
+    Field lain tidak dibawa; endpoint yang membutuhkannya (misal /batch) tetap JSON. ValueError jika melebihi batas format."""
+    try:
+        return _encode_result(data)
+    except struct.error as e:
+        raise ValueError(f"Respons tidak muat dalam encoding biner: {e}") from e
+
+def _encode_result(data):
+    flags = (1 if data.get("success") else 0) | (2 if "game_id" in data else 0) | (4 if "score_earned" in data else 0) | (8 if data.get("winner") else 0)
+    parts = [_RESULT_HEADER, _U8.pack(flags), _string(data.get("message", ""))]
+    if flags & 2: parts.append(_string(data["game_id"]))
+    if flags & 4: parts.append(_U16.pack(data["score_earned"]))
+    if flags & 8: parts.append(_string(data["winner"]))
+    return b''.join(parts)
+
+class _Reader:
+    def __init__(self, data):
+        self.data = bytes(data)
+        self.offset = 0
+
+    def unpack(self, layout):
+        values = layout.unpack_from(self.data, self.offset)
+        self.offset += layout.size
+        return values
+
+    def u8(self):
+        self.offset += 1
+        return self.data[self.offset - 1]
+
+    def string(self):
+        start = self.offset + 2
+        self.offset = start + (self.data[start - 2] << 8 | self.data[start - 1])
+        return self.data[start:self.offset].decode('utf-8')
+
+    def card(self):
+        card_id = self.u8()
+        if card_id == CARD_NONE: return None
+        return self.string() if card_id == CARD_LITERAL else FRAGMENTS[card_id]
+
+    def cards(self):
+        count = self.u8()
+        ids = self.data[self.offset:self.offset + count]
+        if count and max(ids) < CARD_LITERAL: # Jalur umum: semua kartu ada di tabel, satu byte per kartu
+            self.offset += count
+            return [FRAGMENTS[card_id] for card_id in ids]
+        return [self.card() for _ in range(count)]
+
+def decode(data):
+    """bytes -> dict dengan bentuk yang sama seperti JSON (state game, atau body respons aksi)."""
+    reader = _Reader(data)
+    magic, version, kind = reader.unpack(_HEADER)
+    if magic != MAGIC or version != WIRE_VERSION: raise ValueError("Bukan pesan biner Sekata yang dikenal.")
+    if kind == MSG_STATE: return _decode_state(reader)
+    if kind == MSG_RESULT: return _decode_result(reader)
+    raise ValueError(f"Jenis pesan {kind} tidak dikenal.")
+
+def _decode_state(reader):
+    game_id = reader.string()
+    version, flags, check_count, main_deck_count, min_players, current, winner = reader.unpack(_STATE_FIELDS)
+    host_id, card_on_table, helper_cards, used_helper_cards = reader.string(), reader.card(), reader.cards(), reader.cards()
+    players = {}
+    data, offset = reader.data, reader.offset
+    count, offset = data[offset], offset + 1
+    for _ in range(count): # Bagian terpanjang pesan; dibaca inline tanpa method _Reader per field
+        start = offset + 2
+        offset = start + (data[start - 2] << 8 | data[start - 1])
+        player_id = data[start:offset].decode('utf-8')
+        score, hand_size = _SCORE.unpack_from(data, offset)
+        offset += _SCORE.size
+        ids = data[offset + 1:offset + 1 + data[offset]]
+        if not ids or max(ids) < CARD_LITERAL:
+            hand, offset = [FRAGMENTS[card_id] for card_id in ids], offset + 1 + len(ids)
+        else:
+            reader.offset = offset
+            hand, offset = reader.cards(), reader.offset
+        players[player_id] = {"score": score, "hand_size": hand_size, "hand": hand}
+    player_ids = list(players)
+    return {"game_id": game_id, "version": version, "host_id": host_id, "card_on_table": card_on_table,
+            "helper_cards": helper_cards, "used_helper_cards": used_helper_cards,
+            "current_turn": player_ids[current] if current != NO_PLAYER else None, "players": players,
+            "main_deck_count": main_deck_count, "game_started": bool(flags & 1), "check_count": check_count,
+            "winner": player_ids[winner] if winner != NO_PLAYER else None,
+            "min_players_to_start": min_players, "current_players_count": len(players)}
+
+def _decode_result(reader):
+    flags = reader.u8()
+    result = {"success": bool(flags & 1), "message": reader.string()}
+    if flags & 2: result["game_id"] = reader.string()
+    if flags & 4: result["score_earned"], = reader.unpack(_U16)
+    if flags & 8: result["winner"] = reader.string()
+    return result
+
+def benchmark(players=4, number=20000):
+    """Membandingkan ukuran dan waktu encode/decode JSON vs biner untuk satu state game dan satu respons aksi."""
+    import json
+    import timeit
+    from models import Game
+    game = Game("BENCH1", "pemain-1")
+    for index in range(2, players + 1): game.add_player(f"pemain-{index}")
+    game.start_game()
+    state = game.get_game_state_for_player("pemain-1")
+    result = {"success": True, "message": "Berhasil membentuk kata 'BAKAT'! (+5 poin)", "score_earned": 5}
+    print(f"{'payload':<10} {'json B':>7} {'biner B':>8} {'enc json':>9} {'enc biner':>10} {'dec json':>9} {'dec biner':>10}  (us/op)")
+    for name, value, encoder in (("state", state, encode_state), ("aksi", result, encode_result)):
+        as_json, as_binary = json.dumps(value).encode('utf-8'), encoder(value)
+        assert decode(as_binary) == json.loads(as_json), name
+        times = [timeit.timeit(call, number=number) / number * 1e6 for call in (
+            lambda: json.dumps(value).encode('utf-8'), lambda: encoder(value),
+            lambda: json.loads(as_json), lambda: decode(as_binary))]
+        print(f"{name:<10} {len(as_json):>7} {len(as_binary):>8} {times[0]:>9.2f} {times[1]:>10.2f} {times[2]:>9.2f} {times[3]:>10.2f}")
+
+if __name__ == "__main__":
+    benchmark()